@@ -13,6 +13,13 @@ const API_ENDPOINTS = {
 
     // Dashboard
     DASHBOARD_STATS: `${API_BASE_URL}/dashboard/stats/`,
+    DASHBOARD_BOOTSTRAP: `${API_BASE_URL}/dashboard/bootstrap/`,
+
+    // Statistiques (séries mensuelles)
+    ANALYTICS_HEADCOUNT: `${API_BASE_URL}/analytics/headcount/`,
+    ANALYTICS_ABSENTEEISM: `${API_BASE_URL}/analytics/absenteeism/`,
+    ANALYTICS_LEAVE_DAYS: `${API_BASE_URL}/analytics/leave-days/`,
+    ANALYTICS_DEMOGRAPHICS: `${API_BASE_URL}/analytics/demographics/`,
 
     // Directions
     DIRECTIONS: `${API_BASE_URL}/directions/`,
@@ -26,6 +33,10 @@ const API_ENDPOINTS = {
     EMPLOYEES: `${API_BASE_URL}/employees/`,
     EMPLOYEE_DETAIL: (id) => `${API_BASE_URL}/employees/${id}/`,
     EMPLOYEES_BY_DEPARTMENT: `${API_BASE_URL}/employees/by_department/`,
+    EMPLOYEE_ME: `${API_BASE_URL}/employees/me/`,
+    ME_BOOTSTRAP: `${API_BASE_URL}/me/bootstrap/`,
+    EMPLOYEE_BADGE: (id) => `${API_BASE_URL}/employees/${id}/badge/`,
+    EMPLOYEE_REVOKE_BADGE: (id) => `${API_BASE_URL}/employees/${id}/revoke_badge/`,
 
     // Congés
     LEAVES: `${API_BASE_URL}/leaves/`,
@@ -33,12 +44,20 @@ const API_ENDPOINTS = {
     LEAVE_APPROVE: (id) => `${API_BASE_URL}/leaves/${id}/approve/`,
     LEAVE_REJECT: (id) => `${API_BASE_URL}/leaves/${id}/reject/`,
     LEAVES_PENDING: `${API_BASE_URL}/leaves/pending/`,
+    LEAVES_OCCUPANCY: `${API_BASE_URL}/leaves/occupancy/`,
+    LEAVES_BULK_APPROVE: `${API_BASE_URL}/leaves/bulk_approve/`,
+    LEAVES_BULK_REJECT: `${API_BASE_URL}/leaves/bulk_reject/`,
 
     // Présences
     ATTENDANCES: `${API_BASE_URL}/attendances/`,
     ATTENDANCE_DETAIL: (id) => `${API_BASE_URL}/attendances/${id}/`,
     ATTENDANCES_TODAY: `${API_BASE_URL}/attendances/today/`,
     ATTENDANCES_BY_EMPLOYEE: `${API_BASE_URL}/attendances/by_employee/`,
+    ATTENDANCES_CALENDAR: `${API_BASE_URL}/attendances/calendar/`,
+    ATTENDANCES_HOURS_SUMMARY: `${API_BASE_URL}/attendances/hours_summary/`,
+    ATTENDANCES_BULK_MARK: `${API_BASE_URL}/attendances/bulk_mark/`,
+    ATTENDANCES_IMPORT: `${API_BASE_URL}/attendances/import/`,
+    CHECKIN: `${API_BASE_URL}/checkin/`,
 
     // Rapports
     REPORT_ATTENDANCE: `${API_BASE_URL}/reports/attendance/`,
@@ -51,6 +70,8 @@ const API_ENDPOINTS = {
     NOTIFICATIONS_UNREAD_COUNT: `${API_BASE_URL}/notifications/unread_count/`,
     NOTIFICATION_MARK_READ: (id) => `${API_BASE_URL}/notifications/${id}/mark_read/`,
     NOTIFICATIONS_MARK_ALL_READ: `${API_BASE_URL}/notifications/mark_all_read/`,
+    NOTIFICATIONS_STREAM: `${API_BASE_URL}/notifications/stream/`,
+    NOTIFICATIONS_STREAM_TICKET: `${API_BASE_URL}/notifications/stream/ticket/`,
 
 };
 
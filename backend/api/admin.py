@@ -20,6 +20,7 @@ Ce module personnalise entièrement l'interface Django Admin pour :
     EmployeeAdmin           — Agents contractuels avec fieldsets thématiques.
     LeaveAdmin              — Demandes de congé avec fieldsets d'approbation.
     AttendanceAdmin         — Pointages de présence.
+    BadgeAdmin              — Badges de pointage signés (émission et révocation).
     PasswordRecordAdmin     — Mots de passe chiffrés (masqués dans la liste,
                               déchiffrables via get_decrypted_password).
 
@@ -33,7 +34,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django import forms
 from django.contrib.auth.forms import ReadOnlyPasswordHashField
-from .models import Direction, ManagerProfile, CompanyProfile, Department, Employee, Leave, Attendance, PasswordRecord
+from .models import Direction, ManagerProfile, CompanyProfile, Department, Employee, Leave, Attendance, PasswordRecord, Badge, PublicHoliday, LeaveAccrual, DeletionLog
 from .encryption import encrypt_password, decrypt_password
 
 
@@ -48,7 +49,7 @@ class DirectionAdmin(admin.ModelAdmin):
     Affiche la liste des managers assignés à chaque direction dans la vue liste.
     """
 
-    list_display = ['name', 'get_managers', 'created_at']
+    list_display = ['name', 'max_concurrent_leaves', 'get_managers', 'created_at']
     search_fields = ['name']
     ordering = ['name']
 
@@ -698,6 +699,92 @@ class AttendanceAdmin(admin.ModelAdmin):
     )
 
 
+# ===========================
+# Admin Badge de pointage
+# ===========================
+
+@admin.register(Badge)
+class BadgeAdmin(admin.ModelAdmin):
+    """Administration des badges de pointage signés.
+
+    Le jeton signé n'est pas stocké : seule la trace de l'émission est
+    consultable. Renseigner `revoked_at` révoque le badge (pris en compte
+    par les postes de pointage au prochain rechargement de la liste de révocation).
+    """
+
+    list_display = ['serial', 'employee', 'issued_by', 'issued_at', 'expires_at', 'revoked_at']
+    search_fields = ['serial', 'employee__first_name', 'employee__last_name', 'employee__matricule']
+    list_filter = ['revoked_at', 'expires_at']
+    readonly_fields = ['serial', 'employee', 'issued_by', 'issued_at', 'expires_at']
+    ordering = ['-issued_at']
+    list_per_page = 25
+
+
+# ===========================
+# Admin PublicHoliday
+# ===========================
+
+@admin.register(PublicHoliday)
+class PublicHolidayAdmin(admin.ModelAdmin):
+    """Administration des jours fériés.
+
+    Les fêtes à date fixe et celles liées à Pâques sont générées par
+    `python manage.py seed_public_holidays --year AAAA` ; les fêtes musulmanes
+    sont ajoutées ici dès l'annonce officielle de leur date.
+    """
+
+    list_display = ['date', 'name', 'created_at']
+    search_fields = ['name']
+    date_hierarchy = 'date'
+    ordering = ['-date']
+    list_per_page = 50
+
+
+# ===========================
+# Admin LeaveAccrual
+# ===========================
+
+@admin.register(LeaveAccrual)
+class LeaveAccrualAdmin(admin.ModelAdmin):
+    """Consultation du registre d'acquisition des congés payés.
+
+    Le registre est alimenté par `python manage.py accrue_leave` ; il n'est
+    pas modifiable à la main (relancer la commande recalcule les reports).
+    """
+
+    list_display = ['employee', 'period', 'kind', 'days', 'created_at']
+    search_fields = ['employee__first_name', 'employee__last_name', 'employee__matricule']
+    list_filter = ['kind', 'period']
+    readonly_fields = ['employee', 'period', 'kind', 'days', 'created_at']
+    ordering = ['-period', 'employee']
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
+
+
+# ===========================
+# Admin DeletionLog
+# ===========================
+
+@admin.register(DeletionLog)
+class DeletionLogAdmin(admin.ModelAdmin):
+    """Consultation des pierres tombales de la synchronisation incrémentale.
+
+    Écrites à chaque suppression d'agent, de congé ou de présence, purgées par
+    `python manage.py purge_deletion_log`.
+    """
+
+    list_display = ['resource', 'object_id', 'department_id', 'direction', 'deleted_at']
+    list_filter = ['resource']
+    readonly_fields = ['resource', 'object_id', 'department_id', 'direction', 'user_id', 'deleted_at']
+    ordering = ['-deleted_at']
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
+
+
 # ===========================
 # Admin PasswordRecord
 # ===========================
@@ -0,0 +1,204 @@
+"""
+Statistiques des effectifs : séries mensuelles (effectifs, absentéisme, jours
+de congé) et démographie (pyramide des âges, départs à la retraite).
+
+Les séries sont précalculées dans des vues matérialisées PostgreSQL (SQL figé
+dans les migrations, à partir de 0028), rafraîchies par la commande
+refresh_analytics (REFRESH MATERIALIZED VIEW CONCURRENTLY : les lectures ne
+sont pas bloquées pendant le rafraîchissement).
+Chaque ligne porte l'entreprise et la direction des agents : les endpoints
+/api/analytics/* appliquent le périmètre de l'utilisateur par un simple filtre.
+
+Vues (une ligne par mois × entreprise × direction, HISTORY_MONTHS derniers mois) :
+  api_mv_headcount_monthly   — headcount (agents en poste à la fin du mois :
+                               embauchés au plus tard ce mois, sans date de
+                               sortie antérieure à la fin du mois), hires
+                               (embauches du mois), exits (sorties du mois).
+  api_mv_attendance_monthly  — records, present, absent, late, half_day, hours_worked.
+  api_mv_leave_days_monthly  — days (jours ouvrés de congés approuvés, hors
+                               week-ends et jours fériés), par type de congé.
+
+Les agents sans entreprise ont department_id = 0, sans direction direction = ''
+(colonnes des index uniques requis par le rafraîchissement concurrent).
+
+Les effectifs passés sont reconstitués à partir des dates d'embauche et de
+sortie (Employee.exit_date, renseignée au passage au statut 'inactive') : un
+départ ne modifie que les mois postérieurs. Les agents supprimés disparaissent
+de l'historique ; l'entreprise et la direction retenues sont les actuelles.
+
+La pyramide des âges et les départs à la retraite ne passent pas par une
+vue matérialisée : ils sont agrégés en base à la demande (ExtractYear,
+Count), sans charger les agents (demographics()).
+
+Fonctions :
+  refresh_analytics()        — Rafraîchissement de toutes les vues.
+  monthly_series(...)        — Série d'une vue pour un périmètre, regroupée par
+                               entreprise, direction ou type de congé.
+  demographics(...)          — Pyramide des âges par sexe et départs à la
+                               retraite par année, par entreprise et direction.
+"""
+
+from django.db import connection
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import ExtractYear
+
+# Âge légal de départ à la retraite
+RETIREMENT_AGE = 60
+
+# Bornes des tranches d'âge de la pyramide : '<25', '25-29', …, '55-59', '60+'
+AGE_BUCKET_BOUNDS = (25, 30, 35, 40, 45, 50, 55, 60)
+UNKNOWN_AGE_BUCKET = 'unknown'
+
+# Profondeur de l'historique des vues (mois, mois courant inclus) ; doit
+# correspondre à l'intervalle figé dans le SQL des migrations
+HISTORY_MONTHS = 36
+
+HEADCOUNT_VIEW = 'api_mv_headcount_monthly'
+ATTENDANCE_VIEW = 'api_mv_attendance_monthly'
+LEAVE_DAYS_VIEW = 'api_mv_leave_days_monthly'
+
+# Vues rafraîchies par refresh_analytics. Leur définition SQL est figée dans
+# les migrations (0028, 0029) : toute modification passe par une nouvelle migration.
+MATERIALIZED_VIEWS = (HEADCOUNT_VIEW, ATTENDANCE_VIEW, LEAVE_DAYS_VIEW)
+
+# Mesures additionnables de chaque vue (sommées lors du regroupement)
+MEASURES = {
+    HEADCOUNT_VIEW: ('headcount', 'hires', 'exits'),
+    ATTENDANCE_VIEW: ('records', 'present', 'absent', 'late', 'half_day', 'hours_worked'),
+    LEAVE_DAYS_VIEW: ('days',),
+}
+
+# Regroupements autorisés : expression de clé et de libellé
+GROUP_BY_CHOICES = {
+    'department': ('v.department_id', 'dep.name'),
+    'direction': ('v.direction', 'v.direction'),
+    'leave_type': ('v.leave_type', 'v.leave_type'),
+}
+
+
+def refresh_analytics(concurrently=True):
+    """Rafraîchit toutes les vues matérialisées.
+
+    Args:
+        concurrently (bool): REFRESH … CONCURRENTLY (lectures non bloquées).
+
+    Returns:
+        list[str]: Noms des vues rafraîchies.
+    """
+    option = ' CONCURRENTLY' if concurrently else ''
+    with connection.cursor() as cursor:
+        for name in MATERIALIZED_VIEWS:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW{option} {name}')
+    return list(MATERIALIZED_VIEWS)
+
+
+def monthly_series(view, ctx, first, last, group_by):
+    """Lit une série mensuelle d'une vue matérialisée dans le périmètre d'un utilisateur.
+
+    Args:
+        view (str): Nom de la vue (HEADCOUNT_VIEW, ATTENDANCE_VIEW, LEAVE_DAYS_VIEW).
+        ctx (dict): Contexte retourné par get_user_context (admin, entreprise, manager).
+        first (date): Premier mois (1er du mois, inclus).
+        last (date): Dernier mois (1er du mois, inclus).
+        group_by (str): Clé de GROUP_BY_CHOICES.
+
+    Returns:
+        list[dict]: {'month', 'key', 'label', <mesures de la vue>}, triés par mois puis libellé.
+    """
+    key_sql, label_sql = GROUP_BY_CHOICES[group_by]
+    measures = MEASURES[view]
+    where, params = ['v.month BETWEEN %s AND %s'], [first, last]
+    role = ctx['role']
+    if role == 'entreprise':
+        where.append('v.department_id = %s')
+        params.append(ctx['department'].pk)
+    elif role == 'manager':
+        where.append('v.direction = ANY(%s)')
+        params.append(list(ctx['directions']))
+
+    sums = ', '.join(f'SUM(v.{measure}) AS {measure}' for measure in measures)
+    sql = (
+        f"SELECT v.month, {key_sql}, {label_sql}, {sums} "
+        f"FROM {view} v LEFT JOIN api_department dep ON dep.id = v.department_id "
+        f"WHERE {' AND '.join(where)} "
+        f"GROUP BY 1, 2, 3 ORDER BY 1, 3"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    series = []
+    for month, key, label, *values in rows:
+        row = {'month': month.strftime('%Y-%m'), 'key': key, 'label': label}
+        for measure, value in zip(measures, values):
+            row[measure] = float(value) if measure == 'hours_worked' else int(value)
+        series.append(row)
+    return series
+
+
+def age_bucket_labels():
+    """Libellés des tranches d'âge, de la plus jeune à la plus âgée."""
+    bounds = AGE_BUCKET_BOUNDS
+    labels = [f'<{bounds[0]}']
+    labels += [f'{low}-{high - 1}' for low, high in zip(bounds, bounds[1:])]
+    labels.append(f'{bounds[-1]}+')
+    return labels
+
+
+def _age_expression(today):
+    # Âge en années révolues : l'anniversaire de l'année est-il passé ?
+    birthday_passed = (
+        Q(birth_date__month__lt=today.month)
+        | Q(birth_date__month=today.month, birth_date__day__lte=today.day)
+    )
+    return Value(today.year) - ExtractYear('birth_date') - Case(
+        When(birthday_passed, then=Value(0)), default=Value(1),
+    )
+
+
+def demographics(employees, today, years):
+    """Pyramide des âges et départs à la retraite, agrégés en base.
+
+    Deux requêtes GROUP BY, quel que soit l'effectif. Les agents inactifs
+    sont exclus ; ceux sans date de naissance sont comptés dans la tranche
+    UNKNOWN_AGE_BUCKET.
+
+    Args:
+        employees (QuerySet[Employee]): Périmètre des agents.
+        today (date): Date de calcul des âges.
+        years (int): Nombre d'années de prévision des départs (année courante incluse).
+
+    Returns:
+        dict: {
+            'pyramid': [{'department_id', 'department_name', 'direction', 'bucket',
+                         'gender', 'count'}] (tranches dans l'ordre de age_bucket_labels()),
+            'retirements': [{'department_id', 'department_name', 'direction',
+                             'year', 'count'}],
+        }
+    """
+    labels = age_bucket_labels()
+    buckets = [When(birth_date__isnull=True, then=Value(UNKNOWN_AGE_BUCKET))]
+    buckets += [When(age__lt=bound, then=Value(label)) for bound, label in zip(AGE_BUCKET_BOUNDS, labels)]
+    # Rang de la tranche, dans l'ordre de age_bucket_labels() puis UNKNOWN_AGE_BUCKET
+    # (un tri sur le libellé placerait '<25' après '60+')
+    ranks = [When(birth_date__isnull=True, then=Value(len(labels)))]
+    ranks += [When(age__lt=bound, then=Value(rank)) for rank, bound in enumerate(AGE_BUCKET_BOUNDS)]
+    active = employees.exclude(status='inactive').order_by()
+    group = {'department_name': F('department__name')}
+
+    pyramid = list(
+        active.alias(age=_age_expression(today))
+        .alias(bucket_rank=Case(*ranks, default=Value(len(labels) - 1)))
+        .annotate(bucket=Case(*buckets, default=Value(labels[-1])))
+        .values('department_id', 'direction', 'bucket', 'gender', **group)
+        .annotate(count=Count('id'))
+        .order_by('department_name', 'direction', 'bucket_rank', 'gender')
+    )
+    retirements = list(
+        active.annotate(year=ExtractYear('birth_date') + RETIREMENT_AGE)
+        .filter(year__gte=today.year, year__lt=today.year + years)
+        .values('department_id', 'direction', 'year', **group)
+        .annotate(count=Count('id'))
+        .order_by('year', 'department_name', 'direction')
+    )
+    return {'pyramid': pyramid, 'retirements': retirements}
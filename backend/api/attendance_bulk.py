@@ -0,0 +1,457 @@
+"""
+Import en masse des pointages de présence (fichiers d'export des pointeuses).
+
+Les entreprises de gardiennage exportent chaque jour des fichiers de pointage
+contenant plusieurs milliers de badgeages. Plutôt que de créer les présences
+une par une via ``AttendanceViewSet.create`` (un aller-retour par ligne sur la
+contrainte unique (employee, date)), ce module :
+
+  1. Lit un fichier CSV ou XLSX et normalise ses lignes (parse_punch_file).
+  2. Regroupe les badgeages par (matricule, date) : première heure = arrivée,
+     dernière heure = départ ; un badgeage isolé est apparié au premier
+     badgeage du lendemain pour les gardes de nuit (aggregate_punches).
+  3. Résout tous les matricules en identifiants employé en une seule requête.
+  4. Insère ou met à jour les présences par lots via
+     ``bulk_create(update_conflicts=True)`` (upsert_attendances).
+
+Colonnes reconnues (insensibles à la casse et aux accents) :
+  matricule            — obligatoire
+  date                 — obligatoire (AAAA-MM-JJ ou JJ/MM/AAAA)
+  heure | time         — un badgeage unitaire
+  check_in | arrivee   — heure d'arrivée
+  check_out | depart   — heure de départ
+  status | statut      — optionnel, 'present' par défaut
+  notes                — optionnel
+
+Absences : mark_absentees() matérialise en une seule requête INSERT … SELECT
+les lignes 'absent' d'une journée (commande nocturne mark_absentees), afin
+que rapports et statistiques n'aient plus à déduire les absences.
+"""
+
+import csv
+import io
+import unicodedata
+import zipfile
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from .caching import invalidate_attendance_days
+from .models import Attendance, Employee, Leave
+
+# Encodages essayés dans l'ordre pour les CSV (les pointeuses en locale
+# française exportent souvent en Windows-1252)
+CSV_ENCODINGS = ('utf-8-sig', 'cp1252')
+
+# Nombre de lignes envoyées par requête INSERT … ON CONFLICT
+ATTENDANCE_IMPORT_BATCH_SIZE = 1000
+
+# Champs réécrits lorsqu'une présence existe déjà pour (employee, date)
+UPSERT_UPDATE_FIELDS = ['check_in', 'check_out', 'status', 'notes', 'updated_at']
+
+_HEADER_ALIASES = {
+    'matricule': 'matricule',
+    'date': 'date',
+    'jour': 'date',
+    'heure': 'time',
+    'time': 'time',
+    'pointage': 'time',
+    'check_in': 'check_in',
+    'arrivee': 'check_in',
+    'heure_arrivee': 'check_in',
+    'check_out': 'check_out',
+    'depart': 'check_out',
+    'heure_depart': 'check_out',
+    'status': 'status',
+    'statut': 'status',
+    'notes': 'notes',
+}
+
+_VALID_STATUSES = {choice for choice, _ in Attendance.STATUS_CHOICES}
+
+
+def overnight_shift_length(check_in, check_out):
+    """Durée d'une garde de nuit : arrivée à check_in, départ le lendemain à check_out."""
+    return datetime.combine(date.min + timedelta(days=1), check_out) - datetime.combine(date.min, check_in)
+
+
+def is_overnight_shift(check_in, check_out):
+    """Indique si un départ antérieur à l'arrivée forme une garde de nuit plausible.
+
+    La garde (départ le lendemain) ne doit pas dépasser
+    settings.ATTENDANCE_MAX_OVERNIGHT_HOURS heures.
+    """
+    max_hours = getattr(settings, 'ATTENDANCE_MAX_OVERNIGHT_HOURS', 16)
+    return check_out < check_in and overnight_shift_length(check_in, check_out) <= timedelta(hours=max_hours)
+
+
+class PunchFileError(ValueError):
+    """Fichier de pointage illisible ou sans colonnes obligatoires."""
+
+
+def _normalize_header(value):
+    """Normalise un en-tête de colonne : minuscules, sans accents, '_' pour les espaces."""
+    text = unicodedata.normalize('NFKD', str(value or '')).encode('ascii', 'ignore').decode()
+    return '_'.join(text.strip().lower().replace('-', ' ').split())
+
+
+def _parse_date(value):
+    """Convertit une cellule en date (objet date/datetime ou chaîne ISO / française)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or '').strip()
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Date invalide : '{text}'")
+
+
+def _parse_time(value):
+    """Convertit une cellule en heure, ou None si la cellule est vide."""
+    if value in (None, ''):
+        return None
+    if isinstance(value, datetime):
+        return value.time().replace(microsecond=0)
+    if isinstance(value, time):
+        return value.replace(microsecond=0)
+    text = str(value).strip()
+    for fmt in ('%H:%M:%S', '%H:%M', '%Hh%M'):
+        try:
+            return datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Heure invalide : '{text}'")
+
+
+def _decode_csv(content):
+    """Décode un CSV en essayant successivement les encodages de CSV_ENCODINGS."""
+    if not isinstance(content, bytes):
+        return content
+    for encoding in CSV_ENCODINGS:
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise PunchFileError("Encodage du fichier CSV non reconnu (attendu : UTF-8 ou Windows-1252).")
+
+
+def _iter_csv_rows(content):
+    """Itère sur les lignes d'un CSV (séparateur ',' ou ';' détecté automatiquement)."""
+    text = _decode_csv(content)
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    try:
+        yield from csv.reader(io.StringIO(text), dialect)
+    except csv.Error as exc:
+        raise PunchFileError(f"Fichier CSV illisible : {exc}.")
+
+
+def _iter_xlsx_rows(content):
+    """Itère sur les lignes de la première feuille d'un classeur XLSX."""
+    try:
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError):
+        raise PunchFileError("Fichier XLSX illisible ou corrompu.")
+    try:
+        if not workbook.worksheets:
+            raise PunchFileError("Le classeur ne contient aucune feuille.")
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def parse_punch_file(content, filename):
+    """Lit un fichier de pointage CSV ou XLSX et retourne ses lignes normalisées.
+
+    Args:
+        content (bytes): Contenu brut du fichier.
+        filename (str): Nom du fichier (l'extension détermine le format).
+
+    Returns:
+        tuple[list[dict], list[dict]]: (lignes, erreurs). Chaque ligne est un dict
+            {'line', 'matricule', 'date', 'times', 'status', 'notes'} ; chaque erreur
+            est un dict {'line', 'error'}.
+
+    Raises:
+        PunchFileError: Si le format est inconnu, si le fichier est illisible
+            (encodage non reconnu, classeur corrompu) ou si une colonne obligatoire manque.
+    """
+    lowered = (filename or '').lower()
+    if lowered.endswith('.xlsx'):
+        rows = _iter_xlsx_rows(content)
+    elif lowered.endswith(('.csv', '.txt')):
+        rows = _iter_csv_rows(content)
+    else:
+        raise PunchFileError("Format de fichier non supporté (attendu : .csv ou .xlsx).")
+
+    try:
+        header = next(rows)
+    except StopIteration:
+        raise PunchFileError("Le fichier est vide.")
+
+    columns = {}
+    for idx, name in enumerate(header):
+        key = _HEADER_ALIASES.get(_normalize_header(name))
+        if key and key not in columns:
+            columns[key] = idx
+
+    missing = {'matricule', 'date'} - columns.keys()
+    if missing:
+        raise PunchFileError(f"Colonne(s) obligatoire(s) manquante(s) : {', '.join(sorted(missing))}.")
+    if not columns.keys() & {'time', 'check_in', 'check_out', 'status'}:
+        raise PunchFileError("Aucune colonne d'heure (heure, arrivee, depart) ni de statut.")
+
+    def cell(row, key):
+        idx = columns.get(key)
+        if idx is None or idx >= len(row):
+            return None
+        return row[idx]
+
+    parsed, errors = [], []
+    for line, row in enumerate(rows, start=2):
+        if not row or all(v in (None, '') for v in row):
+            continue
+        matricule = str(cell(row, 'matricule') or '').strip()
+        if not matricule:
+            errors.append({'line': line, 'error': "Matricule manquant."})
+            continue
+        try:
+            day = _parse_date(cell(row, 'date'))
+            times = [
+                t for t in (_parse_time(cell(row, key)) for key in ('time', 'check_in'))
+                if t is not None
+            ]
+            check_out = _parse_time(cell(row, 'check_out'))
+        except ValueError as exc:
+            errors.append({'line': line, 'error': str(exc)})
+            continue
+        status_value = str(cell(row, 'status') or '').strip().lower() or None
+        if status_value and status_value not in _VALID_STATUSES:
+            errors.append({'line': line, 'error': f"Statut inconnu : '{status_value}'."})
+            continue
+        # Départ antérieur à l'arrivée sur la même ligne : garde de nuit
+        overnight_out = None
+        if check_out is not None:
+            if times and check_out < min(times):
+                overnight_out = check_out
+            else:
+                times.append(check_out)
+        notes = cell(row, 'notes')
+        parsed.append({
+            'line': line,
+            'matricule': matricule,
+            'date': day,
+            'times': times,
+            'overnight_out': overnight_out,
+            'status': status_value,
+            'notes': str(notes).strip() if notes not in (None, '') else None,
+        })
+    return parsed, errors
+
+
+def aggregate_punches(rows):
+    """Regroupe les badgeages par (matricule, date).
+
+    La première heure de la journée devient check_in, la dernière check_out
+    (uniquement si elle est strictement postérieure). Le dernier statut explicite
+    l'emporte ; à défaut le statut est 'present'.
+
+    Gardes de nuit : une journée réduite à un seul badgeage est appariée avec
+    le premier badgeage du lendemain lorsque celui-ci est antérieur et que la
+    garde ne dépasse pas ATTENDANCE_MAX_OVERNIGHT_HOURS (ex. 22:00 le 2, 06:00
+    le 3 → présence du 2 de 22:00 à 06:00). Le badgeage apparié est retiré du
+    lendemain, qui n'est plus enregistré s'il ne lui reste ni heure ni statut.
+    Un départ antérieur à l'arrivée sur une même ligne (overnight_out) est
+    traité de la même façon.
+
+    Args:
+        rows (list[dict]): Lignes retournées par parse_punch_file.
+
+    Returns:
+        dict: {(matricule, date): {'check_in', 'check_out', 'status', 'notes'}}
+    """
+    grouped = {}
+    for row in rows:
+        entry = grouped.setdefault(
+            (row['matricule'], row['date']),
+            {'times': [], 'overnight_out': None, 'status': None, 'notes': None},
+        )
+        entry['times'].extend(row['times'])
+        if row.get('overnight_out'):
+            entry['overnight_out'] = row['overnight_out']
+        if row['status']:
+            entry['status'] = row['status']
+        if row['notes']:
+            entry['notes'] = row['notes']
+
+    result = {}
+    # Ordre chronologique : un badgeage apparié à la veille est retiré avant
+    # le traitement de sa propre journée
+    for key in sorted(grouped):
+        entry = grouped[key]
+        times = sorted(entry['times'])
+        if entry.get('paired') and not times and not entry['status'] and not entry['notes']:
+            # Journée réduite au départ d'une garde commencée la veille
+            continue
+        check_in = times[0] if times else None
+        check_out = times[-1] if len(times) > 1 and times[-1] > times[0] else None
+
+        if check_in is not None and check_out is None:
+            matricule, day = key
+            next_entry = grouped.get((matricule, day + timedelta(days=1)))
+            candidate, from_next_day = entry['overnight_out'], False
+            if candidate is None and len(times) == 1 and next_entry and next_entry['times']:
+                candidate, from_next_day = min(next_entry['times']), True
+            if candidate is not None and is_overnight_shift(check_in, candidate):
+                check_out = candidate
+                if from_next_day:
+                    next_entry['times'].remove(candidate)
+                    next_entry['paired'] = True
+
+        result[key] = {
+            'check_in': check_in,
+            'check_out': check_out,
+            'status': entry['status'] or 'present',
+            'notes': entry['notes'],
+        }
+    return result
+
+
+def upsert_attendances(records, batch_size=ATTENDANCE_IMPORT_BATCH_SIZE, update_fields=None):
+    """Insère ou met à jour des présences par lots (INSERT … ON CONFLICT DO UPDATE).
+
+    S'appuie sur la contrainte unique (employee, date) : une présence existante
+    est mise à jour au lieu d'être dupliquée.
+
+    Args:
+        records (list[Attendance]): Instances non sauvegardées (employee_id, date renseignés).
+        batch_size (int): Nombre de lignes par requête.
+        update_fields (list[str] | None): Champs réécrits en cas de conflit
+            (UPSERT_UPDATE_FIELDS par défaut).
+
+    Returns:
+        int: Nombre de lots exécutés.
+    """
+    if not records:
+        return 0
+    fields = update_fields or UPSERT_UPDATE_FIELDS
+    batches = 0
+    with transaction.atomic():
+        for start in range(0, len(records), batch_size):
+            Attendance.objects.bulk_create(
+                records[start:start + batch_size],
+                update_conflicts=True,
+                unique_fields=['employee', 'date'],
+                update_fields=fields,
+            )
+            batches += 1
+    # bulk_create n'émet pas de signal post_save
+    invalidate_attendance_days({r.date for r in records})
+    return batches
+
+
+def ingest_punches(rows, employees=None, batch_size=ATTENDANCE_IMPORT_BATCH_SIZE):
+    """Enregistre des badgeages normalisés et retourne les statistiques d'import.
+
+    Args:
+        rows (list[dict]): Lignes retournées par parse_punch_file.
+        employees (QuerySet[Employee] | None): Périmètre des employés autorisés
+            (tous les employés si None). Les matricules hors périmètre sont ignorés.
+        batch_size (int): Nombre de lignes par requête d'upsert.
+
+    Returns:
+        dict: {'rows', 'records', 'created', 'updated', 'batches', 'unknown_matricules'}
+    """
+    aggregated = aggregate_punches(rows)
+    matricules = {matricule for matricule, _ in aggregated}
+
+    if employees is None:
+        employees = Employee.objects.all()
+    # Une seule requête pour résoudre tous les matricules du fichier
+    id_by_matricule = dict(
+        employees.filter(matricule__in=matricules).values_list('matricule', 'id')
+    )
+
+    records = []
+    for (matricule, day), values in aggregated.items():
+        employee_id = id_by_matricule.get(matricule)
+        if employee_id is None:
+            continue
+        records.append(Attendance(employee_id=employee_id, date=day, **values))
+
+    existing = 0
+    if records:
+        days = [r.date for r in records]
+        existing_pairs = set(
+            Attendance.objects.filter(
+                employee_id__in=set(id_by_matricule.values()),
+                date__range=(min(days), max(days)),
+            ).values_list('employee_id', 'date')
+        )
+        existing = sum(1 for r in records if (r.employee_id, r.date) in existing_pairs)
+
+    batches = upsert_attendances(records, batch_size=batch_size)
+
+    return {
+        'rows': len(rows),
+        'records': len(records),
+        'created': len(records) - existing,
+        'updated': existing,
+        'batches': batches,
+        'unknown_matricules': sorted(matricules - id_by_matricule.keys()),
+    }
+
+
+def mark_absentees(day, department=None):
+    """Enregistre 'absent' chaque agent sans présence ni congé approuvé pour une date.
+
+    Une seule requête ensembliste INSERT … SELECT … ON CONFLICT DO NOTHING :
+    sont concernés les agents non inactifs, embauchés au plus tard ce jour,
+    sans présence à cette date et sans congé approuvé la couvrant. Les lignes
+    existantes ne sont jamais modifiées : la commande est idempotente.
+
+    Args:
+        day (date): Journée à traiter.
+        department (Department | None): Limite le traitement à une entreprise.
+
+    Returns:
+        int: Nombre de lignes 'absent' créées.
+    """
+    quote = connection.ops.quote_name
+    attendance = quote(Attendance._meta.db_table)
+    employee = quote(Employee._meta.db_table)
+    leave = quote(Leave._meta.db_table)
+    now = timezone.now()
+
+    department_clause = ''
+    params = [day, now, now, day]
+    if department is not None:
+        department_clause = 'AND e.department_id = %s'
+        params.append(department.pk)
+    params.extend([day, day, day])
+
+    sql = (
+        f"INSERT INTO {attendance} (employee_id, date, status, created_at, updated_at) "
+        f"SELECT e.id, %s, 'absent', %s, %s FROM {employee} e "
+        f"WHERE e.status <> 'inactive' AND e.hire_date <= %s {department_clause} "
+        f"AND NOT EXISTS (SELECT 1 FROM {leave} l WHERE l.employee_id = e.id "
+        f"AND l.status = 'approved' AND l.start_date <= %s AND l.end_date >= %s) "
+        f"AND NOT EXISTS (SELECT 1 FROM {attendance} a WHERE a.employee_id = e.id AND a.date = %s) "
+        f"ON CONFLICT (employee_id, date) DO NOTHING"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        created = cursor.rowcount
+    if created:
+        invalidate_attendance_days([day])
+    return created
@@ -0,0 +1,169 @@
+"""
+Badges de pointage signés (QR codes) vérifiables sans accès à la base.
+
+Format du jeton (compact, adapté à un QR code) :
+
+    <employee_id>.<department_id>.<expiration epoch>.<série>:<signature>
+
+La signature HMAC-SHA256 est produite par ``django.core.signing.Signer``
+(clé SECRET_KEY, sel BADGE_SALT). Au pointage, verify_badge() contrôle la
+signature, l'expiration et la liste de révocation en mémoire : aucune requête
+SQL n'est nécessaire pour identifier l'agent.
+
+Révocation :
+  La table Badge trace les badges émis. revoke_badges() renseigne revoked_at ;
+  la liste de révocation (ensemble des numéros de série révoqués et non encore
+  expirés) est rechargée toutes les BADGE_REVOCATION_REFRESH secondes par
+  chaque processus, et mise à jour immédiatement dans le processus révocateur.
+  Les badges d'un agent sont révoqués automatiquement lorsqu'il change
+  d'entreprise ou devient inactif (signal post_save, voir api.signals) ; en
+  outre, CheckInDirectory.can_check_in_badge refuse un badge dont l'entreprise
+  ne correspond plus à celle de l'annuaire.
+"""
+
+import secrets
+import threading
+import time as time_module
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .models import Badge
+
+BADGE_SALT = 'api.badges'
+
+BadgeClaims = namedtuple('BadgeClaims', ['employee_id', 'department_id', 'expires_at', 'serial'])
+
+
+class BadgeError(Exception):
+    """Jeton de badge invalide, expiré ou révoqué."""
+
+
+def _signer():
+    return signing.Signer(salt=BADGE_SALT, algorithm='sha256')
+
+
+def _new_serial():
+    """Numéro de série aléatoire de 48 bits, encodé en base 62 (≤ 9 caractères)."""
+    return signing.b62_encode(secrets.randbits(48))
+
+
+def issue_badge(employee, issued_by=None, validity_days=None):
+    """Émet un badge signé pour un employé.
+
+    Args:
+        employee (Employee): Titulaire du badge.
+        issued_by (User | None): Utilisateur émetteur (traçabilité).
+        validity_days (int | None): Durée de validité (BADGE_VALIDITY_DAYS par défaut).
+
+    Returns:
+        tuple[str, Badge]: (jeton à imprimer sous forme de QR code, badge enregistré).
+    """
+    days = validity_days or getattr(settings, 'BADGE_VALIDITY_DAYS', 365)
+    expires_at = (timezone.now() + timedelta(days=days)).replace(microsecond=0)
+    badge = Badge.objects.create(
+        serial=_new_serial(),
+        employee=employee,
+        issued_by=issued_by,
+        expires_at=expires_at,
+    )
+    payload = f"{employee.pk}.{employee.department_id or 0}.{int(expires_at.timestamp())}.{badge.serial}"
+    return _signer().sign(payload), badge
+
+
+def verify_badge(token):
+    """Vérifie un jeton de badge en mémoire (signature, expiration, révocation).
+
+    Args:
+        token (str): Jeton lu sur le QR code.
+
+    Returns:
+        BadgeClaims: (employee_id, department_id, expires_at, serial).
+
+    Raises:
+        BadgeError: Si la signature est invalide, le badge expiré ou révoqué.
+    """
+    try:
+        payload = _signer().unsign(str(token))
+        employee_id, department_id, expires, serial = payload.split('.')
+        claims = BadgeClaims(
+            int(employee_id),
+            int(department_id) or None,
+            datetime.fromtimestamp(int(expires), tz=dt_timezone.utc),
+            serial,
+        )
+    except (signing.BadSignature, ValueError):
+        raise BadgeError("Badge invalide.")
+    if claims.expires_at <= timezone.now():
+        raise BadgeError("Badge expiré.")
+    if revocation_list.is_revoked(claims.serial):
+        raise BadgeError("Badge révoqué.")
+    return claims
+
+
+def revoke_badges(employee=None, serial=None):
+    """Révoque un badge précis ou tous les badges actifs d'un employé.
+
+    Args:
+        employee (Employee | None): Employé dont tous les badges sont révoqués.
+        serial (str | None): Numéro de série d'un badge précis.
+
+    Returns:
+        list[str]: Numéros de série révoqués.
+    """
+    qs = Badge.objects.filter(revoked_at__isnull=True, expires_at__gt=timezone.now())
+    if employee is not None:
+        qs = qs.filter(employee=employee)
+    if serial is not None:
+        qs = qs.filter(serial=serial)
+    serials = list(qs.values_list('serial', flat=True))
+    if serials:
+        Badge.objects.filter(serial__in=serials).update(revoked_at=timezone.now())
+        revocation_list.add(serials)
+    return serials
+
+
+class RevocationList:
+    """Ensemble en mémoire des numéros de série révoqués et non expirés.
+
+    Les badges expirés sont déjà refusés par verify_badge() : seuls les badges
+    révoqués encore dans leur période de validité sont conservés, ce qui garde
+    l'ensemble très petit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._serials = frozenset()
+        self._loaded_at = None
+
+    def _refresh(self):
+        self._serials = frozenset(
+            Badge.objects.filter(
+                revoked_at__isnull=False, expires_at__gt=timezone.now()
+            ).values_list('serial', flat=True)
+        )
+        self._loaded_at = time_module.monotonic()
+
+    def is_revoked(self, serial):
+        """Indique si un numéro de série est révoqué (rechargement périodique)."""
+        period = getattr(settings, 'BADGE_REVOCATION_REFRESH', 30)
+        if self._loaded_at is None or time_module.monotonic() - self._loaded_at >= period:
+            with self._lock:
+                if self._loaded_at is None or time_module.monotonic() - self._loaded_at >= period:
+                    self._refresh()
+        return serial in self._serials
+
+    def add(self, serials):
+        """Ajoute immédiatement des numéros de série révoqués (processus courant)."""
+        with self._lock:
+            self._serials = self._serials | frozenset(serials)
+
+    def invalidate(self):
+        """Force le rechargement au prochain contrôle."""
+        self._loaded_at = None
+
+
+revocation_list = RevocationList()
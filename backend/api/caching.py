@@ -0,0 +1,224 @@
+"""
+Mise en cache des lectures fréquentes, par périmètre d'utilisateur.
+
+Les réponses mises en cache dépendent du périmètre de l'appelant (admin,
+entreprise, directions d'un manager, employé) : scope_cache_key() en dérive
+une clé stable, partagée par tous les comptes ayant le même périmètre.
+
+L'invalidation repose sur un compteur de version par date : toute écriture
+d'une présence (signal post_save / post_delete, upsert en masse, tampon de
+pointage rapide) incrémente la version de sa date, ce qui rend obsolètes
+toutes les entrées de cache de ce jour sans avoir à les énumérer.
+
+Le cache par défaut (LocMemCache) est propre à chaque processus : la durée de
+vie courte (ATTENDANCE_TODAY_CACHE_TTL) borne le décalage entre processus.
+
+Les statistiques du tableau de bord (/api/dashboard/stats/) sont mises en
+cache par périmètre pendant DASHBOARD_STATS_CACHE_TTL secondes, avec un
+compteur de version global incrémenté à chaque écriture d'un agent, d'un congé
+ou d'une présence (signaux, traitements en masse). Une entrée expirée ou
+obsolète est recalculée par une seule requête à la fois (verrou cache.add) ;
+les requêtes concurrentes servent pendant ce temps la valeur précédente
+(get_or_refresh). Avec le LocMemCache, verrou et version sont propres à
+chaque processus ; un cache partagé (Redis, Memcached) les étend à tous.
+
+La pyramide des âges et les prévisions de départs à la retraite
+(/api/analytics/demographics/) suivent le même schéma, avec leur propre
+version, incrémentée à chaque écriture d'un agent (DEMOGRAPHICS_CACHE_TTL).
+
+conditional_response() ajoute un ETag (empreinte du contenu) aux réponses
+interrogées souvent et répond 304 Not Modified si le client présente le même
+(If-None-Match) : le navigateur réutilise alors sa copie.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def scope_cache_key(ctx, user):
+    """Retourne une clé identifiant le périmètre de données d'un utilisateur.
+
+    Args:
+        ctx (dict): Contexte retourné par get_user_context.
+        user (User): Utilisateur authentifié (utilisé pour le rôle employee).
+
+    Returns:
+        str: 'admin', 'entreprise:<id>', 'manager:<empreinte des directions>'
+            ou 'employee:<user id>'.
+    """
+    role = ctx['role']
+    if role == 'admin':
+        return 'admin'
+    if role == 'entreprise':
+        return f"entreprise:{ctx['department'].pk}"
+    if role == 'manager':
+        directions = '|'.join(sorted(ctx['directions']))
+        return f"manager:{hashlib.md5(directions.encode()).hexdigest()}"
+    return f'employee:{user.pk}'
+
+
+def _day_version_key(day):
+    return f'attendance:version:{day.isoformat()}'
+
+
+def attendance_day_version(day):
+    """Retourne la version courante des présences d'une date."""
+    return cache.get_or_set(_day_version_key(day), 1, timeout=None)
+
+
+def invalidate_attendance_days(days):
+    """Rend obsolètes les entrées de cache des présences pour les dates données.
+
+    Seule la date du jour est mise en cache : les autres dates sont ignorées.
+    Les statistiques du tableau de bord sont toujours invalidées.
+
+    Args:
+        days (Iterable[date]): Dates des présences écrites ou supprimées.
+    """
+    invalidate_dashboard_stats()
+    today = timezone.localdate()
+    if today not in set(days):
+        return
+    key = _day_version_key(today)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def today_attendance_cache_key(scope_key, day):
+    """Clé de cache de la liste des présences du jour pour un périmètre."""
+    return f'attendance:today:{day.isoformat()}:v{attendance_day_version(day)}:{scope_key}'
+
+
+def today_attendance_cache_ttl():
+    """Durée de vie (secondes) de la liste des présences du jour en cache."""
+    return getattr(settings, 'ATTENDANCE_TODAY_CACHE_TTL', 30)
+
+
+DASHBOARD_STATS_VERSION_KEY = 'dashboard:stats:version'
+DEMOGRAPHICS_VERSION_KEY = 'analytics:demographics:version'
+
+# Durée maximale (secondes) d'un recalcul avant libération du verrou
+REFRESH_LOCK_TIMEOUT = 10
+
+
+def dashboard_stats_version():
+    """Retourne la version courante des statistiques du tableau de bord."""
+    return cache.get_or_set(DASHBOARD_STATS_VERSION_KEY, 1, timeout=None)
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def _bump_dashboard_stats_version():
+    _bump_version(DASHBOARD_STATS_VERSION_KEY)
+
+
+def invalidate_dashboard_stats():
+    """Rend obsolètes les statistiques du tableau de bord de tous les périmètres.
+
+    Dans une transaction, la version est incrémentée une seconde fois après
+    le COMMIT : un recalcul concurrent lisant encore les données d'avant
+    l'écriture n'est pas conservé.
+    """
+    _bump_dashboard_stats_version()
+    if connection.in_atomic_block:
+        transaction.on_commit(_bump_dashboard_stats_version)
+
+
+def demographics_version():
+    """Retourne la version courante des données démographiques des agents."""
+    return cache.get_or_set(DEMOGRAPHICS_VERSION_KEY, 1, timeout=None)
+
+
+def _bump_demographics_version():
+    _bump_version(DEMOGRAPHICS_VERSION_KEY)
+
+
+def invalidate_demographics():
+    """Rend obsolètes les pyramides des âges et prévisions de départs en cache.
+
+    Comme invalidate_dashboard_stats, incrémentée à nouveau après le COMMIT.
+    """
+    _bump_demographics_version()
+    if connection.in_atomic_block:
+        transaction.on_commit(_bump_demographics_version)
+
+
+def dashboard_stats_cache_key(scope_key):
+    """Clé de cache des statistiques du tableau de bord d'un périmètre."""
+    return f'dashboard:stats:{scope_key}'
+
+
+def get_or_refresh(key, version, compute, ttl, max_stale=None):
+    """Valeur en cache, recalculée par un seul appelant à la fois une fois périmée.
+
+    Une entrée est fraîche si sa version est `version` et qu'elle a moins de
+    `ttl` secondes. Sinon, le premier appelant qui obtient le verrou la
+    recalcule ; les autres renvoient la valeur périmée sans attendre. Sans
+    entrée (démarrage, entrée plus vieille que `max_stale`), chaque appelant calcule.
+
+    Args:
+        key (str): Clé de cache.
+        version (int): Version courante des données (lue avant le calcul).
+        compute (Callable[[], Any]): Calcul de la valeur.
+        ttl (int): Durée de fraîcheur (secondes).
+        max_stale (int | None): Conservation d'une entrée périmée (secondes,
+            défaut : 10 × ttl).
+
+    Returns:
+        Any: Valeur fraîche, recalculée ou périmée.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry['version'] == version and entry['expires'] > time.time():
+        return entry['value']
+    lock_key = f'{key}:refresh'
+    locked = cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT)
+    if entry is not None and not locked:
+        # Recalcul déjà en cours : la valeur précédente est servie
+        return entry['value']
+    try:
+        value = compute()
+        cache.set(
+            key, {'version': version, 'expires': time.time() + ttl, 'value': value},
+            timeout=max_stale if max_stale is not None else ttl * 10,
+        )
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def conditional_response(request, data):
+    """Réponse JSON avec ETag, ou 304 si If-None-Match correspond.
+
+    Args:
+        request (Request): Requête GET.
+        data: Corps de la réponse (sérialisable en JSON).
+
+    Returns:
+        Response: HTTP 200 avec ETag, ou HTTP 304 sans corps.
+    """
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    # Le navigateur conserve la réponse mais la revalide à chaque appel
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(data, headers=headers)
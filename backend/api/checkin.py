@@ -0,0 +1,317 @@
+"""
+Pointage rapide à fort débit (pic d'arrivée du matin).
+
+Les entreprises de gardiennage (IVOIR GARDIENNAGE, NBIG…) font pointer
+plusieurs centaines d'agents dans une fenêtre très courte. Le chemin standard
+(POST /attendances/ : get_user_context, serializer DRF, un INSERT par agent)
+est remplacé par :
+
+  CheckInDirectory — Annuaire en mémoire des agents pointables et des périmètres
+                     (admin / entreprise / directions) des comptes actifs. Rechargé
+                     toutes les CHECKIN_DIRECTORY_TTL secondes : la validation
+                     d'un pointage ne coûte aucune requête.
+
+  CheckInBuffer    — Tampon de pointages « group commit ». Le premier pointage
+                     reçu sur un tampon vide devient le meneur : il attend
+                     CHECKIN_FLUSH_INTERVAL secondes (ou que le lot atteigne
+                     CHECKIN_MAX_BATCH), puis écrit tout le lot en un seul
+                     INSERT … ON CONFLICT. Chaque requête n'est acquittée
+                     qu'après l'écriture effective de son pointage.
+
+L'écriture est faite par le thread de la requête meneuse (pas de thread de
+fond ni de connexion dédiée) : le regroupement suppose un serveur multi-thread
+(gunicorn --threads, runserver), sinon chaque lot ne contient qu'un pointage.
+
+Sémantique de l'upsert : la première arrivée de la journée est conservée ;
+une ligne existante sans heure d'arrivée (ex. marquée 'absent' par un pointage
+groupé) reçoit l'heure et le statut du pointage.
+"""
+
+import logging
+import threading
+import time as time_module
+from datetime import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .caching import invalidate_attendance_days
+from .models import Attendance, CompanyProfile, Employee, ManagerProfile
+
+logger = logging.getLogger('api')
+
+
+def get_late_threshold():
+    """Retourne l'heure limite d'arrivée (settings.ATTENDANCE_LATE_AFTER) sous forme de time."""
+    return time.fromisoformat(getattr(settings, 'ATTENDANCE_LATE_AFTER', '08:00'))
+
+
+class CheckInDirectory:
+    """Annuaire en mémoire utilisé pour valider un pointage sans requête SQL.
+
+    Contient :
+      - les comptes administrateurs actifs ;
+      - les agents pointables (statut différent de 'inactive') avec leur
+        entreprise et leur direction ;
+      - l'entreprise de chaque compte 'entreprise' ;
+      - les directions de chaque compte manager.
+
+    Les dictionnaires sont reconstruits en bloc puis échangés, ce qui permet
+    aux lectures concurrentes de se faire sans verrou.
+    """
+
+    # Délai minimal entre deux rechargements forcés (agent inconnu)
+    MIN_FORCED_REFRESH = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._employees = {}
+        self._admins = set()
+        self._companies = {}
+        self._managers = {}
+
+    def _refresh(self):
+        """Recharge les tables d'annuaire (4 requêtes)."""
+        employees = {
+            pk: (department_id, direction)
+            for pk, department_id, direction in Employee.objects.exclude(
+                status='inactive'
+            ).values_list('id', 'department_id', 'direction')
+        }
+        admins = set(
+            User.objects.filter(is_superuser=True, is_active=True).values_list('id', flat=True)
+        )
+        companies = dict(
+            CompanyProfile.objects.filter(user__is_active=True).values_list('user_id', 'department_id')
+        )
+        managers = {}
+        for user_id, name in ManagerProfile.objects.filter(
+            user__is_active=True, user__is_staff=True
+        ).values_list('user_id', 'directions__name'):
+            if name:
+                managers.setdefault(user_id, set()).add(name)
+        self._employees, self._admins = employees, admins
+        self._companies, self._managers = companies, managers
+        self._loaded_at = time_module.monotonic()
+
+    def _ensure_fresh(self, force=False):
+        ttl = getattr(settings, 'CHECKIN_DIRECTORY_TTL', 60)
+        age = None if self._loaded_at is None else time_module.monotonic() - self._loaded_at
+        if age is not None and age < ttl and not (force and age >= self.MIN_FORCED_REFRESH):
+            return
+        with self._lock:
+            age = None if self._loaded_at is None else time_module.monotonic() - self._loaded_at
+            if age is None or age >= ttl or (force and age >= self.MIN_FORCED_REFRESH):
+                self._refresh()
+
+    def invalidate(self):
+        """Force le rechargement de l'annuaire au prochain accès."""
+        self._loaded_at = None
+
+    def _user_may_check_in(self, user_id, department_id, direction):
+        # Même priorité que get_user_context : admin > entreprise > manager
+        if user_id in self._admins:
+            return True
+        if user_id in self._companies:
+            return self._companies[user_id] == department_id
+        return direction in self._managers.get(user_id, ())
+
+    def _employee_entry(self, employee_id):
+        """Retourne (department_id, direction) d'un agent pointable, ou None."""
+        self._ensure_fresh()
+        entry = self._employees.get(employee_id)
+        if entry is None:
+            # Agent peut-être créé depuis le dernier chargement
+            self._ensure_fresh(force=True)
+            entry = self._employees.get(employee_id)
+        return entry
+
+    def can_check_in(self, user, employee_id):
+        """Indique si `user` peut enregistrer l'arrivée de l'agent `employee_id`.
+
+        Règles identiques au filtrage par rôle : l'admin pointe tout le monde,
+        un compte entreprise ses agents, un manager les agents de ses directions.
+
+        Args:
+            user (User | TokenUser): Utilisateur authentifié (poste de pointage) ;
+                seul son identifiant est utilisé.
+            employee_id (int): Identifiant de l'agent.
+
+        Returns:
+            bool: True si l'agent existe, est pointable et est dans le périmètre.
+        """
+        entry = self._employee_entry(employee_id)
+        if entry is None:
+            return False
+        return self._user_may_check_in(user.id, *entry)
+
+    def can_check_in_badge(self, user, employee_id, department_id):
+        """Variante de can_check_in pour un agent identifié par badge signé.
+
+        L'entreprise inscrite dans le jeton doit correspondre à celle de
+        l'annuaire : un badge émis avant un transfert, ou celui d'un agent
+        devenu inactif (absent de l'annuaire), est refusé même s'il n'a pas
+        encore été révoqué.
+
+        Args:
+            user (User | TokenUser): Utilisateur authentifié (poste de pointage).
+            employee_id (int): Identifiant de l'agent (issu du badge).
+            department_id (int | None): Entreprise de l'agent (issue du badge).
+
+        Returns:
+            bool: True si le poste peut pointer cet agent.
+        """
+        entry = self._employee_entry(employee_id)
+        if entry is None or entry[0] != department_id:
+            return False
+        return self._user_may_check_in(user.id, *entry)
+
+
+class _Ticket:
+    """Pointage en attente d'écriture ; `done` est signalé après le flush."""
+
+    __slots__ = ('employee_id', 'date', 'check_in', 'status', 'done', 'result', 'error')
+
+    def __init__(self, employee_id, date, check_in, status):
+        self.employee_id = employee_id
+        self.date = date
+        self.check_in = check_in
+        self.status = status
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CheckInBuffer:
+    """Tampon « group commit » des pointages d'arrivée.
+
+    Voir la docstring du module pour le principe de fonctionnement.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._full = threading.Event()
+        self.flushes = 0
+        self.flushed_rows = 0
+
+    def submit(self, employee_id, timeout=5.0):
+        """Enregistre l'arrivée d'un agent et attend son écriture en base.
+
+        Args:
+            employee_id (int): Identifiant de l'agent (déjà validé).
+            timeout (float): Attente maximale de l'acquittement (secondes).
+
+        Returns:
+            dict: {'employee', 'date', 'check_in', 'status'} tel qu'enregistré
+                (la première arrivée du jour est conservée).
+
+        Raises:
+            TimeoutError: Si le lot n'a pas été écrit dans le délai imparti.
+            DatabaseError: Si l'écriture de ce pointage a échoué.
+        """
+        now = timezone.localtime()
+        check_in = now.time().replace(microsecond=0)
+        status = 'late' if check_in > get_late_threshold() else 'present'
+        ticket = _Ticket(employee_id, now.date(), check_in, status)
+
+        with self._lock:
+            self._pending.append(ticket)
+            is_leader = len(self._pending) == 1
+            if len(self._pending) >= getattr(settings, 'CHECKIN_MAX_BATCH', 500):
+                self._full.set()
+
+        if is_leader:
+            self._full.wait(getattr(settings, 'CHECKIN_FLUSH_INTERVAL', 0.2))
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._full.clear()
+            self._flush(batch)
+
+        if not ticket.done.wait(timeout):
+            raise TimeoutError("Le pointage n'a pas pu être enregistré à temps.")
+        if ticket.error is not None:
+            raise ticket.error
+        return ticket.result
+
+    def _flush(self, batch):
+        """Écrit un lot de pointages puis réveille les requêtes en attente.
+
+        Toutes les requêtes du lot sont réveillées, même si le flush échoue
+        de façon inattendue : elles reçoivent alors l'erreur au lieu
+        d'attendre l'expiration de leur délai.
+        """
+        results, error = {}, None
+        try:
+            # Une même clé (employee, date) ne peut apparaître qu'une fois par INSERT … ON CONFLICT
+            rows = {}
+            for ticket in batch:
+                key = (ticket.employee_id, ticket.date)
+                if key not in rows or ticket.check_in < rows[key].check_in:
+                    rows[key] = ticket
+            try:
+                results = self._write(list(rows.values()))
+            except DatabaseError:
+                logger.warning("Échec du lot de %s pointages, écriture unitaire", len(rows), exc_info=True)
+                results = {}
+                for key, ticket in rows.items():
+                    try:
+                        results.update(self._write([ticket]))
+                    except DatabaseError as exc:
+                        results[key] = exc
+
+            # L'upsert SQL brut n'émet pas de signal post_save
+            invalidate_attendance_days({day for _, day in rows})
+            self.flushes += 1
+            self.flushed_rows += len(rows)
+            logger.debug("Lot de %s pointage(s) écrit (%s requête(s) acquittée(s))", len(rows), len(batch))
+        except Exception as exc:
+            logger.exception("Échec inattendu du lot de %s pointage(s)", len(batch))
+            error = DatabaseError(f"Pointage non enregistré : {exc}")
+            error.__cause__ = exc
+        finally:
+            for ticket in batch:
+                outcome = results.get((ticket.employee_id, ticket.date))
+                if isinstance(outcome, dict):
+                    ticket.result = outcome
+                else:
+                    ticket.error = outcome or error or DatabaseError("Pointage non enregistré.")
+                ticket.done.set()
+
+    @staticmethod
+    def _write(tickets):
+        """Exécute l'upsert ensembliste et retourne les lignes enregistrées par clé."""
+        table = connection.ops.quote_name(Attendance._meta.db_table)
+        now = timezone.now()
+        placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(tickets))
+        params = []
+        for t in tickets:
+            params.extend([t.employee_id, t.date, t.check_in, t.status, now, now])
+        sql = (
+            f"INSERT INTO {table} (employee_id, date, check_in, status, created_at, updated_at) "
+            f"VALUES {placeholders} "
+            f"ON CONFLICT (employee_id, date) DO UPDATE SET "
+            f"check_in = COALESCE({table}.check_in, EXCLUDED.check_in), "
+            f"status = CASE WHEN {table}.check_in IS NULL THEN EXCLUDED.status ELSE {table}.status END, "
+            f"updated_at = EXCLUDED.updated_at "
+            f"RETURNING employee_id, date, check_in, status"
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            returned = cursor.fetchall()
+        return {
+            (employee_id, day): {
+                'employee': employee_id,
+                'date': day.isoformat(),
+                'check_in': check_in.isoformat() if check_in else None,
+                'status': status,
+            }
+            for employee_id, day, check_in, status in returned
+        }
+
+
+checkin_directory = CheckInDirectory()
+checkin_buffer = CheckInBuffer()
@@ -0,0 +1,161 @@
+"""
+Synchronisation incrémentale des listes (?updated_since=).
+
+GET /api/employees/, /api/leaves/ et /api/attendances/ acceptent le paramètre
+`updated_since` (horodatage ISO 8601) : seules les lignes modifiées depuis
+sont renvoyées, avec les identifiants des lignes supprimées (pierres tombales,
+modèle DeletionLog) et un point de reprise pour l'appel suivant :
+
+  {
+    "results": [...],               — lignes créées ou modifiées (même format que la liste)
+    "deleted": [id, ...],           — lignes supprimées, à retirer de la copie locale
+    "high_water_mark": "<ISO 8601>" — valeur de updated_since pour l'appel suivant
+  }
+
+Sans le paramètre, la liste complète est renvoyée comme avant ; son point de
+reprise est dans l'en-tête X-High-Water-Mark.
+
+updated_at est fixé par l'application avant le COMMIT : une transaction plus
+longue que l'appel client peut valider une ligne datée d'avant le point de
+reprise. Chaque appel relit donc les DELTA_SYNC_OVERLAP dernières secondes ;
+une ligne peut être renvoyée deux fois (le client la remplace par son id).
+
+Le client applique les suppressions avant les modifications. Une ligne qui
+sort du périmètre sans être supprimée (agent changé d'entreprise ou de
+direction) n'a pas de pierre tombale : elle disparaît au prochain chargement
+complet. Un point de reprise antérieur à DELTA_SYNC_RETENTION_DAYS (pierres
+tombales purgées par la commande purge_deletion_log) est refusé (HTTP 410) :
+le client recharge la liste complète.
+
+  DeltaSyncMixin        — Mixin de ViewSet ajoutant ?updated_since= à list().
+  log_deletion()        — Écrit la pierre tombale d'une ligne supprimée (signaux).
+  deleted_ids()         — Pierres tombales d'une ressource visibles dans un périmètre.
+  purge_deletion_log()  — Supprime les pierres tombales trop anciennes.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import DeletionLog, Employee
+
+
+def _retention():
+    return timedelta(days=getattr(settings, 'DELTA_SYNC_RETENTION_DAYS', 30))
+
+
+def log_deletion(resource, instance):
+    """Écrit la pierre tombale d'un agent, d'un congé ou d'une présence supprimé(e).
+
+    Une seule requête : pour un congé ou une présence, le périmètre est recopié
+    depuis l'agent par INSERT … SELECT (aucune ligne si l'agent a disparu ;
+    la pierre tombale de l'agent suffit alors).
+
+    Args:
+        resource (str): DeletionLog.RESOURCE_EMPLOYEE, _LEAVE ou _ATTENDANCE.
+        instance (Model): Instance supprimée (signal post_delete).
+    """
+    now = timezone.now()
+    if resource == DeletionLog.RESOURCE_EMPLOYEE:
+        DeletionLog.objects.create(
+            resource=resource, object_id=instance.pk, department_id=instance.department_id,
+            direction=instance.direction, user_id=instance.user_id, deleted_at=now,
+        )
+        return
+    log, employee = DeletionLog._meta.db_table, Employee._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {log} (resource, object_id, department_id, direction, user_id, deleted_at) "
+            f"SELECT %s, %s, department_id, direction, user_id, %s FROM {employee} WHERE id = %s",
+            [resource, instance.pk, now, instance.employee_id],
+        )
+
+
+def deleted_ids(resource, since, ctx, user):
+    """Identifiants des lignes d'une ressource supprimées depuis `since`, dans le périmètre.
+
+    Args:
+        resource (str): Ressource (voir DeletionLog.RESOURCE_CHOICES).
+        since (datetime): Borne basse (incluse) de deleted_at.
+        ctx (dict): Contexte retourné par get_user_context.
+        user (User): Utilisateur authentifié (rôle employee).
+
+    Returns:
+        list[int]: Identifiants distincts, triés.
+    """
+    qs = DeletionLog.objects.filter(resource=resource, deleted_at__gte=since)
+    role = ctx['role']
+    if role == 'entreprise':
+        qs = qs.filter(department_id=ctx['department'].pk)
+    elif role == 'manager':
+        if not ctx['directions']:
+            return []
+        qs = qs.filter(direction__in=ctx['directions'])
+    elif role == 'employee':
+        qs = qs.filter(user_id=user.pk)
+    return sorted(set(qs.values_list('object_id', flat=True)))
+
+
+def purge_deletion_log(now=None):
+    """Supprime les pierres tombales plus anciennes que DELTA_SYNC_RETENTION_DAYS.
+
+    Returns:
+        int: Nombre de pierres tombales supprimées.
+    """
+    cutoff = (now or timezone.now()) - _retention()
+    deleted, _ = DeletionLog.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+class DeltaSyncMixin:
+    """Ajoute ?updated_since= à l'action list() d'un ViewSet (voir la docstring du module).
+
+    S'appuie sur get_queryset() (périmètre de l'utilisateur), filter_queryset()
+    et get_serializer() du ViewSet : les lignes renvoyées ont le même format
+    que la liste complète.
+
+    Attributes:
+        delta_resource (str): Ressource des pierres tombales (DeletionLog.RESOURCE_*).
+    """
+
+    delta_resource = None
+
+    def list(self, request, *args, **kwargs):
+        # Point de reprise fixé avant toute lecture
+        mark = timezone.now()
+        raw = request.query_params.get('updated_since')
+        if not raw:
+            response = super().list(request, *args, **kwargs)
+            response['X-High-Water-Mark'] = mark.isoformat()
+            return response
+
+        try:
+            since = parse_datetime(raw)
+        except ValueError:
+            since = None
+        if since is None:
+            return Response(
+                {"error": "updated_since doit être un horodatage ISO 8601."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        if since < mark - _retention():
+            return Response(
+                {"error": "Point de reprise trop ancien : rechargez la liste complète."},
+                status=status.HTTP_410_GONE,
+            )
+
+        from .views import get_user_context
+        since -= timedelta(seconds=getattr(settings, 'DELTA_SYNC_OVERLAP', 60))
+        queryset = self.filter_queryset(self.get_queryset()).filter(updated_at__gte=since)
+        return Response({
+            'results': self.get_serializer(queryset, many=True).data,
+            'deleted': deleted_ids(self.delta_resource, since, get_user_context(request.user), request.user),
+            'high_water_mark': mark,
+        })
@@ -0,0 +1,190 @@
+"""
+Acquisition mensuelle des congés payés et report de fin d'année.
+
+Les droits à congés payés ne sont plus un forfait de 30 jours au 1er janvier :
+chaque employé acquiert LEAVE_MONTHLY_ACCRUAL jours (2,5 par défaut) par mois
+de service, de son embauche à sa sortie (un mois est acquis si l'employé est
+en poste le 15 : embauché au plus tard et sorti au plus tôt ce jour-là).
+Au 1er janvier, le solde non pris de l'année écoulée est reporté dans la
+limite de LEAVE_CARRY_OVER_CAP jours.
+
+Les droits sont inscrits dans le registre LeaveAccrual par un traitement par
+lot ensembliste (commande accrue_leave) :
+
+  accrue_months(first, last)   — Une requête INSERT … SELECT pour tous les mois
+                                 et tous les employés (generate_series × employés).
+  carry_over(year)             — Une requête INSERT … SELECT … ON CONFLICT DO UPDATE
+                                 calculant le report de `year` vers `year + 1`
+                                 (jours ouvrés pris comptés en SQL, fériés exclus).
+  run_accruals(first, last)    — Enchaîne les deux dans une transaction ; relancer
+                                 le traitement produit le même registre (idempotent).
+  entitlement_by_employee(...) — Droit de l'année par employé (une requête).
+
+Un employé sans aucune écriture pour l'année conserve le forfait
+Employee.ANNUAL_LEAVE_ALLOWANCE (transition avant le premier traitement).
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Employee, Leave, LeaveAccrual, PublicHoliday
+from .months import add_months, month_start
+
+# Jour du mois où l'employé doit être en poste pour acquérir le mois en cours
+HIRE_CUTOFF_DAY = 15
+
+
+def monthly_rate():
+    """Jours acquis par mois de service (settings.LEAVE_MONTHLY_ACCRUAL)."""
+    return Decimal(str(getattr(settings, 'LEAVE_MONTHLY_ACCRUAL', 2.5)))
+
+
+def carry_over_cap():
+    """Plafond du report de fin d'année en jours (settings.LEAVE_CARRY_OVER_CAP)."""
+    return Decimal(str(getattr(settings, 'LEAVE_CARRY_OVER_CAP', 10)))
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return (
+        quote(LeaveAccrual._meta.db_table),
+        quote(Employee._meta.db_table),
+        quote(Leave._meta.db_table),
+        quote(PublicHoliday._meta.db_table),
+    )
+
+
+def accrue_months(first, last, rate=None):
+    """Crédite l'acquisition mensuelle de tous les employés sur une période.
+
+    Une seule requête : la série des mois est croisée avec les employés en
+    poste le 15 du mois, d'après hire_date et exit_date (et non le statut
+    actuel : un agent sorti garde les mois travaillés). Un agent inactif sans
+    exit_date prend sa date de dernière modification, comme la vue
+    api_mv_headcount_monthly. Les mois déjà crédités sont ignorés
+    (ON CONFLICT DO NOTHING).
+
+    Args:
+        first (date): Premier mois traité (un jour quelconque du mois).
+        last (date): Dernier mois traité (inclus).
+        rate (Decimal | None): Jours par mois (LEAVE_MONTHLY_ACCRUAL par défaut).
+
+    Returns:
+        int: Nombre d'écritures créées.
+    """
+    ledger, employee, _, _ = _tables()
+    sql = (
+        f"INSERT INTO {ledger} (employee_id, period, kind, days, created_at) "
+        f"SELECT e.id, m::date, %s, %s, %s "
+        f"FROM generate_series(%s::date, %s::date, interval '1 month') AS m "
+        f"JOIN {employee} e ON e.hire_date <= m::date + %s "
+        f"AND COALESCE(e.exit_date, CASE WHEN e.status = 'inactive' THEN e.updated_at::date END, "
+        f"             'infinity'::date) >= m::date + %s "
+        f"ON CONFLICT (employee_id, period, kind) DO NOTHING"
+    )
+    params = [
+        LeaveAccrual.KIND_MONTHLY, rate if rate is not None else monthly_rate(), timezone.now(),
+        month_start(first), month_start(last), HIRE_CUTOFF_DAY - 1, HIRE_CUTOFF_DAY - 1,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def carry_over(year, cap=None):
+    """Calcule le report du solde de `year` au 1er janvier de `year + 1`.
+
+    Report = min(plafond, max(0, droits de l'année - jours ouvrés de congés
+    payés approuvés commençant dans l'année)), pour chaque employé ayant des
+    écritures dans l'année. Les jours pris sont comptés en SQL (jours du lundi
+    au vendredi hors PublicHoliday), comme api.working_days. Un report déjà
+    inscrit est recalculé (congés approuvés tardivement).
+
+    Args:
+        year (int): Année dont le solde est reporté.
+        cap (Decimal | None): Plafond (LEAVE_CARRY_OVER_CAP par défaut).
+
+    Returns:
+        int: Nombre d'écritures de report créées ou mises à jour.
+    """
+    ledger, _, leave, holiday = _tables()
+    year_start, next_start = date(year, 1, 1), date(year + 1, 1, 1)
+    sql = (
+        f"INSERT INTO {ledger} (employee_id, period, kind, days, created_at) "
+        f"SELECT c.employee_id, %s, %s, LEAST(%s, GREATEST(0, c.credits - COALESCE(t.taken, 0))), %s "
+        f"FROM (SELECT employee_id, SUM(days) AS credits FROM {ledger} "
+        f"      WHERE period >= %s AND period < %s GROUP BY employee_id) c "
+        f"LEFT JOIN (SELECT l.employee_id, COUNT(*) AS taken FROM {leave} l "
+        f"      CROSS JOIN LATERAL generate_series(l.start_date, l.end_date, interval '1 day') AS d "
+        f"      WHERE l.leave_type = 'paid' AND l.status = 'approved' "
+        f"      AND l.start_date >= %s AND l.start_date < %s "
+        f"      AND EXTRACT(ISODOW FROM d) < 6 "
+        f"      AND NOT EXISTS (SELECT 1 FROM {holiday} h WHERE h.date = d::date) "
+        f"      GROUP BY l.employee_id) t ON t.employee_id = c.employee_id "
+        f"ON CONFLICT (employee_id, period, kind) DO UPDATE SET days = EXCLUDED.days"
+    )
+    params = [
+        next_start, LeaveAccrual.KIND_CARRY_OVER, cap if cap is not None else carry_over_cap(), timezone.now(),
+        year_start, next_start, year_start, next_start,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def run_accruals(first, last, rate=None, cap=None):
+    """Traitement complet du registre entre deux mois, dans une transaction.
+
+    Crédite tous les mois de [first, last], puis calcule, dans l'ordre, le
+    report de chaque fin d'année comprise dans la période (le report vers
+    l'année N+1 dépend de celui vers l'année N).
+
+    Args:
+        first (date): Premier mois traité.
+        last (date): Dernier mois traité (inclus).
+        rate (Decimal | None): Jours acquis par mois.
+        cap (Decimal | None): Plafond du report.
+
+    Returns:
+        dict: {'accrued': int, 'carried_over': int} — écritures créées / reportées.
+    """
+    first, last = month_start(first), month_start(last)
+    with transaction.atomic():
+        accrued = accrue_months(first, last, rate=rate)
+        carried = 0
+        month = date(first.year + 1, 1, 1)
+        while month <= last:
+            carried += carry_over(month.year - 1, cap=cap)
+            month = add_months(month, 12)
+    return {'accrued': accrued, 'carried_over': carried}
+
+
+def entitlement_by_employee(employee_ids, year=None):
+    """Droit à congés payés de l'année (acquisitions + report), par employé.
+
+    Args:
+        employee_ids (Iterable[int]): Employés concernés.
+        year (int | None): Année civile (année en cours par défaut).
+
+    Returns:
+        dict[int, Decimal | int]: Somme des écritures de l'année, ou
+            Employee.ANNUAL_LEAVE_ALLOWANCE pour un employé sans écriture.
+    """
+    employee_ids = list(employee_ids)
+    entitlement = {pk: Employee.ANNUAL_LEAVE_ALLOWANCE for pk in employee_ids}
+    if not employee_ids:
+        return entitlement
+    rows = (
+        LeaveAccrual.objects
+        .filter(employee_id__in=employee_ids, period__year=year or date.today().year)
+        .values_list('employee_id')
+        .annotate(total=Sum('days'))
+        .order_by()
+    )
+    entitlement.update(rows)
+    return entitlement
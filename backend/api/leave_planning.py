@@ -0,0 +1,103 @@
+"""
+Planning des absences : occupation jour par jour (« qui est absent chaque jour »).
+
+leave_occupancy() calcule, en une seule requête SQL, le nombre d'agents en
+congé et leurs identifiants pour chaque jour d'une période, regroupés par
+direction ou par entreprise : la série des jours (generate_series) est jointe
+aux congés par intervalle (start_date <= jour <= end_date).
+
+Un seuil de capacité (Direction.max_concurrent_leaves, ou une valeur unique
+fournie par l'appelant) signale les jours surchargés.
+"""
+
+from datetime import timedelta
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+from .models import Department, Direction, Employee, Leave
+
+# Regroupements autorisés (valeurs du paramètre group_by)
+GROUP_BY_CHOICES = ('direction', 'department')
+
+# Amplitude maximale d'une requête d'occupation (jours)
+MAX_OCCUPANCY_DAYS = 366
+
+
+def leave_occupancy(employees, start, end, group_by='direction', statuses=('approved',), capacity=None):
+    """Calcule l'occupation des congés jour par jour sur une période.
+
+    Args:
+        employees (QuerySet[Employee]): Périmètre des agents pris en compte.
+        start (date): Premier jour (inclus).
+        end (date): Dernier jour (inclus).
+        group_by (str): 'direction' ou 'department'.
+        statuses (Iterable[str]): Statuts de congé comptés ('approved' par défaut).
+        capacity (int | None): Seuil unique appliqué à tous les groupes ; à défaut,
+            Direction.max_concurrent_leaves pour un regroupement par direction.
+
+    Returns:
+        list[dict]: Un élément par jour de la période :
+            {'date', 'total', 'groups': [{'key', 'label', 'count', 'employees',
+             'capacity', 'overloaded'}]} (groupes sans congé omis).
+    """
+    quote = connection.ops.quote_name
+    leave_table = quote(Leave._meta.db_table)
+    employee_table = quote(Employee._meta.db_table)
+    try:
+        scope_sql, scope_params = employees.values('id').query.sql_with_params()
+    except EmptyResultSet:
+        # Périmètre vide (.none(), ex. manager sans direction) : aucun congé
+        scope_sql = None
+
+    if group_by == 'department':
+        group_sql = 'e.department_id'
+        label_sql = 'grp.name'
+        capacity_sql = 'NULL::integer'
+        join_sql = f'LEFT JOIN {quote(Department._meta.db_table)} grp ON grp.id = e.department_id'
+    else:
+        group_sql = 'e.direction'
+        label_sql = 'e.direction'
+        capacity_sql = 'grp.max_concurrent_leaves'
+        join_sql = f'LEFT JOIN {quote(Direction._meta.db_table)} grp ON grp.name = e.direction'
+
+    sql = (
+        f"SELECT day::date, {group_sql}, {label_sql}, {capacity_sql}, "
+        f"COUNT(*), ARRAY_AGG(l.employee_id ORDER BY l.employee_id) "
+        f"FROM generate_series(%s::date, %s::date, interval '1 day') AS day "
+        f"JOIN {leave_table} l ON l.start_date <= day::date AND l.end_date >= day::date "
+        f"JOIN {employee_table} e ON e.id = l.employee_id "
+        f"{join_sql} "
+        f"WHERE l.status = ANY(%s) AND e.id IN ({scope_sql}) "
+        f"GROUP BY 1, 2, 3, 4 ORDER BY 1, 3"
+    )
+    rows = []
+    if scope_sql is not None:
+        params = [start, end, list(statuses), *scope_params]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+    days = {}
+    for day, key, label, group_capacity, count, employee_ids in rows:
+        limit = capacity if capacity is not None else group_capacity
+        days.setdefault(day, []).append({
+            'key': key,
+            'label': label,
+            'count': count,
+            'employees': employee_ids,
+            'capacity': limit,
+            'overloaded': limit is not None and count > limit,
+        })
+
+    result = []
+    day = start
+    while day <= end:
+        groups = days.get(day, [])
+        result.append({
+            'date': day,
+            'total': sum(g['count'] for g in groups),
+            'groups': groups,
+        })
+        day += timedelta(days=1)
+    return result
@@ -0,0 +1,57 @@
+"""
+Commande d'alimentation du registre d'acquisition des congés payés.
+
+Crédite l'acquisition mensuelle de tous les employés pour chaque mois de la
+période, puis calcule le report plafonné de chaque fin d'année traversée
+(voir api.leave_accrual). Relancer la commande est sans effet, hormis le
+recalcul des reports (congés approuvés depuis le dernier passage).
+
+Usage (cron, le 1er de chaque mois) :
+    python manage.py accrue_leave
+    python manage.py accrue_leave --from 2025-01 --through 2026-10
+"""
+
+import time
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.leave_accrual import run_accruals
+
+
+def _parse_month(value, option):
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise CommandError(f"{option} doit être au format AAAA-MM.")
+
+
+class Command(BaseCommand):
+    help = "Crédite les congés payés acquis chaque mois et calcule les reports de fin d'année."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from', dest='first',
+            help="Premier mois traité (AAAA-MM, défaut : janvier de l'année précédente).",
+        )
+        parser.add_argument(
+            '--through', dest='last',
+            help="Dernier mois traité (AAAA-MM, défaut : le mois courant).",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        last = _parse_month(options['last'], '--through') if options['last'] else today.replace(day=1)
+        first = _parse_month(options['first'], '--from') if options['first'] else date(last.year - 1, 1, 1)
+        if first > last:
+            raise CommandError("--from doit précéder --through.")
+
+        started = time.monotonic()
+        result = run_accruals(first, last)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['accrued']} acquisition(s) mensuelle(s) créée(s), "
+            f"{result['carried_over']} report(s) calculé(s) "
+            f"({first:%Y-%m} → {last:%Y-%m}, {elapsed:.2f} s)."
+        ))
@@ -0,0 +1,33 @@
+"""
+Commande de création anticipée des partitions mensuelles des présences.
+
+À planifier (cron) au moins une fois par mois, par exemple le 1er :
+    python manage.py create_attendance_partitions
+    python manage.py create_attendance_partitions --months 6
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.partitions import ensure_partitions, list_partitions
+
+
+class Command(BaseCommand):
+    help = "Crée les partitions de api_attendance pour le mois courant et les N mois suivants."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=3,
+            help="Nombre de mois à anticiper après le mois courant (défaut : 3).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            created = ensure_partitions(cursor, months_ahead=max(options['months'], 0))
+            partitions = list_partitions(cursor)
+
+        for name in created:
+            self.stdout.write(f"  Partition créée : {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(created)} partition(s) créée(s), {len(partitions)} partition(s) mensuelle(s) attachée(s)."
+        ))
@@ -0,0 +1,51 @@
+"""
+Commande de détachement des anciennes partitions mensuelles des présences.
+
+Les partitions des mois strictement antérieurs à --before sont détachées :
+elles deviennent des tables autonomes, invisibles pour l'application, que
+l'on peut exporter puis supprimer.
+
+Usage :
+    python manage.py detach_attendance_partitions --before 2024-01 --dry-run
+    python manage.py detach_attendance_partitions --before 2024-01
+    pg_dump -t api_attendance_y2023m12 ... && psql -c 'DROP TABLE api_attendance_y2023m12'
+"""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.months import month_start
+from api.partitions import detach_partition, list_partitions
+
+
+class Command(BaseCommand):
+    help = "Détache (pour archivage) les partitions de api_attendance antérieures à un mois donné."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', required=True,
+            help="Premier mois conservé (AAAA-MM) : les partitions antérieures sont détachées.",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Affiche les partitions concernées sans les détacher.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            limit = month_start(datetime.strptime(options['before'], '%Y-%m').date())
+        except ValueError:
+            raise CommandError("--before doit être au format AAAA-MM.")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            old = [name for month, name in list_partitions(cursor) if month < limit]
+            if not options['dry_run']:
+                for name in old:
+                    detach_partition(cursor, name)
+
+        verb = "à détacher" if options['dry_run'] else "détachée"
+        for name in old:
+            self.stdout.write(f"  Partition {verb} : {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(old)} partition(s) {verb}(s)."))
@@ -0,0 +1,65 @@
+"""
+Commande d'import en masse des fichiers de pointage.
+
+Usage :
+    python manage.py import_attendance pointages_2026-03-02.csv
+    python manage.py import_attendance export.xlsx --department "IVOIR GARDIENNAGE" --batch-size 2000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.attendance_bulk import (
+    ATTENDANCE_IMPORT_BATCH_SIZE, PunchFileError, parse_punch_file, ingest_punches,
+)
+from api.models import Department, Employee
+
+
+class Command(BaseCommand):
+    help = "Importe un fichier de pointage (CSV ou XLSX) et insère/met à jour les présences par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Chemin du fichier de pointage (.csv ou .xlsx).")
+        parser.add_argument(
+            '--department',
+            help="Nom de l'entreprise : limite l'import à ses agents.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=ATTENDANCE_IMPORT_BATCH_SIZE,
+            help=f"Nombre de lignes par requête (défaut : {ATTENDANCE_IMPORT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, 'rb') as fh:
+                content = fh.read()
+        except OSError as exc:
+            raise CommandError(f"Impossible de lire '{path}' : {exc}")
+
+        employees = Employee.objects.all()
+        if options['department']:
+            try:
+                dept = Department.objects.get(name=options['department'])
+            except Department.DoesNotExist:
+                raise CommandError(f"Entreprise introuvable : '{options['department']}'.")
+            employees = employees.filter(department=dept)
+
+        try:
+            rows, errors = parse_punch_file(content, path)
+        except PunchFileError as exc:
+            raise CommandError(str(exc))
+
+        stats = ingest_punches(rows, employees=employees, batch_size=max(options['batch_size'], 1))
+
+        for error in errors:
+            self.stderr.write(f"  Ligne {error['line']} : {error['error']}")
+        if stats['unknown_matricules']:
+            self.stderr.write(
+                f"  Matricules inconnus ({len(stats['unknown_matricules'])}) : "
+                + ", ".join(stats['unknown_matricules'])
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['rows']} lignes lues, {stats['records']} présences "
+            f"({stats['created']} créées, {stats['updated']} mises à jour) "
+            f"en {stats['batches']} lot(s), {len(errors)} ligne(s) rejetée(s)."
+        ))
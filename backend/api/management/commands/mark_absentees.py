@@ -0,0 +1,61 @@
+"""
+Commande nocturne d'enregistrement des absences.
+
+Crée une présence 'absent' pour chaque agent actif sans pointage ni congé
+approuvé à la date traitée (la veille par défaut). Les samedis, dimanches et
+jours fériés (PublicHoliday) sont ignorés sauf --include-weekends. Relancer la
+commande est sans effet.
+
+Usage (cron, chaque nuit) :
+    python manage.py mark_absentees
+    python manage.py mark_absentees --date 2026-03-02 --department "IVOIR GARDIENNAGE"
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.attendance_bulk import mark_absentees
+from api.models import Department, PublicHoliday
+
+
+class Command(BaseCommand):
+    help = "Enregistre 'absent' les agents sans pointage ni congé approuvé pour une date (la veille par défaut)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Date à traiter (AAAA-MM-JJ, défaut : la veille).")
+        parser.add_argument('--department', help="Nom de l'entreprise : limite le traitement à ses agents.")
+        parser.add_argument(
+            '--include-weekends', action='store_true',
+            help="Traite aussi les samedis, dimanches et jours fériés.",
+        )
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("--date doit être au format AAAA-MM-JJ.")
+        else:
+            day = timezone.localdate() - timedelta(days=1)
+
+        if day.weekday() >= 5 and not options['include_weekends']:
+            self.stdout.write(f"{day.isoformat()} est un week-end : aucune absence enregistrée.")
+            return
+        holiday = PublicHoliday.objects.filter(date=day).first()
+        if holiday and not options['include_weekends']:
+            self.stdout.write(f"{day.isoformat()} est férié ({holiday.name}) : aucune absence enregistrée.")
+            return
+
+        department = None
+        if options['department']:
+            try:
+                department = Department.objects.get(name=options['department'])
+            except Department.DoesNotExist:
+                raise CommandError(f"Entreprise introuvable : '{options['department']}'.")
+
+        created = mark_absentees(day, department=department)
+        self.stdout.write(self.style.SUCCESS(
+            f"{created} absence(s) enregistrée(s) pour le {day.isoformat()}."
+        ))
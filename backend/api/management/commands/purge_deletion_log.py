@@ -0,0 +1,23 @@
+"""
+Commande de purge des pierres tombales de la synchronisation incrémentale.
+
+Supprime les pierres tombales (DeletionLog) plus anciennes que
+DELTA_SYNC_RETENTION_DAYS jours. Les clients dont le point de reprise est
+plus ancien reçoivent HTTP 410 et rechargent la liste complète (voir
+api.delta_sync).
+
+Usage (cron, chaque nuit) :
+    python manage.py purge_deletion_log
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.delta_sync import purge_deletion_log
+
+
+class Command(BaseCommand):
+    help = "Supprime les pierres tombales de plus de DELTA_SYNC_RETENTION_DAYS jours."
+
+    def handle(self, *args, **options):
+        deleted = purge_deletion_log()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} pierre(s) tombale(s) supprimée(s)."))
@@ -0,0 +1,36 @@
+"""
+Commande de rafraîchissement des vues matérialisées des statistiques.
+
+Recalcule les séries mensuelles servies par /api/analytics/* (voir
+api.analytics). Par défaut le rafraîchissement est concurrent : les
+graphiques restent lisibles pendant le calcul.
+
+Usage (cron, chaque nuit ou chaque heure) :
+    python manage.py refresh_analytics
+    python manage.py refresh_analytics --no-concurrently
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.analytics import refresh_analytics
+
+
+class Command(BaseCommand):
+    help = "Rafraîchit les vues matérialisées des statistiques (/api/analytics/*)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-concurrently', action='store_true',
+            help="Rafraîchissement simple (plus rapide, bloque les lectures).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        names = refresh_analytics(concurrently=not options['no_concurrently'])
+        for name in names:
+            self.stdout.write(f"  Vue rafraîchie : {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(names)} vue(s) rafraîchie(s) en {time.monotonic() - started:.1f} s."
+        ))
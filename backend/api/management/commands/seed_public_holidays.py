@@ -0,0 +1,79 @@
+"""
+Commande de génération des jours fériés d'une année (Côte d'Ivoire).
+
+Crée les fêtes à date fixe et celles calculées à partir de Pâques. Les fêtes
+musulmanes (Korité, Tabaski, Maouloud, Nuit du Destin), dont la date est
+annoncée chaque année, sont à saisir dans l'administration. Les dates déjà
+enregistrées sont conservées : relancer la commande est sans effet.
+
+Usage :
+    python manage.py seed_public_holidays
+    python manage.py seed_public_holidays --year 2027
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import PublicHoliday
+from api.working_days import holiday_calendar
+
+FIXED_HOLIDAYS = [
+    ((1, 1), "Jour de l'An"),
+    ((5, 1), "Fête du Travail"),
+    ((8, 7), "Fête de l'Indépendance"),
+    ((8, 15), "Assomption"),
+    ((11, 1), "Toussaint"),
+    ((11, 15), "Journée nationale de la Paix"),
+    ((12, 25), "Noël"),
+]
+
+# Décalage (jours) par rapport au dimanche de Pâques
+EASTER_HOLIDAYS = [
+    (1, "Lundi de Pâques"),
+    (39, "Ascension"),
+    (50, "Lundi de Pentecôte"),
+]
+
+
+def easter_sunday(year):
+    """Dimanche de Pâques (calendrier grégorien, algorithme de Meeus/Jones/Butcher)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+class Command(BaseCommand):
+    help = "Génère les jours fériés à date fixe et liés à Pâques d'une année (l'année en cours par défaut)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help="Année à générer (défaut : l'année en cours).")
+
+    def handle(self, *args, **options):
+        year = options['year'] or timezone.localdate().year
+        if not 1900 <= year <= 2100:
+            raise CommandError("--year doit être compris entre 1900 et 2100.")
+
+        easter = easter_sunday(year)
+        holidays = [PublicHoliday(date=date(year, month, day), name=name) for (month, day), name in FIXED_HOLIDAYS]
+        holidays += [PublicHoliday(date=easter + timedelta(days=offset), name=name) for offset, name in EASTER_HOLIDAYS]
+
+        existing = set(PublicHoliday.objects.filter(date__year=year).values_list('date', flat=True))
+        to_create = [holiday for holiday in holidays if holiday.date not in existing]
+        PublicHoliday.objects.bulk_create(to_create, ignore_conflicts=True)
+        # bulk_create n'émet pas de signal post_save
+        holiday_calendar.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(to_create)} jour(s) férié(s) créé(s) pour {year} "
+            f"({len(existing)} déjà enregistré(s)). Fêtes musulmanes à saisir dans l'administration."
+        ))
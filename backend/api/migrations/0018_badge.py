@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-19 00:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_leave_notification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Badge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serial', models.CharField(max_length=16, unique=True, verbose_name='Numéro de série')),
+                ('issued_at', models.DateTimeField(auto_now_add=True, verbose_name='Émis le')),
+                ('expires_at', models.DateTimeField(verbose_name='Expire le')),
+                ('revoked_at', models.DateTimeField(blank=True, null=True, verbose_name='Révoqué le')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='badges', to='api.employee', verbose_name='Employé')),
+                ('issued_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='issued_badges', to=settings.AUTH_USER_MODEL, verbose_name='Émis par')),
+            ],
+            options={
+                'verbose_name': 'Badge de pointage',
+                'verbose_name_plural': 'Badges de pointage',
+                'ordering': ['-issued_at'],
+                'indexes': [models.Index(fields=['revoked_at', 'expires_at'], name='badge_revoked_idx')],
+            },
+        ),
+    ]
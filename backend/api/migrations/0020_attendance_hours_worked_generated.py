@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-19 00:16
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_attendance_date_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='hours_worked',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Coalesce(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.datetime.Extract(django.db.models.expressions.CombinedExpression(models.F('check_out'), '-', models.F('check_in')), 'epoch'), '/', models.Value(3600)), '+', models.Case(models.When(check_out__lt=models.F('check_in'), then=24), default=0)), output_field=models.DecimalField(decimal_places=2, max_digits=5)), 0, output_field=models.DecimalField(decimal_places=2, max_digits=5)), output_field=models.DecimalField(decimal_places=2, max_digits=5), verbose_name='Heures travaillées'),
+        ),
+    ]
@@ -0,0 +1,121 @@
+"""
+Migration : partitionnement mensuel de api_attendance (PostgreSQL).
+
+La table existante est renommée, une table partitionnée par RANGE (date) est
+créée à sa place avec les mêmes colonnes, puis :
+  1. une partition par défaut et une partition par mois couvert par les
+     données existantes, plus le mois courant et les 3 suivants ;
+  2. les lignes sont recopiées et l'ancienne table supprimée ;
+  3. séquence, clé primaire (id, date), contrainte unique (employee_id, date),
+     clé étrangère et index sont recréés sous les noms attendus par Django.
+
+L'état des modèles Django n'est pas modifié. Voir api/partitions.py.
+"""
+from django.db import migrations
+
+from api.partitions import (
+    ATTENDANCE_TABLE, DEFAULT_PARTITION, add_months, create_month_partition,
+    ensure_partitions, month_start,
+)
+
+OLD_TABLE = f'{ATTENDANCE_TABLE}_unpartitioned'
+COLUMNS = 'id, employee_id, date, check_in, check_out, status, notes, created_at, updated_at'
+
+
+def partition_attendance(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Attendance = apps.get_model('api', 'Attendance')
+    hours_sql, _ = schema_editor.column_sql(Attendance, Attendance._meta.get_field('hours_worked'))
+    uniq_name = schema_editor._create_index_name(ATTENDANCE_TABLE, ['employee_id', 'date'], suffix='_uniq')
+    fk_index_name = schema_editor._create_index_name(ATTENDANCE_TABLE, ['employee_id'])
+    fk_name = schema_editor._create_index_name(ATTENDANCE_TABLE, ['employee_id'], suffix='_fk_api_employee_id')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} RENAME TO {OLD_TABLE}')
+        cursor.execute(f"""
+            CREATE TABLE {ATTENDANCE_TABLE} (
+                id bigint NOT NULL,
+                date date NOT NULL,
+                check_in time NULL,
+                check_out time NULL,
+                status varchar(20) NOT NULL,
+                notes text NULL,
+                created_at timestamp with time zone NOT NULL,
+                updated_at timestamp with time zone NOT NULL,
+                employee_id bigint NOT NULL,
+                hours_worked {hours_sql}
+            ) PARTITION BY RANGE (date)
+        """)
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {ATTENDANCE_TABLE} DEFAULT')
+
+        cursor.execute(f'SELECT MIN(date), MAX(date) FROM {OLD_TABLE}')
+        first, last = cursor.fetchone()
+        if first is not None:
+            month = month_start(first)
+            while month <= last:
+                create_month_partition(cursor, month)
+                month = add_months(month, 1)
+        ensure_partitions(cursor, months_ahead=3)
+
+        cursor.execute(f'INSERT INTO {ATTENDANCE_TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {OLD_TABLE}')
+        cursor.execute(f'DROP TABLE {OLD_TABLE}')
+
+        cursor.execute(f'CREATE SEQUENCE {ATTENDANCE_TABLE}_id_seq OWNED BY {ATTENDANCE_TABLE}.id')
+        cursor.execute(
+            f"SELECT setval('{ATTENDANCE_TABLE}_id_seq', COALESCE(MAX(id), 0) + 1, false) FROM {ATTENDANCE_TABLE}"
+        )
+        cursor.execute(
+            f"ALTER TABLE {ATTENDANCE_TABLE} ALTER COLUMN id SET DEFAULT nextval('{ATTENDANCE_TABLE}_id_seq')"
+        )
+        cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} ADD CONSTRAINT {ATTENDANCE_TABLE}_pkey PRIMARY KEY (id, date)')
+        cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} ADD CONSTRAINT {uniq_name} UNIQUE (employee_id, date)')
+        cursor.execute(
+            f'ALTER TABLE {ATTENDANCE_TABLE} ADD CONSTRAINT {fk_name} FOREIGN KEY (employee_id) '
+            f'REFERENCES api_employee (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(f'CREATE INDEX {fk_index_name} ON {ATTENDANCE_TABLE} (employee_id)')
+        cursor.execute(f'CREATE INDEX attendance_date_status_idx ON {ATTENDANCE_TABLE} (date, status)')
+
+
+def unpartition_attendance(apps, schema_editor):
+    """Annulation : recrée une table ordinaire et y recopie les partitions attachées."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Attendance = apps.get_model('api', 'Attendance')
+    partitioned = f'{ATTENDANCE_TABLE}_partitioned'
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} RENAME TO {partitioned}')
+        cursor.execute(f'ALTER SEQUENCE {ATTENDANCE_TABLE}_id_seq RENAME TO {partitioned}_id_seq')
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')",
+            [partitioned],
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {partitioned} DROP CONSTRAINT {name}')
+        cursor.execute(
+            'SELECT indexname FROM pg_indexes WHERE tablename = %s', [partitioned],
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f'DROP INDEX {name}')
+
+    schema_editor.create_model(Attendance)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {ATTENDANCE_TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {partitioned}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{ATTENDANCE_TABLE}', 'id'), COALESCE(MAX(id), 1)) "
+            f"FROM {ATTENDANCE_TABLE}"
+        )
+        cursor.execute(f'DROP TABLE {partitioned} CASCADE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_attendance_hours_worked_generated'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_attendance, reverse_code=unpartition_attendance),
+    ]
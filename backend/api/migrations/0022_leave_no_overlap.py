@@ -0,0 +1,46 @@
+# Generated by Django 5.0 on 2026-10-19 00:27
+
+import api.models
+import django.contrib.postgres.constraints
+from django.conf import settings
+from django.db import migrations, models
+
+
+def check_existing_overlaps(apps, schema_editor):
+    """Refuse la migration si des congés non rejetés se chevauchent déjà.
+
+    La contrainte ne pourrait pas être créée : les congés listés doivent être
+    corrigés (dates) ou rejetés avant de relancer la migration.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT a.id, b.id, a.employee_id
+            FROM api_leave a
+            JOIN api_leave b ON b.employee_id = a.employee_id AND b.id > a.id
+            WHERE a.status <> 'rejected' AND b.status <> 'rejected'
+              AND a.start_date <= b.end_date AND b.start_date <= a.end_date
+            ORDER BY a.employee_id, a.id
+        """)
+        overlaps = cursor.fetchall()
+    if overlaps:
+        details = ', '.join(f'#{a}/#{b} (employé {emp})' for a, b, emp in overlaps[:20])
+        raise RuntimeError(
+            f"{len(overlaps)} paire(s) de congés se chevauchent : {details}. "
+            "Corriger ou rejeter ces congés avant d'appliquer la migration."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_partition_attendance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_existing_overlaps, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='leave',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'rejected'), _negated=True), expressions=[(api.models.Int8Range('employee_id', 'employee_id', models.Value('[]')), '&&'), (api.models.DateRange('start_date', 'end_date', models.Value('[]')), '&&')], name='leave_no_overlap', violation_error_message="Ce congé chevauche un autre congé de l'employé."),
+        ),
+    ]
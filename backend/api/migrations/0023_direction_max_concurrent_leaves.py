@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 00:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_leave_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='direction',
+            name='max_concurrent_leaves',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Agents en congé simultanément (maximum)'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-19 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_direction_max_concurrent_leaves'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Date')),
+                ('name', models.CharField(max_length=100, verbose_name='Libellé')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Jour férié',
+                'verbose_name_plural': 'Jours fériés',
+                'ordering': ['date'],
+            },
+        ),
+    ]
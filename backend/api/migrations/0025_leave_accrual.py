@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-19 00:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_public_holiday'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveAccrual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(verbose_name='Période')),
+                ('kind', models.CharField(choices=[('monthly', 'Acquisition mensuelle'), ('carry_over', "Report de fin d'année")], max_length=20, verbose_name='Type')),
+                ('days', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Jours')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_accruals', to='api.employee', verbose_name='Employé')),
+            ],
+            options={
+                'verbose_name': 'Acquisition de congés',
+                'verbose_name_plural': 'Acquisitions de congés',
+                'ordering': ['employee', 'period', 'kind'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaveaccrual',
+            constraint=models.UniqueConstraint(fields=('employee', 'period', 'kind'), name='leave_accrual_unique_period'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+"""
+Migration : séquence de numérotation des événements du flux d'alarmes.
+
+Les identifiants d'événements SSE (en-tête Last-Event-ID) sont communs à tous
+les processus du serveur. Voir api/notification_stream.py.
+"""
+from django.db import migrations
+
+from api.notification_stream import EVENT_SEQUENCE
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_leave_accrual'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            f'CREATE SEQUENCE IF NOT EXISTS {EVENT_SEQUENCE}',
+            f'DROP SEQUENCE IF EXISTS {EVENT_SEQUENCE}',
+        ),
+    ]
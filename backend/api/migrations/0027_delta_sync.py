@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-19 01:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_notification_event_sequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(choices=[('employee', 'Agent'), ('leave', 'Congé'), ('attendance', 'Présence')], max_length=20, verbose_name='Ressource')),
+                ('object_id', models.BigIntegerField(verbose_name='Identifiant')),
+                ('department_id', models.IntegerField(blank=True, null=True, verbose_name='Entreprise')),
+                ('direction', models.CharField(blank=True, max_length=200, null=True, verbose_name='Direction')),
+                ('user_id', models.IntegerField(blank=True, null=True, verbose_name='Compte')),
+                ('deleted_at', models.DateTimeField(verbose_name='Supprimé le')),
+            ],
+            options={
+                'verbose_name': 'Suppression',
+                'verbose_name_plural': 'Suppressions',
+                'ordering': ['-deleted_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['updated_at'], name='attendance_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['updated_at'], name='leave_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletionlog',
+            index=models.Index(fields=['resource', 'deleted_at'], name='deletion_log_resource_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+"""
+Migration : vues matérialisées des séries statistiques mensuelles.
+
+Effectifs, absentéisme et jours de congé par mois, entreprise et direction,
+rafraîchis par la commande refresh_analytics. Voir api/analytics.py.
+
+Le SQL est figé ici : toute modification ultérieure d'une vue passe par une
+nouvelle migration (DROP puis CREATE), jamais par l'édition de celle-ci.
+"""
+from django.db import migrations
+
+
+CREATE_SQL = [
+    """
+    CREATE MATERIALIZED VIEW api_mv_headcount_monthly AS
+    SELECT m.month::date AS month,
+           COALESCE(e.department_id, 0) AS department_id,
+           COALESCE(e.direction, '') AS direction,
+           COUNT(*) AS headcount,
+           COUNT(*) FILTER (WHERE e.hire_date >= m.month) AS hires
+    FROM generate_series(
+        date_trunc('month', CURRENT_DATE) - interval '35 months',
+        date_trunc('month', CURRENT_DATE),
+        interval '1 month'
+    ) AS m(month)
+    JOIN api_employee e ON e.hire_date < m.month + interval '1 month'
+    WHERE e.status <> 'inactive'
+    GROUP BY 1, 2, 3
+    """,
+    'CREATE UNIQUE INDEX api_mv_headcount_monthly_uniq '
+    'ON api_mv_headcount_monthly (month, department_id, direction)',
+    """
+    CREATE MATERIALIZED VIEW api_mv_attendance_monthly AS
+    SELECT date_trunc('month', a.date)::date AS month,
+           COALESCE(e.department_id, 0) AS department_id,
+           COALESCE(e.direction, '') AS direction,
+           COUNT(*) AS records,
+           COUNT(*) FILTER (WHERE a.status = 'present') AS present,
+           COUNT(*) FILTER (WHERE a.status = 'absent') AS absent,
+           COUNT(*) FILTER (WHERE a.status = 'late') AS late,
+           COUNT(*) FILTER (WHERE a.status = 'half-day') AS half_day,
+           COALESCE(SUM(a.hours_worked), 0) AS hours_worked
+    FROM api_attendance a
+    JOIN api_employee e ON e.id = a.employee_id
+    WHERE a.date >= date_trunc('month', CURRENT_DATE) - interval '35 months'
+    GROUP BY 1, 2, 3
+    """,
+    'CREATE UNIQUE INDEX api_mv_attendance_monthly_uniq '
+    'ON api_mv_attendance_monthly (month, department_id, direction)',
+    """
+    CREATE MATERIALIZED VIEW api_mv_leave_days_monthly AS
+    SELECT date_trunc('month', d.day)::date AS month,
+           COALESCE(e.department_id, 0) AS department_id,
+           COALESCE(e.direction, '') AS direction,
+           l.leave_type,
+           COUNT(*) AS days
+    FROM api_leave l
+    JOIN api_employee e ON e.id = l.employee_id
+    CROSS JOIN LATERAL generate_series(
+        GREATEST(l.start_date, (date_trunc('month', CURRENT_DATE) - interval '35 months')::date),
+        l.end_date,
+        interval '1 day'
+    ) AS d(day)
+    WHERE l.status = 'approved'
+      AND EXTRACT(ISODOW FROM d.day) < 6
+      AND NOT EXISTS (SELECT 1 FROM api_publicholiday h WHERE h.date = d.day::date)
+    GROUP BY 1, 2, 3, 4
+    """,
+    'CREATE UNIQUE INDEX api_mv_leave_days_monthly_uniq '
+    'ON api_mv_leave_days_monthly (month, department_id, direction, leave_type)',
+]
+
+DROP_SQL = [
+    'DROP MATERIALIZED VIEW IF EXISTS api_mv_headcount_monthly',
+    'DROP MATERIALIZED VIEW IF EXISTS api_mv_attendance_monthly',
+    'DROP MATERIALIZED VIEW IF EXISTS api_mv_leave_days_monthly',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_delta_sync'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
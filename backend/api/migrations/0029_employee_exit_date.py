@@ -0,0 +1,93 @@
+"""
+Migration : date de sortie des agents et effectifs mensuels en fin de mois.
+
+Employee.exit_date est renseignée au passage au statut 'inactive'. Les agents
+déjà inactifs reçoivent leur date de dernière modification, meilleure
+estimation disponible.
+
+La vue api_mv_headcount_monthly compte désormais les agents en poste à la fin
+de chaque mois (embauchés au plus tard ce mois, sortis après celui-ci) et
+ajoute les sorties du mois (exits) : un départ ne modifie plus les effectifs
+des mois passés. Voir api/analytics.py.
+"""
+from django.db import migrations, models
+
+
+BACKFILL_SQL = (
+    "UPDATE api_employee SET exit_date = updated_at::date "
+    "WHERE status = 'inactive' AND exit_date IS NULL"
+)
+
+DROP_HEADCOUNT_SQL = 'DROP MATERIALIZED VIEW IF EXISTS api_mv_headcount_monthly'
+
+# Agent sans exit_date mais inactif (statut modifié par QuerySet.update) :
+# sa date de dernière modification tient lieu de date de sortie.
+CREATE_HEADCOUNT_SQL = [
+    """
+    CREATE MATERIALIZED VIEW api_mv_headcount_monthly AS
+    SELECT m.month::date AS month,
+           COALESCE(e.department_id, 0) AS department_id,
+           COALESCE(e.direction, '') AS direction,
+           COUNT(*) FILTER (
+               WHERE e.exit_date IS NULL OR e.exit_date >= m.month + interval '1 month'
+           ) AS headcount,
+           COUNT(*) FILTER (WHERE e.hire_date >= m.month) AS hires,
+           COUNT(*) FILTER (WHERE e.exit_date < m.month + interval '1 month') AS exits
+    FROM generate_series(
+        date_trunc('month', CURRENT_DATE) - interval '35 months',
+        date_trunc('month', CURRENT_DATE),
+        interval '1 month'
+    ) AS m(month)
+    JOIN (
+        SELECT department_id, direction, hire_date,
+               COALESCE(exit_date, CASE WHEN status = 'inactive' THEN updated_at::date END) AS exit_date
+        FROM api_employee
+    ) e ON e.hire_date < m.month + interval '1 month'
+       AND (e.exit_date IS NULL OR e.exit_date >= m.month)
+    GROUP BY 1, 2, 3
+    """,
+    'CREATE UNIQUE INDEX api_mv_headcount_monthly_uniq '
+    'ON api_mv_headcount_monthly (month, department_id, direction)',
+]
+
+# Définition précédente (migration 0028), recréée à l'annulation
+PREVIOUS_HEADCOUNT_SQL = [
+    """
+    CREATE MATERIALIZED VIEW api_mv_headcount_monthly AS
+    SELECT m.month::date AS month,
+           COALESCE(e.department_id, 0) AS department_id,
+           COALESCE(e.direction, '') AS direction,
+           COUNT(*) AS headcount,
+           COUNT(*) FILTER (WHERE e.hire_date >= m.month) AS hires
+    FROM generate_series(
+        date_trunc('month', CURRENT_DATE) - interval '35 months',
+        date_trunc('month', CURRENT_DATE),
+        interval '1 month'
+    ) AS m(month)
+    JOIN api_employee e ON e.hire_date < m.month + interval '1 month'
+    WHERE e.status <> 'inactive'
+    GROUP BY 1, 2, 3
+    """,
+    'CREATE UNIQUE INDEX api_mv_headcount_monthly_uniq '
+    'ON api_mv_headcount_monthly (month, department_id, direction)',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0028_analytics_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='exit_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Date de sortie'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(
+            [DROP_HEADCOUNT_SQL, *CREATE_HEADCOUNT_SQL],
+            [DROP_HEADCOUNT_SQL, *PREVIOUS_HEADCOUNT_SQL],
+        ),
+    ]
@@ -10,6 +10,12 @@ Hiérarchie des modèles :
   Leave           — Demande de congé d'un Employee
   Attendance      — Enregistrement de présence journalier d'un Employee
   PasswordRecord  — Mot de passe chiffré (Fernet) pour consultation admin
+  Badge           — Badge de pointage signé (QR code) délivré à un Employee
+  PublicHoliday   — Jour férié (exclu du décompte des jours de congés payés)
+  LeaveAccrual    — Écriture du registre d'acquisition des congés payés
+                    (droits mensuels, report de fin d'année)
+  DeletionLog     — Pierre tombale d'un agent, congé ou présence supprimé(e)
+                    (synchronisation incrémentale ?updated_since=)
 
 Flux d'approbation des congés :
   Employee soumet → pending
@@ -17,8 +23,27 @@ Flux d'approbation des congés :
   Entreprise approuve → approved  (ou rejected à n'importe quelle étape)
 """
 
+from datetime import date
+
 from django.db import models
+from django.db.models.functions import Cast, Coalesce, Extract
 from django.contrib.auth.models import User
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import BigIntegerRangeField, DateRangeField, RangeOperators
+
+
+class DateRange(models.Func):
+    """Fonction PostgreSQL daterange(début, fin, bornes)."""
+
+    function = 'daterange'
+    output_field = DateRangeField()
+
+
+class Int8Range(models.Func):
+    """Fonction PostgreSQL int8range(début, fin, bornes)."""
+
+    function = 'int8range'
+    output_field = BigIntegerRangeField()
 
 
 class Direction(models.Model):
@@ -30,10 +55,16 @@ class Direction(models.Model):
 
     Attributes:
         name (CharField): Nom unique de la direction (max. 200 caractères).
+        max_concurrent_leaves (PositiveIntegerField): Nombre maximal d'agents en
+            congé le même jour avant surcharge (nullable = pas de seuil).
         created_at (DateTimeField): Date de création (auto).
     """
 
     name = models.CharField(max_length=200, unique=True, verbose_name="Nom de la direction")
+    max_concurrent_leaves = models.PositiveIntegerField(
+        null=True, blank=True,
+        verbose_name="Agents en congé simultanément (maximum)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -182,6 +213,8 @@ class Employee(models.Model):
         marital_status (CharField): Situation matrimoniale (nullable).
         number_of_children (PositiveIntegerField): Nombre d'enfants à charge.
         status (CharField): Statut contractuel ('active' | 'inactive' | 'on_leave').
+        exit_date (DateField): Date de sortie (nullable), renseignée au passage au
+            statut 'inactive' ; les effectifs historiques en dépendent.
         user (OneToOneField → User): Compte utilisateur Django associé (nullable).
         photo (ImageField): Photo d'identité (nullable).
         cni_recto (FileField): Scan recto de la CNI (nullable).
@@ -190,13 +223,15 @@ class Employee(models.Model):
         updated_at (DateTimeField): Date de dernière modification (auto).
 
     Class attributes:
-        ANNUAL_LEAVE_ALLOWANCE (int): Quota annuel de congés payés = 30 jours.
+        ANNUAL_LEAVE_ALLOWANCE (int): Quota annuel forfaitaire = 30 jours ouvrés,
+            appliqué tant que le registre LeaveAccrual n'a pas d'écriture pour l'année.
 
     Properties:
         full_name (str): Prénom + Nom.
-        leaves_taken_this_year (int): Jours de congés payés approuvés cette année.
-        leaves_pending_this_year (int): Jours de congés payés en attente cette année.
-        leave_balance (int): Solde de congés payés restant.
+        leaves_taken_this_year (int): Jours ouvrés de congés payés approuvés cette année.
+        leaves_pending_this_year (int): Jours ouvrés de congés payés en attente cette année.
+        leave_entitlement (Decimal|int): Droit de l'année (registre LeaveAccrual).
+        leave_balance (Decimal|int): Solde de congés payés restant.
     """
 
     STATUS_CHOICES = [
@@ -285,6 +320,7 @@ class Employee(models.Model):
         default='active',
         verbose_name="Statut"
     )
+    exit_date = models.DateField(verbose_name="Date de sortie", null=True, blank=True)
     user = models.OneToOneField(
         User,
         on_delete=models.SET_NULL,
@@ -320,6 +356,40 @@ class Employee(models.Model):
         verbose_name_plural = "Employés"
         ordering = ['-created_at']
 
+    # (department_id, status) lus en base (None pour une instance non chargée depuis la base)
+    _loaded_badge_scope = None
+    # Statut lu en base ou dernier statut sauvegardé (date de sortie, voir save)
+    _loaded_status = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise l'entreprise et le statut lus en base (révocation des badges, date de sortie)."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_badge_scope = (
+            instance.__dict__.get('department_id'), instance.__dict__.get('status'),
+        )
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Tient à jour la date de sortie selon le statut.
+
+        Au passage au statut 'inactive', exit_date reçoit la date du jour si elle
+        n'est pas déjà renseignée ; à la réactivation d'un agent inactif, elle
+        est effacée. Les effectifs mensuels (api.analytics) comptent un agent
+        jusqu'à sa date de sortie.
+        """
+        exit_date = self.exit_date
+        if self.status == 'inactive' and self.exit_date is None:
+            self.exit_date = date.today()
+        elif self._loaded_status == 'inactive' and self.status != 'inactive':
+            self.exit_date = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.exit_date != exit_date:
+            kwargs['update_fields'] = {*update_fields, 'exit_date'}
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -332,61 +402,80 @@ class Employee(models.Model):
         """
         return f"{self.first_name} {self.last_name}"
 
+    def _paid_usage(self):
+        # Préchargé en masse par EmployeeListSerializer, sinon une requête
+        usage = getattr(self, '_paid_leave_usage', None)
+        return usage if usage is not None else self.paid_leave_usage()
+
     @property
     def leaves_taken_this_year(self):
-        """Calcule les jours de congés payés approuvés cette année civile.
+        """Jours ouvrés de congés payés approuvés cette année civile.
 
         Seuls les congés de type 'paid' comptent contre le quota annuel.
         Les congés maladie, sans solde et parental n'affectent pas ce solde.
+        Les week-ends et jours fériés ne sont pas décomptés.
 
         Returns:
-            int: Nombre total de jours de congés payés approuvés en cours d'année.
+            int: Nombre total de jours ouvrés de congés payés approuvés en cours d'année.
         """
-        from datetime import date
-        current_year = date.today().year
-        approved_leaves = self.leaves.filter(
-            leave_type='paid',
-            status='approved',
-            start_date__year=current_year
-        )
-        total_days = 0
-        for leave in approved_leaves:
-            total_days += (leave.end_date - leave.start_date).days + 1
-        return total_days
+        return self._paid_usage()['taken']
 
     @property
     def leaves_pending_this_year(self):
-        """Calcule les jours de congés payés en attente cette année civile.
+        """Jours ouvrés de congés payés en attente cette année civile.
 
         Inclut les statuts 'pending' et 'manager_approved'.
         Utilisé pour calculer le solde effectif disponible avant d'approuver
         une nouvelle demande (leave_balance - leaves_pending).
 
         Returns:
-            int: Nombre de jours de congés payés non encore approuvés cette année.
+            int: Nombre de jours ouvrés de congés payés non encore approuvés cette année.
         """
-        from datetime import date
-        current_year = date.today().year
-        pending_leaves = self.leaves.filter(
-            leave_type='paid',
-            status__in=['pending', 'manager_approved'],
-            start_date__year=current_year
-        )
-        total_days = 0
-        for leave in pending_leaves:
-            total_days += (leave.end_date - leave.start_date).days + 1
-        return total_days
+        return self._paid_usage()['pending']
+
+    def paid_leave_usage(self, year=None, exclude_leave_id=None):
+        """Jours ouvrés de congés payés approuvés et en attente d'une année.
+
+        Une requête, puis un décompte vectorisé (voir api.working_days).
+
+        Args:
+            year (int | None): Année civile (année en cours par défaut).
+            exclude_leave_id (int | None): Congé à ignorer (demande en cours de modification).
+
+        Returns:
+            dict: {'taken': int, 'pending': int}
+        """
+        from .working_days import paid_leave_usage_by_employee
+        usage = paid_leave_usage_by_employee([self.pk], year=year, exclude_leave_id=exclude_leave_id)
+        return usage[self.pk]
+
+    @property
+    def leave_entitlement(self):
+        """Droit à congés payés de l'année en cours.
+
+        Somme des écritures LeaveAccrual de l'année (acquisitions mensuelles et
+        report), ou ANNUAL_LEAVE_ALLOWANCE tant que le registre n'a pas été
+        alimenté pour l'employé (voir api.leave_accrual).
+
+        Returns:
+            Decimal | int: Jours ouvrés acquis pour l'année.
+        """
+        entitlement = getattr(self, '_leave_entitlement', None)
+        if entitlement is None:
+            from .leave_accrual import entitlement_by_employee
+            entitlement = entitlement_by_employee([self.pk])[self.pk]
+        return entitlement
 
     @property
     def leave_balance(self):
         """Calcule le solde de congés payés restants pour l'année en cours.
 
-        Formule : ANNUAL_LEAVE_ALLOWANCE - leaves_taken_this_year
+        Formule : leave_entitlement - leaves_taken_this_year
 
         Returns:
-            int: Nombre de jours de congés payés encore disponibles.
+            Decimal | int: Nombre de jours ouvrés de congés payés encore disponibles.
         """
-        return self.ANNUAL_LEAVE_ALLOWANCE - self.leaves_taken_this_year
+        return self.leave_entitlement - self.leaves_taken_this_year
 
 
 class PasswordRecord(models.Model):
@@ -477,6 +566,10 @@ class Leave(models.Model):
     Seuls les congés de type 'paid' sont décomptés du quota annuel
     de l'employé (ANNUAL_LEAVE_ALLOWANCE = 30 jours).
 
+    Deux congés non rejetés d'un même employé ne peuvent pas se chevaucher :
+    contrainte d'exclusion PostgreSQL 'leave_no_overlap' (index GiST sur
+    l'employé et la période daterange[start_date, end_date]).
+
     Attributes:
         employee (ForeignKey → Employee): Employé demandeur.
         leave_type (CharField): Type de congé ('paid'|'sick'|'unpaid'|'parental'|'other').
@@ -490,7 +583,10 @@ class Leave(models.Model):
         updated_at (DateTimeField): Date de dernière modification (auto).
 
     Properties:
-        days_count (int): Nombre de jours calendaires du congé (bornes incluses).
+        days_count (int): Nombre de jours ouvrés du congé (bornes incluses).
+
+    Le statut lu en base est conservé (_loaded_status) : les alarmes ne sont
+    créées qu'au passage effectif au statut 'approved' (voir api.signals).
     """
 
     LEAVE_TYPES = [
@@ -547,22 +643,56 @@ class Leave(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Nom de la contrainte d'exclusion (utilisé pour traduire l'erreur en API)
+    OVERLAP_CONSTRAINT = 'leave_no_overlap'
+
     class Meta:
         verbose_name = "Congé"
         verbose_name_plural = "Congés"
         ordering = ['-created_at']
+        constraints = [
+            ExclusionConstraint(
+                name='leave_no_overlap',
+                index_type='GIST',
+                expressions=[
+                    # Intervalle singleton [employee_id, employee_id] : égalité d'employé
+                    # exprimée avec l'opérateur de recouvrement natif de GiST
+                    (Int8Range('employee_id', 'employee_id', models.Value('[]')), RangeOperators.OVERLAPS),
+                    (DateRange('start_date', 'end_date', models.Value('[]')), RangeOperators.OVERLAPS),
+                ],
+                condition=~models.Q(status='rejected'),
+                violation_error_message="Ce congé chevauche un autre congé de l'employé.",
+            ),
+        ]
+        indexes = [
+            # Synchronisation incrémentale (?updated_since=)
+            models.Index(fields=['updated_at'], name='leave_updated_at_idx'),
+        ]
+
+    # Statut lu en base (None pour une instance non chargée depuis la base)
+    _loaded_status = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise le statut lu en base pour détecter les transitions à la sauvegarde."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.get_leave_type_display()}"
 
     @property
     def days_count(self):
-        """Calcule le nombre de jours calendaires du congé (bornes incluses).
+        """Calcule le nombre de jours ouvrés du congé (bornes incluses).
+
+        Les samedis, dimanches et jours fériés (PublicHoliday) ne sont pas comptés.
 
         Returns:
-            int: (end_date - start_date).days + 1
+            int: Jours ouvrés de la période [start_date, end_date].
         """
-        return (self.end_date - self.start_date).days + 1
+        from .working_days import working_days
+        return working_days(self.start_date, self.end_date)
 
 
 class Attendance(models.Model):
@@ -570,6 +700,7 @@ class Attendance(models.Model):
 
     Un seul enregistrement par (employee, date) est autorisé (unique_together).
     L'heure d'arrivée et de départ sont optionnelles (cas d'un statut 'absent').
+    La table est partitionnée par mois sur `date` (migration 0021, api.partitions).
 
     Attributes:
         employee (ForeignKey → Employee): Employé concerné.
@@ -581,8 +712,10 @@ class Attendance(models.Model):
         created_at (DateTimeField): Date de création (auto).
         updated_at (DateTimeField): Date de dernière modification (auto).
 
-    Properties:
-        hours_worked (float): Heures travaillées calculées depuis check_in/check_out.
+        hours_worked (GeneratedField): Heures travaillées, calculées et stockées
+            par la base à partir de check_in/check_out (0 si l'une manque).
+            Un départ antérieur à l'arrivée correspond à une garde de nuit
+            (ex. 22:00 → 06:00 = 8 h). Agrégeable en SQL : Sum('hours_worked').
     """
 
     STATUS_CHOICES = [
@@ -608,6 +741,24 @@ class Attendance(models.Model):
         verbose_name="Statut"
     )
     notes = models.TextField(blank=True, null=True, verbose_name="Notes")
+    hours_worked = models.GeneratedField(
+        expression=Coalesce(
+            Cast(
+                Extract(models.F('check_out') - models.F('check_in'), 'epoch') / 3600
+                + models.Case(
+                    # Garde de nuit : le départ a lieu le lendemain
+                    models.When(check_out__lt=models.F('check_in'), then=24),
+                    default=0,
+                ),
+                output_field=models.DecimalField(max_digits=5, decimal_places=2),
+            ),
+            0,
+            output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        ),
+        output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        db_persist=True,
+        verbose_name="Heures travaillées",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -616,28 +767,24 @@ class Attendance(models.Model):
         verbose_name_plural = "Présences"
         ordering = ['-date']
         unique_together = ['employee', 'date']
+        indexes = [
+            # Présences d'une journée, éventuellement filtrées par statut (attendances/today)
+            models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+            # Synchronisation incrémentale (?updated_since=)
+            models.Index(fields=['updated_at'], name='attendance_updated_at_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.date}"
 
-    @property
-    def hours_worked(self):
-        """Calcule les heures travaillées à partir des heures de pointage.
-
-        Si l'une des deux heures (check_in ou check_out) est absente,
-        retourne 0.
+    def save(self, *args, **kwargs):
+        """Sauvegarde puis oublie la valeur de hours_worked, recalculée par la base.
 
-        Returns:
-            float: Nombre d'heures travaillées arrondi à 2 décimales,
-                   ou 0 si le calcul est impossible.
+        La colonne générée est rechargée au prochain accès (une requête), ce qui
+        évite de renvoyer une valeur obsolète après modification des heures.
         """
-        if self.check_in and self.check_out:
-            from datetime import datetime, timedelta
-            check_in_time = datetime.combine(datetime.today(), self.check_in)
-            check_out_time = datetime.combine(datetime.today(), self.check_out)
-            delta = check_out_time - check_in_time
-            return round(delta.total_seconds() / 3600, 2)
-        return 0
+        super().save(*args, **kwargs)
+        self.__dict__.pop('hours_worked', None)
 
 
 class LeaveNotification(models.Model):
@@ -685,9 +832,189 @@ class LeaveNotification(models.Model):
         unique_together = ('leave', 'notification_type')
         ordering = ['trigger_date']
 
+    # Valeur de is_read lue en base (ajustement des compteurs d'alarmes non lues)
+    _loaded_is_read = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise is_read lu en base pour détecter le marquage comme lue."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+
     def __str__(self):
         return (
             f"Alarme {self.get_notification_type_display()} — "
             f"{self.leave.employee.full_name} "
             f"(début : {self.leave.start_date})"
         )
+
+
+class Badge(models.Model):
+    """Badge de pointage signé (HMAC) délivré à un employé.
+
+    Le jeton imprimé sur le badge (QR code) encode l'identifiant de l'employé,
+    son entreprise, la date d'expiration et le numéro de série du badge
+    (voir api.badges). Il est vérifié en mémoire lors du pointage ; cette
+    table ne sert qu'à tracer les émissions et à révoquer les badges perdus.
+
+    Attributes:
+        serial (CharField): Numéro de série unique, inclus dans le jeton signé.
+        employee (ForeignKey → Employee): Titulaire du badge.
+        issued_by (ForeignKey → User): Utilisateur ayant émis le badge (nullable).
+        issued_at (DateTimeField): Date d'émission (auto).
+        expires_at (DateTimeField): Date d'expiration du jeton.
+        revoked_at (DateTimeField): Date de révocation (null si le badge est valide).
+    """
+
+    serial = models.CharField(max_length=16, unique=True, verbose_name="Numéro de série")
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='badges',
+        verbose_name="Employé"
+    )
+    issued_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='issued_badges',
+        verbose_name="Émis par"
+    )
+    issued_at = models.DateTimeField(auto_now_add=True, verbose_name="Émis le")
+    expires_at = models.DateTimeField(verbose_name="Expire le")
+    revoked_at = models.DateTimeField(null=True, blank=True, verbose_name="Révoqué le")
+
+    class Meta:
+        verbose_name = "Badge de pointage"
+        verbose_name_plural = "Badges de pointage"
+        ordering = ['-issued_at']
+        indexes = [
+            models.Index(fields=['revoked_at', 'expires_at'], name='badge_revoked_idx'),
+        ]
+
+    def __str__(self):
+        return f"Badge {self.serial} — {self.employee.full_name}"
+
+
+class PublicHoliday(models.Model):
+    """Jour férié chômé (Côte d'Ivoire).
+
+    Les jours fériés ne sont pas décomptés des congés payés (voir
+    api.working_days). Les fêtes à date fixe et celles dérivées de Pâques
+    peuvent être générées par la commande seed_public_holidays ; les fêtes
+    musulmanes (Korité, Tabaski, Maouloud…), fixées chaque année, sont
+    saisies dans l'administration.
+
+    Attributes:
+        date (DateField): Date du jour férié (unique).
+        name (CharField): Libellé (ex. « Fête de l'Indépendance »).
+        created_at (DateTimeField): Date de création (auto).
+    """
+
+    date = models.DateField(unique=True, verbose_name="Date")
+    name = models.CharField(max_length=100, verbose_name="Libellé")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Jour férié"
+        verbose_name_plural = "Jours fériés"
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.name} ({self.date.isoformat()})"
+
+
+class LeaveAccrual(models.Model):
+    """Écriture du registre d'acquisition des congés payés d'un employé.
+
+    Alimenté uniquement par le traitement par lot api.leave_accrual (commande
+    accrue_leave) : une écriture 'monthly' par employé et par mois de service,
+    une écriture 'carry_over' au 1er janvier pour le report plafonné du solde
+    de l'année précédente. Le droit de l'année est la somme de ses écritures.
+
+    Attributes:
+        employee (ForeignKey → Employee): Employé crédité.
+        period (DateField): Premier jour du mois crédité (1er janvier pour un report).
+        kind (CharField): 'monthly' (acquisition mensuelle) ou 'carry_over' (report).
+        days (DecimalField): Jours crédités.
+        created_at (DateTimeField): Date de l'écriture (auto).
+    """
+
+    KIND_MONTHLY = 'monthly'
+    KIND_CARRY_OVER = 'carry_over'
+    KIND_CHOICES = [
+        (KIND_MONTHLY, 'Acquisition mensuelle'),
+        (KIND_CARRY_OVER, 'Report de fin d\'année'),
+    ]
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='leave_accruals',
+        verbose_name="Employé"
+    )
+    period = models.DateField(verbose_name="Période")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Type")
+    days = models.DecimalField(max_digits=5, decimal_places=2, verbose_name="Jours")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Acquisition de congés"
+        verbose_name_plural = "Acquisitions de congés"
+        ordering = ['employee', 'period', 'kind']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'period', 'kind'], name='leave_accrual_unique_period'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.full_name} — {self.get_kind_display()} {self.period.isoformat()} : {self.days}"
+
+
+class DeletionLog(models.Model):
+    """Pierre tombale d'un agent, d'un congé ou d'une présence supprimé(e).
+
+    Écrite par les signaux post_delete (api.signals) et lue par la
+    synchronisation incrémentale (?updated_since=, voir api.delta_sync) pour
+    signaler aux clients les lignes à retirer de leur copie locale. Le
+    périmètre de l'agent (entreprise, direction, compte) est recopié au moment
+    de la suppression : la pierre tombale n'est montrée qu'aux utilisateurs qui
+    voyaient la ligne. Purgée par la commande purge_deletion_log.
+
+    Attributes:
+        resource (CharField): 'employee', 'leave' ou 'attendance'.
+        object_id (BigIntegerField): Identifiant de la ligne supprimée.
+        department_id (IntegerField): Entreprise de l'agent (nullable).
+        direction (CharField): Direction de l'agent (nullable).
+        user_id (IntegerField): Compte lié à l'agent (nullable).
+        deleted_at (DateTimeField): Date de la suppression.
+    """
+
+    RESOURCE_EMPLOYEE = 'employee'
+    RESOURCE_LEAVE = 'leave'
+    RESOURCE_ATTENDANCE = 'attendance'
+    RESOURCE_CHOICES = [
+        (RESOURCE_EMPLOYEE, 'Agent'),
+        (RESOURCE_LEAVE, 'Congé'),
+        (RESOURCE_ATTENDANCE, 'Présence'),
+    ]
+
+    resource = models.CharField(max_length=20, choices=RESOURCE_CHOICES, verbose_name="Ressource")
+    object_id = models.BigIntegerField(verbose_name="Identifiant")
+    # Copies sans clé étrangère : l'agent ou l'entreprise peuvent avoir disparu
+    department_id = models.IntegerField(null=True, blank=True, verbose_name="Entreprise")
+    direction = models.CharField(max_length=200, null=True, blank=True, verbose_name="Direction")
+    user_id = models.IntegerField(null=True, blank=True, verbose_name="Compte")
+    deleted_at = models.DateTimeField(verbose_name="Supprimé le")
+
+    class Meta:
+        verbose_name = "Suppression"
+        verbose_name_plural = "Suppressions"
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['resource', 'deleted_at'], name='deletion_log_resource_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_resource_display()} #{self.object_id} supprimé le {self.deleted_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,21 @@
+"""
+Arithmétique des mois calendaires.
+
+Un mois est représenté par la date de son premier jour :
+
+  month_start(day)        — Premier jour du mois d'une date.
+  add_months(month, n)    — Premier jour du mois décalé de n mois.
+"""
+
+from datetime import date
+
+
+def month_start(day):
+    """Retourne le premier jour du mois de `day`."""
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    """Décale un premier jour de mois de `count` mois (count peut être négatif)."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
@@ -0,0 +1,140 @@
+"""
+Compteurs d'alarmes de congés non lues, par périmètre.
+
+GET /api/notifications/unread_count/ est appelé par chaque tableau de bord :
+au lieu de recompter les alarmes dues à chaque appel, le nombre d'alarmes non
+lues est gardé en mémoire par entreprise, par direction et au total (admin).
+Le compteur d'un manager est la somme de ceux de ses directions.
+
+  UnreadCounters — Compteurs du processus. Un compteur absent est calculé en
+                   une requête (regroupée par entreprise ou par direction),
+                   puis ajusté par les événements du flux d'alarmes (voir
+                   api.notification_stream), que le processus reçoit de
+                   tous les processus par LISTEN :
+                     notification — variation 'c' portée par chaque élément
+                                    (+1 alarme devenue visible non lue,
+                                    -1 alarme marquée comme lue) ;
+                     read         — -1 par élément (mark_all_read, congé qui
+                                    n'est plus approuvé ou supprimé).
+                   Tous les compteurs sont recalculés au changement de jour
+                   (alarmes dont la trigger_date devient due) et au plus tard
+                   après NOTIFICATION_COUNT_TTL secondes, ce qui borne aussi
+                   tout écart transitoire (événement reçu pendant un calcul).
+                   L'écoute démarre à la première lecture des compteurs ;
+                   tant qu'elle n'est pas établie (démarrage, connexion
+                   interrompue), le nombre est lu en base sans être mémorisé.
+"""
+
+import threading
+import time as time_module
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Count
+
+TOTAL = ('all', None)
+
+
+def _scope_keys(ctx):
+    # Même périmètre que LeaveNotificationViewSet._get_scoped_queryset
+    role = ctx['role']
+    if role == 'entreprise':
+        return [('department', ctx['department'].pk)]
+    if role == 'manager':
+        return [('direction', direction) for direction in sorted(set(ctx['directions']))]
+    return [TOTAL]
+
+
+class UnreadCounters:
+    """Compteurs d'alarmes non lues du processus (voir la docstring du module)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._day = None
+        self._loaded_at = None
+        # Incrémenté à chaque ajustement : un calcul concurrent n'est pas mémorisé
+        self._generation = 0
+
+    def _expire(self):
+        ttl = getattr(settings, 'NOTIFICATION_COUNT_TTL', 300)
+        now = time_module.monotonic()
+        if self._day != date.today() or self._loaded_at is None or now - self._loaded_at >= ttl:
+            self._counts = {}
+            self._day = date.today()
+            self._loaded_at = now
+            self._generation += 1
+
+    def count(self, ctx):
+        """Nombre d'alarmes dues non lues du périmètre (aucune requête si les compteurs sont connus).
+
+        Démarre au besoin l'écoute des événements des autres processus.
+
+        Args:
+            ctx (dict): Contexte retourné par get_user_context.
+
+        Returns:
+            int: Même valeur que le nombre d'alarmes listées par GET /api/notifications/.
+        """
+        from .notification_stream import notification_broker
+        keys = _scope_keys(ctx)
+        if not notification_broker.receives_all_events():
+            # Événements des autres processus manqués : compteurs mémorisés non fiables
+            return sum(self._compute(keys).values()) if keys else 0
+        with self._lock:
+            self._expire()
+            missing = [key for key in keys if key not in self._counts]
+            known = {key: self._counts[key] for key in keys if key in self._counts}
+            generation = self._generation
+        if missing:
+            computed = self._compute(missing)
+            with self._lock:
+                if self._generation == generation:
+                    self._counts.update(computed)
+            known.update(computed)
+        return sum(known.values())
+
+    @staticmethod
+    def _compute(keys):
+        from .models import LeaveNotification
+        unread = LeaveNotification.objects.filter(
+            leave__status='approved', trigger_date__lte=date.today(), is_read=False,
+        )
+        if keys == [TOTAL]:
+            return {TOTAL: unread.count()}
+        kind = keys[0][0]
+        field = 'leave__employee__department_id' if kind == 'department' else 'leave__employee__direction'
+        values = [value for _, value in keys]
+        counts = {key: 0 for key in keys}
+        rows = unread.filter(**{f'{field}__in': values}).values_list(field).annotate(n=Count('id')).order_by()
+        counts.update(((kind, value), n) for value, n in rows)
+        return counts
+
+    def apply(self, event):
+        """Ajuste les compteurs connus d'après un événement du flux d'alarmes."""
+        deltas = Counter()
+        for item in event['items']:
+            delta = -1 if event['event'] == 'read' else item.get('c', 0)
+            if not delta:
+                continue
+            deltas[TOTAL] += delta
+            deltas[('department', item['d'])] += delta
+            if item['r']:
+                deltas[('direction', item['r'])] += delta
+        if not deltas:
+            return
+        with self._lock:
+            self._generation += 1
+            for key, delta in deltas.items():
+                if key in self._counts:
+                    self._counts[key] = max(self._counts[key] + delta, 0)
+
+    def clear(self):
+        """Oublie tous les compteurs (recalculés à la prochaine lecture)."""
+        with self._lock:
+            self._counts = {}
+            self._generation += 1
+
+
+unread_counters = UnreadCounters()
@@ -0,0 +1,339 @@
+"""
+Diffusion en temps réel des alarmes de congés (Server-Sent Events).
+
+Remplace l'interrogation périodique de GET /api/notifications/ par les
+tableaux de bord : chaque tableau de bord ouvert garde une connexion
+GET /api/notifications/stream/ sur laquelle le serveur pousse les alarmes
+nouvelles ou modifiées de son périmètre. Un tableau de bord inactif ne coûte
+aucune requête SQL.
+
+  NotificationBroker — Pub/sub en mémoire du processus. Les écritures
+                       (signal post_save de LeaveNotification, traitements en
+                       masse) publient après COMMIT : l'événement est remis
+                       immédiatement aux abonnés locaux et diffusé aux autres
+                       processus par PostgreSQL NOTIFY. Un thread d'écoute
+                       (LISTEN, connexion dédiée) remet aux abonnés locaux les
+                       événements publiés par les autres processus.
+
+Événements (numérotés par la séquence api_notification_event_seq, commune à
+tous les processus) :
+  notification — alarmes dues créées ou modifiées (données sérialisées) ;
+  read         — identifiants d'alarmes retirées de la liste : marquées comme
+                 lues en masse, ou dont le congé n'est plus approuvé.
+Chaque élément porte l'entreprise et la direction de l'agent : un abonné ne
+reçoit que les éléments de son périmètre. Les événements ajustent aussi les
+compteurs d'alarmes non lues de chaque processus (api.notification_counts).
+
+Les derniers événements sont conservés (NOTIFICATION_STREAM_HISTORY) pour la
+reprise après reconnexion (en-tête Last-Event-ID) ; si l'historique ne couvre
+plus l'identifiant demandé, le flux envoie `reset` et le client recharge la liste.
+"""
+
+import json
+import logging
+import os
+import queue
+import select
+import threading
+from collections import deque
+from datetime import date
+
+import psycopg2
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections, transaction
+
+from .notification_counts import unread_counters
+logger = logging.getLogger('api')
+
+CHANNEL = 'leave_notifications'
+EVENT_SEQUENCE = 'api_notification_event_seq'
+
+# Taille maximale du corps d'un événement (limite NOTIFY : 8000 octets)
+MAX_PAYLOAD = 7000
+
+
+def _scope_matches(scope, item):
+    """Indique si un élément (entreprise 'd', direction 'r') relève d'un périmètre."""
+    role = scope['role']
+    if role == 'admin':
+        return True
+    if role == 'entreprise':
+        return item['d'] == scope['department']
+    return item['r'] in scope['directions']
+
+
+class Subscription:
+    """Abonnement d'un flux SSE : file d'événements filtrés par périmètre."""
+
+    def __init__(self, scope, maxsize=1000):
+        self.scope = scope
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        items = [item for item in event['items'] if _scope_matches(self.scope, item)]
+        if not items:
+            return
+        try:
+            self.queue.put_nowait({'id': event['id'], 'event': event['event'], 'items': items})
+        except queue.Full:
+            # Client trop lent : il devra recharger la liste
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Prochain événement du périmètre, ou None après `timeout` secondes."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class NotificationBroker:
+    """Pub/sub des alarmes de congés (voir la docstring du module)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque()
+        # Identifiant d'événement à partir duquel l'historique est complet
+        self._horizon = None
+        self._origin = f'{os.getpid()}-{id(self)}'
+        self._listener = None
+        self._stop = threading.Event()
+        # Positionné tant que la connexion LISTEN est établie
+        self._listening = threading.Event()
+
+    # ----- Publication -------------------------------------------------
+
+    def publish(self, event, items):
+        """Publie des éléments (après COMMIT) : abonnés locaux et autres processus.
+
+        Les éléments sont répartis en plusieurs événements si nécessaire
+        pour respecter la taille maximale d'un NOTIFY.
+
+        Args:
+            event (str): 'notification' ou 'read'.
+            items (list[dict]): {'d': department_id, 'r': direction, ...} ; 'c' :
+                variation du nombre d'alarmes non lues (événements 'notification').
+        """
+        for chunk in self._chunks(items):
+            body = json.dumps({'event': event, 'items': chunk}, cls=DjangoJSONEncoder)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT s.id, pg_notify(%s, json_build_object('id', s.id, 'origin', %s, 'body', %s::json)::text) "
+                    "FROM (SELECT nextval(%s) AS id) s",
+                    [CHANNEL, self._origin, body, EVENT_SEQUENCE],
+                )
+                event_id = cursor.fetchone()[0]
+            self.dispatch({'id': event_id, 'event': event, 'items': chunk})
+
+    @staticmethod
+    def _chunks(items):
+        chunk, size = [], 0
+        for item in items:
+            item_size = len(json.dumps(item, cls=DjangoJSONEncoder))
+            if chunk and size + item_size > MAX_PAYLOAD:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(item)
+            size += item_size
+        if chunk:
+            yield chunk
+
+    def publish_notifications(self, notifications, deltas=None):
+        """Publie des alarmes créées ou modifiées.
+
+        Seules les alarmes dues d'un congé approuvé sont diffusées (celles
+        que liste GET /api/notifications/).
+
+        Args:
+            notifications (Iterable[LeaveNotification]): Alarmes avec leave et
+                leave.employee chargés.
+            deltas (dict[int, int] | None): Variation du nombre d'alarmes non
+                lues due à chaque alarme ({pk: +1 | -1}, 0 par défaut).
+        """
+        from .serializers import LeaveNotificationSerializer
+        deltas = deltas or {}
+        today = date.today()
+        due = [n for n in notifications if n.trigger_date <= today and n.leave.status == 'approved']
+        if not due:
+            return
+        data = LeaveNotificationSerializer(due, many=True).data
+        self.publish('notification', [
+            {
+                'd': n.leave.employee.department_id, 'r': n.leave.employee.direction,
+                'c': deltas.get(n.pk, 0), 'n': payload,
+            }
+            for n, payload in zip(due, data)
+        ])
+
+    def publish_read(self, rows):
+        """Publie des alarmes retirées de la liste (lues en masse, congé plus approuvé).
+
+        Args:
+            rows (Iterable[tuple]): (id, department_id, direction) de chaque alarme.
+        """
+        self.publish('read', [{'d': department, 'r': direction, 'id': pk} for pk, department, direction in rows])
+
+    # ----- Remise aux abonnés -------------------------------------------
+
+    def dispatch(self, event):
+        """Remet un événement aux abonnés locaux et l'ajoute à l'historique."""
+        limit = getattr(settings, 'NOTIFICATION_STREAM_HISTORY', 1000)
+        with self._lock:
+            self._history.append(event)
+            while len(self._history) > limit:
+                evicted = self._history.popleft()
+                self._horizon = max(self._horizon or 0, evicted['id'])
+            subscribers = list(self._subscribers)
+        unread_counters.apply(event)
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, scope):
+        """Ouvre un abonnement et démarre au besoin le thread d'écoute.
+
+        Args:
+            scope (dict): {'role', 'department' (id), 'directions' (set)}.
+
+        Returns:
+            Subscription: Abonnement à fermer par unsubscribe().
+        """
+        self._ensure_started()
+        subscription = Subscription(scope)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def last_event_id(self):
+        """Identifiant du dernier événement connu (point de reprise d'un nouveau flux)."""
+        with self._lock:
+            if self._history:
+                return max(event['id'] for event in self._history)
+            return self._horizon or 0
+
+    def replay(self, subscription, last_event_id):
+        """Remet à un abonnement les événements postérieurs à `last_event_id`.
+
+        Returns:
+            bool: False si l'historique ne couvre plus ce point de reprise.
+        """
+        with self._lock:
+            if self._horizon is None or last_event_id < self._horizon:
+                return False
+            events = sorted(
+                (event for event in self._history if event['id'] > last_event_id),
+                key=lambda event: event['id'],
+            )
+        for event in events:
+            subscription.deliver(event)
+        return True
+
+    # ----- Écoute LISTEN / NOTIFY --------------------------------------
+
+    def _ensure_started(self):
+        # L'écoute est établie avant de fixer l'horizon : aucun événement ultérieur n'est manqué
+        if getattr(settings, 'NOTIFICATION_STREAM_LISTEN', True):
+            self.start_listener()
+        if self._horizon is not None:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT last_value, is_called FROM {EVENT_SEQUENCE}')
+            last_value, is_called = cursor.fetchone()
+        with self._lock:
+            if self._horizon is None:
+                self._horizon = last_value if is_called else last_value - 1
+
+    def receives_all_events(self):
+        """Indique si le processus reçoit les événements de tous les processus.
+
+        Démarre au besoin le thread d'écoute (premier appel des compteurs
+        d'alarmes non lues, même sans flux ouvert). Sans écoute configurée
+        (NOTIFICATION_STREAM_LISTEN à False), le processus est supposé seul.
+
+        Returns:
+            bool: False tant que la connexion LISTEN n'est pas établie.
+        """
+        if not getattr(settings, 'NOTIFICATION_STREAM_LISTEN', True):
+            return True
+        self.start_listener()
+        return self._listening.is_set()
+
+    def start_listener(self):
+        """Démarre le thread d'écoute des événements des autres processus."""
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._stop.clear()
+            ready = threading.Event()
+            self._listener = threading.Thread(
+                target=self._listen, args=(ready,), name='notification-listener', daemon=True,
+            )
+            self._listener.start()
+        ready.wait(5)
+
+    def stop_listener(self):
+        """Arrête le thread d'écoute (tests, arrêt du processus)."""
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(5)
+        self._listener = None
+
+    def _listen(self, ready):
+        params = connections['default'].get_connection_params()
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(**params)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                # Des événements ont pu être manqués avant l'écoute : compteurs recalculés
+                unread_counters.clear()
+                self._listening.set()
+                ready.set()
+                try:
+                    while not self._stop.is_set():
+                        if select.select([conn], [], [], 1.0) == ([], [], []):
+                            continue
+                        conn.poll()
+                        while conn.notifies:
+                            self._receive(conn.notifies.pop(0).payload)
+                finally:
+                    self._listening.clear()
+                    conn.close()
+            except psycopg2.Error:
+                ready.set()
+                logger.warning("Écoute des alarmes interrompue, nouvelle tentative", exc_info=True)
+                self._stop.wait(5)
+
+    def _receive(self, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Événement d'alarme illisible ignoré : %r", payload[:200])
+            return
+        if message.get('origin') == self._origin:
+            return  # déjà remis localement par publish()
+        body = message['body']
+        self.dispatch({'id': message['id'], 'event': body['event'], 'items': body['items']})
+
+
+notification_broker = NotificationBroker()
+
+
+def publish_on_commit(callback):
+    """Exécute une publication après le COMMIT de la transaction courante.
+
+    Les erreurs de publication sont journalisées sans affecter l'écriture.
+    """
+    def run():
+        try:
+            callback()
+        except Exception:
+            logger.warning("Publication d'alarmes en temps réel impossible", exc_info=True)
+    transaction.on_commit(run)
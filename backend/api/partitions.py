@@ -0,0 +1,156 @@
+"""
+Partitionnement mensuel de la table des présences (PostgreSQL).
+
+La table api_attendance est partitionnée par intervalle sur la colonne `date`
+(PARTITION BY RANGE) : une partition par mois, nommée api_attendance_yAAAAmMM,
+plus une partition par défaut (api_attendance_default) qui reçoit les dates
+hors des mois créés (historiques importés, saisies lointaines).
+
+Toutes les requêtes portant un prédicat sur `date` (présences du jour,
+historique borné, rapports mensuels) ne parcourent que les partitions
+concernées (partition pruning).
+
+Fonctions :
+  partition_name(month)          — Nom de la partition d'un mois.
+  list_partitions(cursor)        — Partitions mensuelles attachées, triées.
+  create_month_partition(...)    — Crée (si besoin) la partition d'un mois, en y
+                                   déplaçant les lignes déjà présentes dans la
+                                   partition par défaut.
+  ensure_partitions(...)         — Crée les partitions du mois courant et des
+                                   N mois suivants (commande create_attendance_partitions).
+  detach_partition(...)          — Détache une partition pour archivage
+                                   (commande detach_attendance_partitions).
+
+Contraintes imposées par PostgreSQL : la clé primaire et la contrainte unique
+doivent contenir la clé de partitionnement. La table porte donc
+PRIMARY KEY (id, date) et UNIQUE (employee_id, date) ; `id` reste unique en
+pratique (séquence) et Django continue de l'utiliser comme clé primaire.
+"""
+
+import re
+from datetime import date
+
+from .months import add_months, month_start
+
+ATTENDANCE_TABLE = 'api_attendance'
+DEFAULT_PARTITION = f'{ATTENDANCE_TABLE}_default'
+
+_PARTITION_RE = re.compile(rf'^{ATTENDANCE_TABLE}_y(\d{{4}})m(\d{{2}})$')
+
+# Colonnes écrites lors d'un déplacement de lignes (hours_worked est générée)
+_COPY_COLUMNS = 'id, employee_id, date, check_in, check_out, status, notes, created_at, updated_at'
+
+
+def partition_name(month):
+    """Nom de la partition du mois (ex. api_attendance_y2026m03)."""
+    return f'{ATTENDANCE_TABLE}_y{month.year:04d}m{month.month:02d}'
+
+
+def list_partitions(cursor):
+    """Retourne les partitions mensuelles attachées à la table des présences.
+
+    Args:
+        cursor: Curseur de base de données.
+
+    Returns:
+        list[tuple[date, str]]: (premier jour du mois, nom de la partition), triés.
+    """
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        """,
+        [ATTENDANCE_TABLE],
+    )
+    partitions = []
+    for (name,) in cursor.fetchall():
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions.append((date(int(match.group(1)), int(match.group(2)), 1), name))
+    return sorted(partitions)
+
+
+def _table_exists(cursor, name):
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [name])
+    return cursor.fetchone()[0]
+
+
+def create_month_partition(cursor, month):
+    """Crée la partition d'un mois si elle n'existe pas encore.
+
+    Si la partition par défaut contient déjà des lignes de ce mois, elle est
+    détachée le temps de les déplacer dans la nouvelle partition (PostgreSQL
+    refuse sinon la création), puis rattachée. À exécuter dans une transaction.
+
+    Args:
+        cursor: Curseur de base de données.
+        month (date): Premier jour du mois.
+
+    Returns:
+        bool: True si la partition a été créée, False si elle existait déjà.
+    """
+    name = partition_name(month)
+    if _table_exists(cursor, name):
+        return False
+    bounds = [month, add_months(month, 1)]
+
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s)',
+        bounds,
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(
+            f'CREATE TABLE {name} PARTITION OF {ATTENDANCE_TABLE} FOR VALUES FROM (%s) TO (%s)',
+            bounds,
+        )
+        return True
+
+    cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} DETACH PARTITION {DEFAULT_PARTITION}')
+    cursor.execute(
+        f'CREATE TABLE {name} PARTITION OF {ATTENDANCE_TABLE} FOR VALUES FROM (%s) TO (%s)',
+        bounds,
+    )
+    cursor.execute(
+        f'INSERT INTO {name} ({_COPY_COLUMNS}) SELECT {_COPY_COLUMNS} FROM {DEFAULT_PARTITION} '
+        f'WHERE date >= %s AND date < %s',
+        bounds,
+    )
+    cursor.execute(f'DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s', bounds)
+    cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT')
+    return True
+
+
+def ensure_partitions(cursor, months_ahead=3, today=None):
+    """Crée les partitions du mois courant et des `months_ahead` mois suivants.
+
+    Args:
+        cursor: Curseur de base de données.
+        months_ahead (int): Nombre de mois à anticiper.
+        today (date | None): Date de référence (aujourd'hui par défaut).
+
+    Returns:
+        list[str]: Noms des partitions créées.
+    """
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_month_partition(cursor, month):
+            created.append(partition_name(month))
+    return created
+
+
+def detach_partition(cursor, name):
+    """Détache une partition mensuelle : elle devient une table autonome.
+
+    La table détachée n'est plus visible par l'application et peut être
+    exportée (pg_dump -t <nom>) puis supprimée.
+
+    Args:
+        cursor: Curseur de base de données.
+        name (str): Nom de la partition (voir list_partitions).
+    """
+    cursor.execute(f'ALTER TABLE {ATTENDANCE_TABLE} DETACH PARTITION {name}')
@@ -9,9 +9,13 @@ Serializers disponibles :
   PasswordRecordSerializer — Mot de passe chiffré, exposé déchiffré via get_password_plain
   UserSerializer          — Utilisateur Django (lecture)
   DepartmentSerializer    — Entreprise prestataire avec compteur d'employés
-  EmployeeSerializer      — Agent contractuel avec données calculées (âge, solde congés)
-  LeaveSerializer         — Demande de congé avec validation des dates et du solde
+  EmployeeSerializer      — Agent contractuel avec données calculées (âge, solde congés) ;
+                            en liste, soldes calculés en masse (EmployeeListSerializer)
+  LeaveSerializer         — Demande de congé avec validation des dates, du solde et
+                            traduction de la contrainte anti-chevauchement
+  LeaveBulkActionSerializer — Liste d'identifiants pour l'approbation/le rejet groupé
   AttendanceSerializer    — Pointage avec validation check_in < check_out
+  AttendanceBulkMarkSerializer — Pointage groupé d'un périmètre (statut par défaut + exceptions)
   RegisterSerializer      — Création de compte avec confirmation de mot de passe
 
 Conventions :
@@ -22,8 +26,14 @@ Conventions :
 """
 
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from .models import Direction, Department, Employee, Leave, Attendance, PasswordRecord, LeaveNotification
+from .analytics import RETIREMENT_AGE
+from .attendance_bulk import is_overnight_shift
+from .leave_accrual import entitlement_by_employee
+from .working_days import paid_leave_usage_by_employee, working_days
 
 
 class DirectionSerializer(serializers.ModelSerializer):
@@ -153,6 +163,37 @@ class DepartmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+def preload_leave_figures(employees):
+    """Charge en deux requêtes les congés payés et droits acquis de plusieurs agents.
+
+    Renseigne _paid_leave_usage et _leave_entitlement, lus par les propriétés
+    de solde du modèle Employee (leaves_taken_this_year, leave_balance…).
+
+    Args:
+        employees (list[Employee]): Agents à sérialiser.
+    """
+    employee_ids = [employee.pk for employee in employees]
+    usage = paid_leave_usage_by_employee(employee_ids)
+    entitlement = entitlement_by_employee(employee_ids)
+    for employee in employees:
+        employee._paid_leave_usage = usage[employee.pk]
+        employee._leave_entitlement = entitlement[employee.pk]
+
+
+class EmployeeListSerializer(serializers.ListSerializer):
+    """Sérialisation d'une liste d'agents : soldes de congés calculés en masse.
+
+    Les jours de congés payés et les droits acquis de tous les agents de la
+    liste (page) sont chargés en deux requêtes (paid_leave_usage_by_employee,
+    entitlement_by_employee) au lieu de plusieurs par agent.
+    """
+
+    def to_representation(self, data):
+        employees = list(data.all() if hasattr(data, 'all') else data)
+        preload_leave_figures(employees)
+        return super().to_representation(employees)
+
+
 class EmployeeSerializer(serializers.ModelSerializer):
     """Serializer complet pour les agents contractuels.
 
@@ -165,9 +206,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
         department_name (str)           : Nom de l'entreprise (FK dénormalisée).
         user_details (dict)             : Données complètes du User associé.
         cnps_number (str)               : Alias du champ cnps (compatibilité frontend).
-        leave_balance (int)             : Solde de congés payés restants.
-        leaves_taken_this_year (int)    : Jours de congés payés approuvés cette année.
-        leaves_pending_this_year (int)  : Jours de congés payés en attente.
+        leave_entitlement (float)       : Droit acquis de l'année (registre ou forfait).
+        leave_balance (float)           : Solde de congés payés restants (jours ouvrés).
+        leaves_taken_this_year (int)    : Jours ouvrés de congés payés approuvés cette année.
+        leaves_pending_this_year (int)  : Jours ouvrés de congés payés en attente.
         annual_leave_allowance (int)    : Quota annuel fixe (ANNUAL_LEAVE_ALLOWANCE).
         age (int|None)                  : Âge calculé depuis birth_date.
         retirement_year (int|None)      : Année de départ à la retraite (birth_date + 60).
@@ -183,7 +225,8 @@ class EmployeeSerializer(serializers.ModelSerializer):
     # Alias pour la compatibilité avec certains formulaires frontend
     cnps_number = serializers.CharField(source='cnps', required=True)
     # Champs de gestion des congés
-    leave_balance = serializers.ReadOnlyField()
+    leave_entitlement = serializers.FloatField(read_only=True)
+    leave_balance = serializers.FloatField(read_only=True)
     leaves_taken_this_year = serializers.ReadOnlyField()
     leaves_pending_this_year = serializers.ReadOnlyField()
     annual_leave_allowance = serializers.SerializerMethodField()
@@ -193,13 +236,14 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Employee
+        list_serializer_class = EmployeeListSerializer
         fields = [
             'id', 'matricule', 'first_name', 'last_name', 'full_name', 'email', 'phone',
             'birth_date', 'gender', 'department', 'department_name', 'direction', 'position', 'hire_date',
             'salary', 'cnps', 'cnps_number', 'city', 'commune', 'address',
-            'marital_status', 'number_of_children', 'status', 'user', 'user_details',
+            'marital_status', 'number_of_children', 'status', 'exit_date', 'user', 'user_details',
             'photo', 'cni_recto', 'cni_verso',
-            'leave_balance', 'leaves_taken_this_year', 'leaves_pending_this_year',
+            'leave_entitlement', 'leave_balance', 'leaves_taken_this_year', 'leaves_pending_this_year',
             'annual_leave_allowance', 'age', 'retirement_year', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -240,7 +284,9 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return None
 
     def get_retirement_year(self, obj):
-        """Calcule l'année prévue de départ à la retraite (âge légal : 60 ans).
+        """Calcule l'année prévue de départ à la retraite (âge légal : RETIREMENT_AGE, 60 ans).
+
+        Même calcul que les prévisions agrégées de /api/analytics/demographics/.
 
         Args:
             obj (Employee): Instance de l'employé.
@@ -249,7 +295,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             int|None: Année de retraite (birth_date.year + 60), ou None si absence de birth_date.
         """
         if obj.birth_date:
-            return obj.birth_date.year + 60
+            return obj.birth_date.year + RETIREMENT_AGE
         return None
 
     def validate_email(self, value):
@@ -314,11 +360,16 @@ class LeaveSerializer(serializers.ModelSerializer):
     Effectue deux validations métier critiques :
       1. La date de fin doit être postérieure ou égale à la date de début.
       2. Pour les congés payés, le solde disponible (après soustraction des
-         demandes en attente) doit couvrir la durée demandée.
+         demandes en attente) doit couvrir la durée demandée. Ce contrôle est
+         fait à l'enregistrement, sous verrou de la ligne de l'employé, pour
+         que deux demandes simultanées ne puissent pas dépasser le quota.
+    Le non-chevauchement avec les autres congés non rejetés de l'employé est
+    garanti par la base (contrainte leave_no_overlap) ; la violation est
+    renvoyée comme erreur de validation sur end_date.
 
     Champs calculés :
         employee_name (str)           : Nom complet de l'employé.
-        days_count (int)              : Nombre de jours (propriété du modèle).
+        days_count (int)              : Nombre de jours ouvrés (propriété du modèle).
         manager_approved_by_name (str): Nom du manager validateur.
         approved_by_name (str)        : Nom de l'approbateur final.
     """
@@ -342,12 +393,10 @@ class LeaveSerializer(serializers.ModelSerializer):
         }
 
     def validate(self, data):
-        """Valide les dates de congé et le solde de congés payés disponible.
+        """Valide l'ordre des dates de congé.
 
-        Vérifications effectuées :
-          1. end_date >= start_date.
-          2. Pour leave_type='paid' : le solde effectif (balance - jours en attente)
-             doit être supérieur ou égal au nombre de jours demandés.
+        Le solde de congés payés est vérifié dans create()/update(), à
+        l'intérieur de la transaction d'enregistrement (voir _check_paid_balance).
 
         Args:
             data (dict): Données désérialisées du formulaire.
@@ -356,49 +405,145 @@ class LeaveSerializer(serializers.ModelSerializer):
             dict: Données validées inchangées.
 
         Raises:
-            serializers.ValidationError: Si les dates sont invalides ou
-                si le solde de congés est insuffisant.
+            serializers.ValidationError: Si la date de fin précède la date de début.
         """
         if data.get('start_date') and data.get('end_date'):
             if data['end_date'] < data['start_date']:
                 raise serializers.ValidationError({
                     'end_date': "La date de fin doit être postérieure à la date de début."
                 })
+        return data
+
+    @staticmethod
+    def _check_paid_balance(data, instance=None):
+        """Vérifie que le solde de congés payés couvre la demande.
 
-            days_requested = (data['end_date'] - data['start_date']).days + 1
+        Verrouille la ligne de l'employé (SELECT … FOR UPDATE) puis lit les
+        jours ouvrés approuvés et en attente et le droit acquis de l'année
+        (registre LeaveAccrual, ou forfait annuel) : les demandes
+        concurrentes d'un même employé sont sérialisées jusqu'au COMMIT.
+        Les week-ends et jours fériés ne sont pas décomptés.
+        Doit être appelée dans une transaction.
 
-            # Vérifier le solde uniquement pour les congés payés
-            employee = data.get('employee')
-            if employee and data.get('leave_type') == 'paid':
-                available_balance = employee.leave_balance
-                pending_days = employee.leaves_pending_this_year
+        Args:
+            data (dict): Données validées (complétées par l'instance en modification).
+            instance (Leave | None): Demande modifiée, exclue du décompte.
 
-                # Solde effectif = solde disponible moins les jours déjà en attente
-                effective_balance = available_balance - pending_days
+        Raises:
+            serializers.ValidationError: Si le solde effectif
+                (balance - jours en attente) est inférieur aux jours demandés.
+        """
+        def field(name):
+            return data[name] if name in data else getattr(instance, name, None)
+
+        employee, start, end = field('employee'), field('start_date'), field('end_date')
+        if not (employee and start and end) or field('leave_type') != 'paid':
+            return
+
+        Employee.objects.select_for_update().only('id').get(pk=employee.pk)
+        usage = employee.paid_leave_usage(exclude_leave_id=instance.pk if instance else None)
+        available_balance = entitlement_by_employee([employee.pk])[employee.pk] - usage['taken']
+        pending_days = usage['pending']
+        days_requested = working_days(start, end)
+
+        # Solde effectif = solde disponible moins les jours déjà en attente
+        if days_requested > available_balance - pending_days:
+            raise serializers.ValidationError({
+                'end_date': f"Solde de congés insuffisant. Vous avez {available_balance} jours disponibles "
+                           f"({pending_days} jours en attente d'approbation). "
+                           f"Vous demandez {days_requested} jours."
+            })
+
+    @staticmethod
+    def _is_overlap_violation(exc):
+        """Indique si une IntegrityError provient de la contrainte leave_no_overlap."""
+        diag = getattr(exc.__cause__, 'diag', None)
+        return getattr(diag, 'constraint_name', None) == Leave.OVERLAP_CONSTRAINT
+
+    def _save_checking_overlap(self, save, validated_data, instance=None):
+        """Exécute create/update et traduit un chevauchement en erreur sur end_date.
+
+        Le solde de congés payés est contrôlé dans la même transaction que
+        l'écriture. Le chevauchement est détecté par la base (contrainte
+        d'exclusion GiST), sans parcourir les congés de l'employé. Un point de
+        sauvegarde isole l'échec pour ne pas invalider la transaction englobante.
+        """
+        args = (validated_data,) if instance is None else (instance, validated_data)
+        try:
+            with transaction.atomic():
+                self._check_paid_balance(validated_data, instance)
+                return save(*args)
+        except IntegrityError as exc:
+            if not self._is_overlap_violation(exc):
+                raise
+            raise serializers.ValidationError({
+                'end_date': "Cette période chevauche un autre congé non rejeté de l'employé."
+            })
 
-                if days_requested > effective_balance:
-                    raise serializers.ValidationError({
-                        'end_date': f"Solde de congés insuffisant. Vous avez {available_balance} jours disponibles "
-                                   f"({pending_days} jours en attente d'approbation). "
-                                   f"Vous demandez {days_requested} jours."
-                    })
+    def create(self, validated_data):
+        return self._save_checking_overlap(super().create, validated_data)
 
-        return data
+    def update(self, instance, validated_data):
+        return self._save_checking_overlap(super().update, validated_data, instance)
+
+
+class LeaveBulkActionSerializer(serializers.Serializer):
+    """Payload de POST /leaves/bulk_approve/ et /leaves/bulk_reject/.
+
+    Fields:
+        ids (list[int]): Identifiants des demandes de congé à traiter (sans doublon).
+    """
+
+    MAX_IDS = 500
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        """Supprime les doublons en conservant l'ordre de la requête."""
+        return list(dict.fromkeys(value))
+
+
+def _validate_check_times(data):
+    """Vérifie la cohérence de check_in et check_out lorsque les deux sont fournis.
+
+    Un départ antérieur à l'arrivée correspond à une garde de nuit (départ le
+    lendemain), limitée à settings.ATTENDANCE_MAX_OVERNIGHT_HOURS heures.
+    """
+    check_in, check_out = data.get('check_in'), data.get('check_out')
+    if check_in and check_out:
+        if check_out == check_in:
+            raise serializers.ValidationError({
+                'check_out': "L'heure de sortie doit être différente de l'heure d'entrée."
+            })
+        if check_out < check_in and not is_overnight_shift(check_in, check_out):
+            max_hours = getattr(settings, 'ATTENDANCE_MAX_OVERNIGHT_HOURS', 16)
+            raise serializers.ValidationError({
+                'check_out': (
+                    "L'heure de sortie doit être postérieure à l'heure d'entrée, "
+                    f"ou le lendemain pour une garde de nuit de {max_hours} h au plus."
+                )
+            })
+    return data
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
     """Serializer pour les enregistrements de présence (pointages).
 
-    Le champ `hours_worked` est calculé côté modèle à partir de check_in et check_out.
-    La validation s'assure que l'heure de sortie est postérieure à l'heure d'entrée.
+    Le champ `hours_worked` est calculé par la base (colonne générée) à partir de check_in et check_out.
+    La validation s'assure que l'heure de sortie est postérieure à l'heure d'entrée, ou
+    antérieure pour une garde de nuit (départ le lendemain) de durée raisonnable.
 
     Champs calculés :
         employee_name (str): Nom complet de l'employé.
-        hours_worked (float): Heures travaillées (propriété du modèle).
+        hours_worked (float): Heures travaillées (colonne générée du modèle).
     """
 
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
-    hours_worked = serializers.ReadOnlyField()
+    hours_worked = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Attendance
@@ -410,7 +555,7 @@ class AttendanceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def validate(self, data):
-        """Valide que l'heure de sortie est postérieure à l'heure d'entrée.
+        """Valide l'heure de sortie (postérieure à l'entrée, ou garde de nuit).
 
         Args:
             data (dict): Données désérialisées.
@@ -419,14 +564,54 @@ class AttendanceSerializer(serializers.ModelSerializer):
             dict: Données validées inchangées.
 
         Raises:
-            serializers.ValidationError: Si check_out <= check_in.
+            serializers.ValidationError: Si check_out == check_in, ou si la garde de
+                nuit (check_out < check_in) dépasse ATTENDANCE_MAX_OVERNIGHT_HOURS.
         """
-        if data.get('check_in') and data.get('check_out'):
-            if data['check_out'] <= data['check_in']:
-                raise serializers.ValidationError({
-                    'check_out': "L'heure de sortie doit être postérieure à l'heure d'entrée."
-                })
-        return data
+        return _validate_check_times(data)
+
+
+class AttendanceExceptionSerializer(serializers.Serializer):
+    """Exception individuelle d'un pointage groupé (employé avec un statut différent)."""
+
+    employee = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES)
+    check_in = serializers.TimeField(required=False, allow_null=True)
+    check_out = serializers.TimeField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, data):
+        return _validate_check_times(data)
+
+
+class AttendanceBulkMarkSerializer(serializers.Serializer):
+    """Payload de POST /attendances/bulk_mark/.
+
+    Un statut par défaut (et éventuellement des heures) est appliqué à tous les
+    employés du périmètre, sauf ceux listés dans `exceptions`.
+
+    Fields:
+        date (date)        : Date du pointage.
+        status (str)       : Statut par défaut ('present'|'absent'|'late'|'half-day').
+        check_in (time)    : Heure d'arrivée par défaut (optionnelle).
+        check_out (time)   : Heure de départ par défaut (optionnelle).
+        exceptions (list)  : Pointages individuels dérogeant au statut par défaut.
+    """
+
+    date = serializers.DateField()
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES)
+    check_in = serializers.TimeField(required=False, allow_null=True)
+    check_out = serializers.TimeField(required=False, allow_null=True)
+    exceptions = AttendanceExceptionSerializer(many=True, required=False, default=list)
+
+    def validate_exceptions(self, value):
+        """Refuse les exceptions en double pour un même employé."""
+        ids = [item['employee'] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Un employé ne peut apparaître qu'une fois dans les exceptions.")
+        return value
+
+    def validate(self, data):
+        return _validate_check_times(data)
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -1,64 +1,285 @@
 """
-Signaux Django pour la gestion automatique des alarmes de congés.
+Signaux Django : alarmes de congés et invalidation du cache des présences.
 
-Lorsqu'un congé passe au statut 'approved', deux alarmes sont créées :
+Lorsqu'un congé passe au statut 'approved' (par save() ou par un traitement
+en masse via bulk_create_leave_notifications), deux alarmes sont créées :
   - 7 jours avant le début du congé (rappel anticipé pour le manager).
   - La veille du début du congé (rappel de dernière minute).
 
 Si l'un des deux trigger_date tombe dans le passé, l'alarme est quand même
 créée (trigger_date peut être antérieure à today) afin de ne pas la manquer ;
 elle apparaîtra immédiatement dans la liste des alarmes dues.
+
+Toute écriture ou suppression d'une présence invalide le cache des présences
+du jour et les statistiques du tableau de bord (voir api.caching) ; les
+écritures en masse qui contournent les signaux (bulk_create, tampon de
+pointage) appellent invalidate_attendance_days eux-mêmes. Toute écriture ou
+suppression d'un agent ou d'un congé invalide aussi les statistiques ; celles
+d'un agent invalident en outre la pyramide des âges (/api/analytics/demographics/).
+
+Toute modification d'un jour férié recharge le calendrier des jours ouvrés
+(voir api.working_days).
+
+Toute alarme créée ou modifiée est poussée, après COMMIT, aux tableaux de bord
+connectés au flux temps réel (voir api.notification_stream) ; les alarmes
+créées en masse sont publiées par bulk_create_leave_notifications. Les alarmes
+d'un congé qui n'est plus approuvé (ou supprimé) sont publiées comme retirées.
+Ces événements ajustent les compteurs d'alarmes non lues (api.notification_counts).
+
+Le transfert d'un agent vers une autre entreprise, ou son passage au statut
+'inactive', révoque ses badges de pointage (voir api.badges).
+
+Toute suppression d'un agent, d'un congé ou d'une présence laisse une pierre
+tombale (DeletionLog) lue par la synchronisation incrémentale ?updated_since=
+(voir api.delta_sync).
 """
 
 import logging
-from datetime import timedelta
+from datetime import date, timedelta
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import Leave, LeaveNotification
+from .badges import revoke_badges
+from .caching import invalidate_attendance_days, invalidate_dashboard_stats, invalidate_demographics
+from .delta_sync import log_deletion
+from .models import Attendance, DeletionLog, Employee, Leave, LeaveNotification, PublicHoliday
+from .checkin import checkin_directory
+from .notification_stream import notification_broker, publish_on_commit
+from .working_days import holiday_calendar
 
 logger = logging.getLogger('api')
 
 
 @receiver(post_save, sender=Leave)
 def create_leave_notifications(sender, instance, **kwargs):
-    """Crée les alarmes de rappel quand un congé est approuvé.
+    """Crée les alarmes de rappel quand un congé passe au statut 'approved'.
 
     Appelé automatiquement après chaque sauvegarde d'un objet Leave.
-    N'agit que si le statut est 'approved'.
-    Utilise get_or_create pour éviter les doublons en cas de multi-save.
+    N'agit qu'à la transition vers 'approved' (statut lu en base différent,
+    voir Leave._loaded_status) : une nouvelle sauvegarde d'un congé déjà
+    approuvé n'exécute aucune requête. Les deux alarmes sont insérées en une
+    requête par bulk_create_leave_notifications, sans doublon.
 
     Args:
         sender: La classe Leave.
         instance (Leave): L'instance sauvegardée.
         **kwargs: Arguments supplémentaires (created, raw, etc.).
     """
-    if instance.status != 'approved':
+    previous, instance._loaded_status = instance._loaded_status, instance.status
+    if previous == 'approved' and instance.status != 'approved':
+        # Les alarmes ne sont plus listées : retirées des tableaux de bord et des compteurs
+        publish_on_commit(lambda: notification_broker.publish_read(_unread_due_rows(instance.pk)))
+        return
+    if instance.status != 'approved' or previous == 'approved':
         return
 
-    # Alarme J-7
-    trigger_7days = instance.start_date - timedelta(days=7)
-    notif_7, created_7 = LeaveNotification.objects.get_or_create(
-        leave=instance,
-        notification_type=LeaveNotification.TYPE_7DAYS,
-        defaults={'trigger_date': trigger_7days},
+    bulk_create_leave_notifications([instance])
+    logger.info(
+        "Alarmes J-7 et veille programmées pour congé #%s (J-7 : %s)",
+        instance.pk, instance.start_date - timedelta(days=7),
     )
-    if created_7:
-        logger.info(
-            "Alarme J-7 créée pour congé #%s (trigger: %s)",
-            instance.pk, trigger_7days,
-        )
 
-    # Alarme veille (J-1)
-    trigger_eve = instance.start_date - timedelta(days=1)
-    notif_eve, created_eve = LeaveNotification.objects.get_or_create(
-        leave=instance,
-        notification_type=LeaveNotification.TYPE_EVE,
-        defaults={'trigger_date': trigger_eve},
+
+@receiver(pre_delete, sender=Leave)
+def withdraw_leave_notifications(sender, instance, **kwargs):
+    """Retire des tableaux de bord les alarmes d'un congé approuvé supprimé.
+
+    Les alarmes sont relues avant la suppression en cascade et publiées
+    comme retirées après COMMIT.
+
+    Args:
+        sender: La classe Leave.
+        instance (Leave): L'instance supprimée.
+        **kwargs: Arguments supplémentaires.
+    """
+    if instance.status != 'approved':
+        return
+    rows = _unread_due_rows(instance.pk)
+    if rows:
+        publish_on_commit(lambda: notification_broker.publish_read(rows))
+
+
+def _unread_due_rows(leave_id):
+    return list(
+        LeaveNotification.objects
+        .filter(leave_id=leave_id, trigger_date__lte=date.today(), is_read=False)
+        .values_list('id', 'leave__employee__department_id', 'leave__employee__direction')
     )
-    if created_eve:
+
+
+@receiver(post_save, sender=LeaveNotification)
+def publish_leave_notification(sender, instance, created, **kwargs):
+    """Pousse une alarme créée ou modifiée aux flux temps réel, après COMMIT.
+
+    La variation du nombre d'alarmes non lues (création, marquage comme lue)
+    accompagne l'événement.
+
+    Args:
+        sender: La classe LeaveNotification.
+        instance (LeaveNotification): L'instance sauvegardée.
+        created (bool): True à la création.
+        **kwargs: Arguments supplémentaires (raw, etc.).
+    """
+    previous, instance._loaded_is_read = instance._loaded_is_read, instance.is_read
+    if kwargs.get('raw'):
+        return
+    if created:
+        delta = 0 if instance.is_read else 1
+    elif previous is None:
+        delta = 0
+    else:
+        delta = int(previous) - int(instance.is_read)
+    publish_on_commit(lambda: notification_broker.publish_notifications([instance], deltas={instance.pk: delta}))
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_attendance_cache(sender, instance, **kwargs):
+    """Invalide le cache des présences du jour après écriture ou suppression.
+
+    Args:
+        sender: La classe Attendance.
+        instance (Attendance): L'instance sauvegardée ou supprimée.
+        **kwargs: Arguments supplémentaires.
+    """
+    invalidate_attendance_days([instance.date])
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Leave)
+@receiver(post_delete, sender=Attendance)
+def record_deletion(sender, instance, **kwargs):
+    """Écrit la pierre tombale d'un agent, d'un congé ou d'une présence supprimé(e).
+
+    Args:
+        sender: La classe Employee, Leave ou Attendance.
+        instance: L'instance supprimée.
+        **kwargs: Arguments supplémentaires.
+    """
+    resource = {
+        Employee: DeletionLog.RESOURCE_EMPLOYEE,
+        Leave: DeletionLog.RESOURCE_LEAVE,
+        Attendance: DeletionLog.RESOURCE_ATTENDANCE,
+    }[sender]
+    log_deletion(resource, instance)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=Leave)
+@receiver(post_delete, sender=Leave)
+def invalidate_dashboard_stats_cache(sender, instance, **kwargs):
+    """Invalide les statistiques du tableau de bord après écriture ou suppression.
+
+    Les présences passent par invalidate_attendance_cache.
+
+    Args:
+        sender: La classe Employee ou Leave.
+        instance: L'instance sauvegardée ou supprimée.
+        **kwargs: Arguments supplémentaires.
+    """
+    invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_demographics_cache(sender, instance, **kwargs):
+    """Invalide la pyramide des âges et les départs à la retraite en cache.
+
+    Args:
+        sender: La classe Employee.
+        instance: L'agent sauvegardé ou supprimé.
+        **kwargs: Arguments supplémentaires.
+    """
+    invalidate_demographics()
+
+
+@receiver(post_save, sender=Employee)
+def revoke_badges_on_transfer(sender, instance, created, **kwargs):
+    """Révoque les badges d'un agent transféré ou devenu inactif.
+
+    Le badge signé porte l'entreprise de l'agent à l'émission : après un
+    changement d'entreprise il permettrait à l'ancienne entreprise de le
+    pointer, et un agent inactif ne doit plus pouvoir pointer. N'agit qu'au
+    changement (valeurs lues en base, voir Employee._loaded_badge_scope).
+
+    Args:
+        sender: La classe Employee.
+        instance (Employee): L'agent sauvegardé.
+        created (bool): True à la création (aucun badge à révoquer).
+        **kwargs: Arguments supplémentaires.
+    """
+    previous = instance._loaded_badge_scope
+    instance._loaded_badge_scope = (instance.department_id, instance.status)
+    if created or previous is None:
+        return
+    department_id, status = previous
+    transferred = instance.department_id != department_id
+    deactivated = instance.status == 'inactive' and status != 'inactive'
+    if not (transferred or deactivated):
+        return
+    serials = revoke_badges(employee=instance)
+    checkin_directory.invalidate()
+    if serials:
         logger.info(
-            "Alarme veille créée pour congé #%s (trigger: %s)",
-            instance.pk, trigger_eve,
+            "%s badge(s) révoqué(s) pour l'agent #%s (%s)",
+            len(serials), instance.pk, 'transfert' if transferred else 'désactivation',
         )
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def invalidate_holiday_calendar(sender, instance, **kwargs):
+    """Recharge le calendrier des jours ouvrés après modification d'un jour férié.
+
+    Args:
+        sender: La classe PublicHoliday.
+        instance (PublicHoliday): L'instance sauvegardée ou supprimée.
+        **kwargs: Arguments supplémentaires.
+    """
+    holiday_calendar.invalidate()
+
+
+def bulk_create_leave_notifications(leaves):
+    """Crée en une requête les alarmes J-7 et veille d'un lot de congés approuvés.
+
+    Utilisé par le signal d'approbation et par les traitements en masse, qui
+    mettent à jour le statut par QuerySet.update() (sans signal post_save) et
+    doivent l'appeler eux-mêmes. Les alarmes existantes sont
+    ignorées grâce à la contrainte unique (leave, notification_type). Les
+    alarmes dues du lot, qui deviennent visibles avec l'approbation, sont
+    publiées aux flux temps réel et comptées comme non lues après COMMIT.
+
+    Args:
+        leaves (Iterable[Leave]): Congés approuvés (pk et start_date renseignés).
+
+    Returns:
+        int: Nombre d'alarmes envoyées à l'insertion.
+    """
+    notifications = []
+    for leave in leaves:
+        notifications.append(LeaveNotification(
+            leave_id=leave.pk,
+            notification_type=LeaveNotification.TYPE_7DAYS,
+            trigger_date=leave.start_date - timedelta(days=7),
+        ))
+        notifications.append(LeaveNotification(
+            leave_id=leave.pk,
+            notification_type=LeaveNotification.TYPE_EVE,
+            trigger_date=leave.start_date - timedelta(days=1),
+        ))
+    LeaveNotification.objects.bulk_create(notifications, ignore_conflicts=True)
+    if notifications:
+        # ignore_conflicts ne renseigne pas les pk : les alarmes sont relues après COMMIT
+        leave_ids = {notification.leave_id for notification in notifications}
+
+        def publish():
+            due = list(
+                LeaveNotification.objects
+                .filter(leave_id__in=leave_ids, trigger_date__lte=date.today())
+                .select_related('leave', 'leave__employee')
+            )
+            notification_broker.publish_notifications(due, deltas={n.pk: 1 for n in due if not n.is_read})
+        publish_on_commit(publish)
+    return len(notifications)
@@ -2,15 +2,19 @@
 Tests unitaires — API Gestion du Personnel Contractuel DAF-MEER
 Lancer avec : python manage.py test api
 """
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth.models import User
+from django.core.management.base import CommandError
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from datetime import date, timedelta, time
+from decimal import Decimal
 
 from .models import (
-    Department, Direction, Employee, Leave,
-    Attendance, PasswordRecord, ManagerProfile, CompanyProfile
+    Department, Direction, Employee, Leave, LeaveNotification,
+    Attendance, PasswordRecord, ManagerProfile, CompanyProfile, PublicHoliday,
+    LeaveAccrual, DeletionLog, Badge,
 )
 
 
@@ -47,6 +51,11 @@ def make_entreprise_user(username, dept, password='emp123'):
     return user
 
 
+def next_monday(day):
+    """Premier lundi à partir de `day` (inclus) : périodes de congé au décompte de jours ouvrés fixe"""
+    return day + timedelta(days=-day.weekday() % 7)
+
+
 def make_department(name='AZING'):
     return Department.objects.create(name=name, manager='Responsable', description='Entreprise test')
 
@@ -90,11 +99,12 @@ class TestEmployeeModel(TestCase):
         self.assertEqual(self.emp.leave_balance, 30)
 
     def test_leave_balance_decreases_after_approved_leave(self):
+        monday = next_monday(date(date.today().year, 6, 1))
         Leave.objects.create(
             employee=self.emp,
             leave_type='paid',
-            start_date=date.today(),
-            end_date=date.today() + timedelta(days=4),  # 5 jours
+            start_date=monday,
+            end_date=monday + timedelta(days=4),  # lundi → vendredi : 5 jours ouvrés
             reason='Vacances',
             status='approved',
         )
@@ -157,8 +167,8 @@ class TestLeaveModel(TestCase):
         leave = Leave.objects.create(
             employee=self.emp,
             leave_type='paid',
-            start_date=date(2026, 2, 10),
-            end_date=date(2026, 2, 14),
+            start_date=date(2026, 2, 9),
+            end_date=date(2026, 2, 13),  # lundi → vendredi
             reason='Repos',
         )
         self.assertEqual(leave.days_count, 5)
@@ -200,6 +210,25 @@ class TestAttendanceModel(TestCase):
         )
         self.assertEqual(att.hours_worked, 0)
 
+    def test_hours_worked_garde_de_nuit(self):
+        att = Attendance.objects.create(
+            employee=self.emp,
+            date=date.today(),
+            check_in=time(22, 0),
+            check_out=time(6, 30),
+            status='present',
+        )
+        self.assertEqual(att.hours_worked, 8.5)
+
+    def test_hours_worked_recalculé_après_modification(self):
+        att = Attendance.objects.create(
+            employee=self.emp, date=date.today(), check_in=time(8, 0), check_out=time(12, 0),
+        )
+        self.assertEqual(att.hours_worked, 4)
+        att.check_out = time(18, 15)
+        att.save()
+        self.assertEqual(att.hours_worked, 10.25)
+
 
 # ===========================
 # 2. Tests d'Authentification
@@ -574,17 +603,22 @@ class TestLeaveSerializerValidation(TestCase):
 
     def test_congé_payé_au_delà_du_solde_est_invalide(self):
         from .serializers import LeaveSerializer
-        # 35 jours demandés > 30 jours de solde
+        # 7 semaines : 35 jours ouvrés demandés > 30 jours de solde
+        monday = next_monday(date(date.today().year, 3, 1))
         data = {
             'employee': self.emp.id,
             'leave_type': 'paid',
-            'start_date': str(date.today() + timedelta(days=1)),
-            'end_date': str(date.today() + timedelta(days=35)),
+            'start_date': str(monday),
+            'end_date': str(monday + timedelta(days=48)),
             'reason': 'Trop long',
         }
         serializer = LeaveSerializer(data=data)
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('end_date', serializer.errors)
+        # Le solde est contrôlé à l'enregistrement, sous verrou de l'employé
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(ValidationError) as cm:
+            serializer.save()
+        self.assertIn('end_date', cm.exception.detail)
+        self.assertEqual(Leave.objects.count(), 0)
 
 
 class TestAttendanceSerializerValidation(TestCase):
@@ -619,6 +653,31 @@ class TestAttendanceSerializerValidation(TestCase):
         serializer = AttendanceSerializer(data=data)
         self.assertTrue(serializer.is_valid(), serializer.errors)
 
+    def test_garde_de_nuit_acceptée(self):
+        from .serializers import AttendanceSerializer
+        data = {
+            'employee': self.emp.id,
+            'date': str(date.today()),
+            'check_in': '22:00',
+            'check_out': '06:00',
+            'status': 'present',
+        }
+        serializer = AttendanceSerializer(data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_heures_identiques_invalides(self):
+        from .serializers import AttendanceSerializer
+        data = {
+            'employee': self.emp.id,
+            'date': str(date.today()),
+            'check_in': '08:00',
+            'check_out': '08:00',
+            'status': 'present',
+        }
+        serializer = AttendanceSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('check_out', serializer.errors)
+
 
 # ===========================
 # 7. Tests du Chiffrement
@@ -873,6 +932,30 @@ class TestAttendanceAccessByRole(APITestCase):
     def _ids(self, resp):
         return {r['id'] for r in resp.data}
 
+    def test_création_d_une_garde_de_nuit(self):
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.post(self.url, {
+            'employee': self.emp3.id,
+            'date': str(date.today()),
+            'check_in': '22:00',
+            'check_out': '06:30',
+            'status': 'present',
+        }, format='json')
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(resp.data['hours_worked'], 8.5)
+
+    def test_garde_de_nuit_trop_longue_refusée(self):
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.post(self.url, {
+            'employee': self.emp3.id,
+            'date': str(date.today()),
+            'check_in': '10:00',
+            'check_out': '08:00',
+            'status': 'present',
+        }, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('check_out', resp.data)
+
     def test_admin_voit_toutes_les_présences(self):
         self.client.force_authenticate(user=self.admin)
         resp = self.client.get(self.url)
@@ -921,6 +1004,8 @@ class TestDashboardStats(APITestCase):
     url = '/api/dashboard/stats/'
 
     def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
         self.dept1 = make_department('STAT-DEPT1')
         self.dept2 = make_department('STAT-DEPT2')
 
@@ -1029,3 +1114,2314 @@ class TestChangePasswordAPI(APITestCase):
             'new_password': 'nouveauMDP456',
         })
         self.assertEqual(resp.status_code, 401)
+
+
+# ===========================
+# 13. Tests de l'Import de Pointages
+# ===========================
+
+class TestAttendanceImport(APITestCase):
+    """Import CSV/XLSX : résolution des matricules, regroupement des badgeages, upsert"""
+
+    url = '/api/attendances/import/'
+
+    def setUp(self):
+        self.dept1 = make_department('IMP-DEPT1')
+        self.dept2 = make_department('IMP-DEPT2')
+        self.ent_user = make_entreprise_user('imp_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Imp', last_name='Un')
+        self.emp2 = make_employee(self.dept2, first_name='Imp', last_name='Deux')
+
+    def _upload(self, content, name='pointages.csv', user=None):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        self.client.force_authenticate(user=user or self.ent_user)
+        return self.client.post(
+            self.url, {'file': SimpleUploadedFile(name, content)}, format='multipart'
+        )
+
+    def test_badgeages_regroupés_en_une_présence(self):
+        content = (
+            "matricule;date;heure\n"
+            f"{self.emp1.matricule};02/03/2026;07:55\n"
+            f"{self.emp1.matricule};02/03/2026;17:05\n"
+            f"{self.emp1.matricule};02/03/2026;12:30\n"
+        ).encode()
+        resp = self._upload(content)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['created'], 1)
+        att = Attendance.objects.get(employee=self.emp1, date=date(2026, 3, 2))
+        self.assertEqual(att.check_in, time(7, 55))
+        self.assertEqual(att.check_out, time(17, 5))
+        self.assertEqual(att.status, 'present')
+
+    def test_garde_de_nuit_appariée_au_lendemain(self):
+        content = (
+            "matricule;date;heure\n"
+            f"{self.emp1.matricule};02/03/2026;22:00\n"
+            f"{self.emp1.matricule};03/03/2026;06:00\n"
+        ).encode()
+        resp = self._upload(content)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['records'], 1)
+        att = Attendance.objects.get(employee=self.emp1)
+        self.assertEqual(att.date, date(2026, 3, 2))
+        self.assertEqual((att.check_in, att.check_out), (time(22, 0), time(6, 0)))
+        self.assertEqual(att.hours_worked, 8)
+
+    def test_garde_de_nuit_sur_une_ligne(self):
+        content = f"matricule,date,arrivee,depart\n{self.emp1.matricule},2026-03-02,20:00,06:00\n".encode()
+        resp = self._upload(content)
+        self.assertEqual(resp.status_code, 200)
+        att = Attendance.objects.get(employee=self.emp1)
+        self.assertEqual((att.check_in, att.check_out), (time(20, 0), time(6, 0)))
+        self.assertEqual(att.hours_worked, 10)
+
+    def test_réimport_met_à_jour_sans_doublon(self):
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 3, 2), status='absent')
+        content = f"matricule,date,arrivee,depart\n{self.emp1.matricule},2026-03-02,08:00,16:00\n".encode()
+        resp = self._upload(content)
+        self.assertEqual(resp.data['updated'], 1)
+        self.assertEqual(Attendance.objects.filter(employee=self.emp1).count(), 1)
+        att = Attendance.objects.get(employee=self.emp1)
+        self.assertEqual(att.status, 'present')
+        self.assertEqual(att.check_out, time(16, 0))
+
+    def test_matricule_hors_périmètre_ignoré(self):
+        content = f"matricule,date,heure\n{self.emp2.matricule},2026-03-02,08:00\n".encode()
+        resp = self._upload(content)
+        self.assertEqual(resp.data['records'], 0)
+        self.assertEqual(resp.data['unknown_matricules'], [self.emp2.matricule])
+        self.assertFalse(Attendance.objects.filter(employee=self.emp2).exists())
+
+    def test_import_xlsx(self):
+        from io import BytesIO
+        from openpyxl import Workbook
+        wb = Workbook()
+        wb.active.append(['Matricule', 'Date', 'Heure'])
+        wb.active.append([self.emp1.matricule, date(2026, 3, 3), time(8, 10)])
+        buffer = BytesIO()
+        wb.save(buffer)
+        resp = self._upload(buffer.getvalue(), name='pointages.xlsx')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(Attendance.objects.filter(employee=self.emp1, date=date(2026, 3, 3)).exists())
+
+    def test_colonne_obligatoire_manquante_retourne_400(self):
+        resp = self._upload(b"nom,heure\nX,08:00\n")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_csv_windows_1252_accepté(self):
+        content = (
+            "matricule;date;heure;notes\n"
+            f"{self.emp1.matricule};02/03/2026;08:00;Arrivée tardive\n"
+        ).encode('cp1252')
+        resp = self._upload(content)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Attendance.objects.get(employee=self.emp1).notes, 'Arrivée tardive')
+
+    def test_xlsx_corrompu_retourne_400(self):
+        resp = self._upload(b"ceci n'est pas un classeur", name='pointages.xlsx')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('error', resp.data)
+
+    def test_employé_ne_peut_pas_importer(self):
+        resp = self._upload(b"matricule,date,heure\n", user=make_regular_user('imp_emp'))
+        self.assertEqual(resp.status_code, 403)
+
+
+# ===========================
+# 14. Tests du Pointage Groupé
+# ===========================
+
+class TestAttendanceBulkMark(APITestCase):
+    """bulk_mark : statut par défaut pour tout le périmètre + exceptions, sans doublon"""
+
+    url = '/api/attendances/bulk_mark/'
+
+    def setUp(self):
+        self.dept = make_department('BULK-DEPT')
+        direction = Direction.objects.create(name='BULK-DIR')
+        self.mgr_user = make_manager('bulk_mgr')
+        ManagerProfile.objects.create(user=self.mgr_user).directions.add(direction)
+
+        self.emp1 = make_employee(self.dept, direction='BULK-DIR', first_name='B1', last_name='Mark')
+        self.emp2 = make_employee(self.dept, direction='BULK-DIR', first_name='B2', last_name='Mark')
+        self.other = make_employee(self.dept, direction='AUTRE', first_name='B3', last_name='Mark')
+        self.day = date(2026, 3, 2)
+
+    def _mark(self, payload, user=None):
+        self.client.force_authenticate(user=user or self.mgr_user)
+        return self.client.post(self.url, payload, format='json')
+
+    def test_statut_par_défaut_appliqué_au_périmètre(self):
+        resp = self._mark({'date': '2026-03-02', 'status': 'present', 'check_in': '08:00'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['marked'], 2)
+        self.assertEqual(Attendance.objects.filter(date=self.day, status='present').count(), 2)
+        self.assertFalse(Attendance.objects.filter(employee=self.other).exists())
+
+    def test_exceptions_et_mise_à_jour_sans_doublon(self):
+        Attendance.objects.create(employee=self.emp2, date=self.day, status='present')
+        resp = self._mark({
+            'date': '2026-03-02',
+            'status': 'present',
+            'exceptions': [
+                {'employee': self.emp2.id, 'status': 'absent'},
+                {'employee': self.other.id, 'status': 'late'},
+            ],
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['ignored_exceptions'], [self.other.id])
+        self.assertEqual(Attendance.objects.filter(employee=self.emp2).count(), 1)
+        self.assertEqual(Attendance.objects.get(employee=self.emp2).status, 'absent')
+
+    def test_re_pointage_met_à_jour_les_notes(self):
+        Attendance.objects.create(employee=self.emp1, date=self.day, status='present')
+        resp = self._mark({
+            'date': '2026-03-02',
+            'status': 'present',
+            'exceptions': [{'employee': self.emp1.id, 'status': 'late', 'notes': 'Retard bus'}],
+        })
+        self.assertEqual(resp.status_code, 200)
+        att = Attendance.objects.get(employee=self.emp1, date=self.day)
+        self.assertEqual(att.status, 'late')
+        self.assertEqual(att.notes, 'Retard bus')
+
+    def test_statut_invalide_retourne_400(self):
+        resp = self._mark({'date': '2026-03-02', 'status': 'inconnu'})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_employé_ne_peut_pas_pointer_en_masse(self):
+        resp = self._mark({'date': '2026-03-02', 'status': 'present'}, user=make_regular_user('bulk_emp'))
+        self.assertEqual(resp.status_code, 403)
+
+
+# ===========================
+# 15. Tests du Pointage Rapide
+# ===========================
+
+@override_settings(CHECKIN_FLUSH_INTERVAL=0)
+class TestCheckInFastPath(APITestCase):
+    """POST /api/checkin/ : validation en mémoire, upsert, première arrivée conservée"""
+
+    url = '/api/checkin/'
+
+    def setUp(self):
+        from .checkin import checkin_directory
+        checkin_directory.invalidate()
+        self.dept1 = make_department('CHK-DEPT1')
+        self.dept2 = make_department('CHK-DEPT2')
+        self.ent_user = make_entreprise_user('chk_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Chk', last_name='Un')
+        self.emp2 = make_employee(self.dept2, first_name='Chk', last_name='Deux')
+
+    def _check_in(self, employee_id, user=None):
+        self.client.force_authenticate(user=user or self.ent_user)
+        return self.client.post(self.url, {'employee': employee_id}, format='json')
+
+    def test_pointage_crée_la_présence_du_jour(self):
+        resp = self._check_in(self.emp1.id)
+        self.assertEqual(resp.status_code, 201)
+        att = Attendance.objects.get(employee=self.emp1)
+        self.assertEqual(att.date.isoformat(), resp.data['date'])
+        self.assertIsNotNone(att.check_in)
+
+    def test_second_pointage_conserve_la_première_arrivée(self):
+        from django.utils import timezone
+        today = timezone.localdate()
+        Attendance.objects.create(employee=self.emp1, date=today, check_in=time(0, 1), status='present')
+        resp = self._check_in(self.emp1.id)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data['check_in'], '00:01:00')
+        self.assertEqual(Attendance.objects.filter(employee=self.emp1).count(), 1)
+
+    def test_ligne_absente_reçoit_l_heure_d_arrivée(self):
+        from django.utils import timezone
+        Attendance.objects.create(employee=self.emp1, date=timezone.localdate(), status='absent')
+        self._check_in(self.emp1.id)
+        att = Attendance.objects.get(employee=self.emp1)
+        self.assertIsNotNone(att.check_in)
+        self.assertIn(att.status, ('present', 'late'))
+
+    def test_agent_hors_périmètre_refusé(self):
+        resp = self._check_in(self.emp2.id)
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(Attendance.objects.filter(employee=self.emp2).exists())
+
+    def test_identifiant_invalide_retourne_400(self):
+        resp = self._check_in('abc')
+        self.assertEqual(resp.status_code, 400)
+
+    @override_settings(CHECKIN_FLUSH_INTERVAL=0.3)
+    def test_échec_inattendu_du_flush_libère_tout_le_lot(self):
+        import threading
+        from unittest import mock
+        from django.db import DatabaseError
+        from .checkin import CheckInBuffer
+
+        buffer = CheckInBuffer()
+        outcomes = {}
+
+        def submit(employee_id):
+            try:
+                buffer.submit(employee_id, timeout=2)
+            except Exception as exc:
+                outcomes[employee_id] = exc
+
+        with mock.patch.object(CheckInBuffer, '_write', side_effect=RuntimeError('panne')):
+            threads = [threading.Thread(target=submit, args=(pk,)) for pk in (self.emp1.id, self.emp2.id)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(outcomes), 2)
+        for exc in outcomes.values():
+            self.assertIsInstance(exc, DatabaseError)
+
+
+# ===========================
+# 16. Tests des Badges de Pointage
+# ===========================
+
+@override_settings(CHECKIN_FLUSH_INTERVAL=0)
+class TestCheckInBadge(APITestCase):
+    """Badges signés : émission, pointage sans lecture en base, refus des jetons invalides"""
+
+    url = '/api/checkin/'
+
+    def setUp(self):
+        from .checkin import checkin_directory
+        from .badges import revocation_list
+        checkin_directory.invalidate()
+        revocation_list.invalidate()
+        self.admin = make_admin('badge_admin')
+        self.dept1 = make_department('BDG-DEPT1')
+        self.dept2 = make_department('BDG-DEPT2')
+        self.ent_user = make_entreprise_user('badge_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Bdg', last_name='Un')
+        self.emp2 = make_employee(self.dept2, first_name='Bdg', last_name='Deux')
+
+    def _issue(self, employee):
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.post(f'/api/employees/{employee.id}/badge/')
+        self.assertEqual(resp.status_code, 201)
+        return resp.data['token']
+
+    def _check_in(self, token, user=None):
+        self.client.force_authenticate(user=user or self.ent_user)
+        return self.client.post(self.url, {'badge': token}, format='json')
+
+    def test_pointage_par_badge(self):
+        token = self._issue(self.emp1)
+        resp = self._check_in(token)
+        self.assertEqual(resp.status_code, 201)
+        self.assertTrue(Attendance.objects.filter(employee=self.emp1).exists())
+
+    def test_badge_falsifié_refusé(self):
+        token = self._issue(self.emp1)
+        payload, signature = token.split(':')
+        forged = payload.replace(f'{self.emp1.id}.', f'{self.emp2.id}.', 1) + ':' + signature
+        self.assertEqual(self._check_in(forged, user=self.admin).status_code, 403)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_badge_expiré_refusé(self):
+        from unittest import mock
+        from django.utils import timezone
+        from .badges import issue_badge
+        token, badge = issue_badge(self.emp1, validity_days=1)
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch('api.badges.timezone.now', return_value=later):
+            self.assertEqual(self._check_in(token).status_code, 403)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_badge_révoqué_refusé(self):
+        token = self._issue(self.emp1)
+        resp = self.client.post(f'/api/employees/{self.emp1.id}/revoke_badge/')
+        self.assertEqual(len(resp.data['revoked']), 1)
+        self.assertEqual(self._check_in(token).status_code, 403)
+
+    def test_badge_d_une_autre_entreprise_refusé(self):
+        token = self._issue(self.emp2)
+        self.assertEqual(self._check_in(token).status_code, 403)
+
+    def test_transfert_révoque_les_badges(self):
+        token = self._issue(self.emp1)
+        employee = Employee.objects.get(pk=self.emp1.pk)
+        employee.department = self.dept2
+        employee.save()
+        self.assertIsNotNone(Badge.objects.get(employee=self.emp1).revoked_at)
+        self.assertEqual(self._check_in(token).status_code, 403)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_désactivation_révoque_les_badges(self):
+        token = self._issue(self.emp1)
+        employee = Employee.objects.get(pk=self.emp1.pk)
+        employee.status = 'inactive'
+        employee.save()
+        self.assertIsNotNone(Badge.objects.get(employee=self.emp1).revoked_at)
+        self.assertEqual(self._check_in(token, user=self.admin).status_code, 403)
+
+    def test_badge_non_révoqué_contrôlé_contre_l_annuaire(self):
+        from .checkin import checkin_directory
+        transferred = self._issue(self.emp1)
+        inactive_emp = make_employee(self.dept1, first_name='Bdg', last_name='Trois')
+        inactive = self._issue(inactive_emp)
+        # update() contourne les signaux : aucun badge n'est révoqué
+        Employee.objects.filter(pk=self.emp1.pk).update(department=self.dept2)
+        Employee.objects.filter(pk=inactive_emp.pk).update(status='inactive')
+        checkin_directory.invalidate()
+        self.assertEqual(self._check_in(transferred).status_code, 403)
+        self.assertEqual(self._check_in(transferred, user=self.admin).status_code, 403)
+        self.assertEqual(self._check_in(inactive, user=self.admin).status_code, 403)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_employé_ne_peut_pas_émettre_de_badge(self):
+        self.client.force_authenticate(user=make_regular_user('badge_emp'))
+        resp = self.client.post(f'/api/employees/{self.emp1.id}/badge/')
+        self.assertEqual(resp.status_code, 403)
+
+    def test_aucune_lecture_en_base_avant_l_écriture(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        token = self._issue(self.emp1)
+        self._check_in(token)  # réchauffe l'annuaire et la liste de révocation
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._check_in(token)
+        self.assertEqual(resp.status_code, 201)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertEqual(selects, [])
+
+
+# ===========================
+# 17. Tests des Présences du Jour et de l'Historique
+# ===========================
+
+@override_settings(CHECKIN_FLUSH_INTERVAL=0)
+class TestAttendanceTodayAndHistory(APITestCase):
+    """attendances/today (périmètre, cache, invalidation) et by_employee (bornes, pagination)"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.utils import timezone
+        from .checkin import checkin_directory
+        cache.clear()
+        checkin_directory.invalidate()
+        self.today = timezone.localdate()
+        self.dept1 = make_department('TDY-DEPT1')
+        self.dept2 = make_department('TDY-DEPT2')
+        self.ent_user = make_entreprise_user('tdy_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Tdy', last_name='Un')
+        self.emp2 = make_employee(self.dept2, first_name='Tdy', last_name='Deux')
+        self.emp3 = make_employee(self.dept1, first_name='Tdy', last_name='Trois')
+        Attendance.objects.create(employee=self.emp1, date=self.today, status='present')
+        Attendance.objects.create(employee=self.emp2, date=self.today, status='present')
+        self.client.force_authenticate(user=self.ent_user)
+
+    def _today_ids(self):
+        resp = self.client.get('/api/attendances/today/')
+        self.assertEqual(resp.status_code, 200)
+        return {row['employee'] for row in resp.data}
+
+    def test_today_limité_au_périmètre(self):
+        self.assertEqual(self._today_ids(), {self.emp1.id})
+
+    def test_today_servi_depuis_le_cache(self):
+        self._today_ids()
+        # update() n'émet pas de signal : la réponse en cache est conservée
+        Attendance.objects.filter(employee=self.emp1).update(status='late')
+        resp = self.client.get('/api/attendances/today/')
+        self.assertEqual(resp.data[0]['status'], 'present')
+
+    def test_today_invalidé_par_une_écriture(self):
+        self._today_ids()
+        Attendance.objects.create(employee=self.emp3, date=self.today, status='late')
+        self.assertEqual(self._today_ids(), {self.emp1.id, self.emp3.id})
+
+    def test_today_invalidé_par_le_pointage_rapide(self):
+        self._today_ids()
+        resp = self.client.post('/api/checkin/', {'employee': self.emp3.id}, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertIn(self.emp3.id, self._today_ids())
+
+    def test_by_employee_bornes_et_pagination(self):
+        for day in range(1, 6):
+            Attendance.objects.create(employee=self.emp3, date=date(2026, 3, day), status='present')
+        resp = self.client.get('/api/attendances/by_employee/', {
+            'employee_id': self.emp3.id, 'date_from': '2026-03-02', 'date_to': '2026-03-05',
+            'page_size': 3,
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['count'], 4)
+        self.assertEqual([r['date'] for r in resp.data['results']], ['2026-03-05', '2026-03-04', '2026-03-03'])
+        self.assertIsNotNone(resp.data['next'])
+
+    def test_by_employee_hors_périmètre_vide(self):
+        resp = self.client.get('/api/attendances/by_employee/', {'employee_id': self.emp2.id})
+        self.assertEqual(resp.data['count'], 0)
+
+    def test_by_employee_date_invalide_retourne_400(self):
+        resp = self.client.get('/api/attendances/by_employee/', {'employee_id': self.emp1.id, 'date_from': 'hier'})
+        self.assertEqual(resp.status_code, 400)
+
+
+# ===========================
+# 18. Tests du Récapitulatif des Heures
+# ===========================
+
+class TestAttendanceHoursSummary(APITestCase):
+    """attendances/hours_summary : Sum('hours_worked') par employé, dans le périmètre"""
+
+    url = '/api/attendances/hours_summary/'
+
+    def setUp(self):
+        self.dept1 = make_department('HRS-DEPT1')
+        self.dept2 = make_department('HRS-DEPT2')
+        self.ent_user = make_entreprise_user('hrs_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Hrs', last_name='Un')
+        self.emp2 = make_employee(self.dept2, first_name='Hrs', last_name='Deux')
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 3, 2), check_in=time(8), check_out=time(17))
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 3, 3), check_in=time(20), check_out=time(4))
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 3, 4), status='absent')
+        Attendance.objects.create(employee=self.emp2, date=date(2026, 3, 2), check_in=time(8), check_out=time(12))
+        self.client.force_authenticate(user=self.ent_user)
+
+    def test_totaux_par_employé(self):
+        resp = self.client.get(self.url, {'date_from': '2026-03-01', 'date_to': '2026-03-31'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['employees'], [{
+            'employee': self.emp1.id, 'employee_name': 'Hrs Un', 'days_worked': 2, 'hours': 17.0,
+        }])
+        self.assertEqual(resp.data['total_hours'], 17.0)
+
+    def test_bornes_de_dates(self):
+        resp = self.client.get(self.url, {'date_from': '2026-03-03', 'date_to': '2026-03-03'})
+        self.assertEqual(resp.data['employees'][0]['hours'], 8.0)
+
+    def test_date_invalide_retourne_400(self):
+        resp = self.client.get(self.url, {'date_from': '03/2026'})
+        self.assertEqual(resp.status_code, 400)
+
+
+# ===========================
+# 19. Tests du Partitionnement des Présences
+# ===========================
+
+class TestAttendancePartitions(TestCase):
+    """Partitions mensuelles : création, déplacement depuis la partition par défaut, élagage, détachement"""
+
+    def setUp(self):
+        from django.db import connection
+        self.cursor = connection.cursor()
+        self.emp = make_employee(make_department('PART-DEPT'))
+
+    def tearDown(self):
+        self.cursor.close()
+
+    def _partition_of(self, att):
+        self.cursor.execute('SELECT tableoid::regclass::text FROM api_attendance WHERE id = %s', [att.id])
+        return self.cursor.fetchone()[0]
+
+    def test_création_déplace_les_lignes_de_la_partition_par_défaut(self):
+        from .partitions import create_month_partition
+        att = Attendance.objects.create(employee=self.emp, date=date(2019, 1, 15), status='present')
+        self.assertEqual(self._partition_of(att), 'api_attendance_default')
+        self.assertTrue(create_month_partition(self.cursor, date(2019, 1, 1)))
+        self.assertEqual(self._partition_of(att), 'api_attendance_y2019m01')
+        self.assertFalse(create_month_partition(self.cursor, date(2019, 1, 1)))
+
+    def test_ensure_partitions_anticipe_les_mois_suivants(self):
+        from .partitions import ensure_partitions, list_partitions
+        created = ensure_partitions(self.cursor, months_ahead=14, today=date(2031, 11, 3))
+        self.assertEqual(created[0], 'api_attendance_y2031m11')
+        self.assertEqual(created[-1], 'api_attendance_y2033m01')
+        self.assertEqual(ensure_partitions(self.cursor, months_ahead=14, today=date(2031, 11, 3)), [])
+        self.assertIn((date(2032, 6, 1), 'api_attendance_y2032m06'), list_partitions(self.cursor))
+
+    def test_requête_datée_élague_les_partitions(self):
+        from .partitions import create_month_partition
+        create_month_partition(self.cursor, date(2019, 2, 1))
+        plan = Attendance.objects.filter(date=date(2019, 2, 10)).explain()
+        self.assertIn('api_attendance_y2019m02', plan)
+        self.assertNotIn('api_attendance_default', plan)
+
+    def test_détachement_pour_archivage(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from .partitions import create_month_partition
+        create_month_partition(self.cursor, date(2018, 6, 1))
+        Attendance.objects.create(employee=self.emp, date=date(2018, 6, 4), status='present')
+        call_command('detach_attendance_partitions', before='2018-07', stdout=StringIO())
+        self.assertFalse(Attendance.objects.filter(date=date(2018, 6, 4)).exists())
+        self.cursor.execute('SELECT COUNT(*) FROM api_attendance_y2018m06')
+        self.assertEqual(self.cursor.fetchone()[0], 1)
+
+
+# ===========================
+# 20. Tests de l'Enregistrement des Absences
+# ===========================
+
+class TestMarkAbsentees(TestCase):
+    """mark_absentees : INSERT … SELECT des absents, congés approuvés exclus, idempotent"""
+
+    day = date(2026, 3, 3)  # mardi
+
+    def setUp(self):
+        self.dept = make_department('ABS-DEPT')
+        self.present = make_employee(self.dept, first_name='Abs', last_name='Present')
+        self.missing = make_employee(self.dept, first_name='Abs', last_name='Manquant')
+        self.on_leave = make_employee(self.dept, first_name='Abs', last_name='Conge')
+        self.pending_leave = make_employee(self.dept, first_name='Abs', last_name='Attente')
+        self.inactive = make_employee(self.dept, first_name='Abs', last_name='Inactif')
+        Employee.objects.filter(pk=self.inactive.pk).update(status='inactive')
+        Attendance.objects.create(employee=self.present, date=self.day, status='present')
+        for emp, leave_status in ((self.on_leave, 'approved'), (self.pending_leave, 'pending')):
+            Leave.objects.create(
+                employee=emp, leave_type='paid', reason='Congé', status=leave_status,
+                start_date=self.day - timedelta(days=1), end_date=self.day + timedelta(days=1),
+            )
+
+    def test_seuls_les_agents_sans_pointage_ni_congé_sont_absents(self):
+        from .attendance_bulk import mark_absentees
+        self.assertEqual(mark_absentees(self.day), 2)
+        absent = set(Attendance.objects.filter(date=self.day, status='absent').values_list('employee_id', flat=True))
+        self.assertEqual(absent, {self.missing.id, self.pending_leave.id})
+        self.assertEqual(Attendance.objects.get(employee=self.present).status, 'present')
+
+    def test_idempotent(self):
+        from .attendance_bulk import mark_absentees
+        mark_absentees(self.day)
+        self.assertEqual(mark_absentees(self.day), 0)
+        self.assertEqual(Attendance.objects.filter(date=self.day).count(), 3)
+
+    def test_agent_embauché_après_la_date_ignoré(self):
+        from .attendance_bulk import mark_absentees
+        Employee.objects.filter(pk=self.missing.pk).update(hire_date=self.day + timedelta(days=1))
+        mark_absentees(self.day)
+        self.assertFalse(Attendance.objects.filter(employee=self.missing).exists())
+
+    def test_commande_ignore_le_week_end(self):
+        from django.core.management import call_command
+        from io import StringIO
+        call_command('mark_absentees', date='2026-03-07', stdout=StringIO())
+        self.assertFalse(Attendance.objects.filter(date=date(2026, 3, 7)).exists())
+        call_command('mark_absentees', date='2026-03-07', include_weekends=True, stdout=StringIO())
+        self.assertEqual(Attendance.objects.filter(date=date(2026, 3, 7), status='absent').count(), 4)
+
+
+# ===========================
+# 21. Tests du Calendrier Mensuel des Présences
+# ===========================
+
+class TestAttendanceCalendar(APITestCase):
+    """attendances/calendar : matrice employé × jour encodée en chaînes, une requête"""
+
+    url = '/api/attendances/calendar/'
+
+    def setUp(self):
+        self.dept1 = make_department('CAL-DEPT1')
+        self.dept2 = make_department('CAL-DEPT2')
+        self.ent_user = make_entreprise_user('cal_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Cal', last_name='Un')
+        self.emp2 = make_employee(self.dept2, first_name='Cal', last_name='Deux')
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 2, 2), status='present')
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 2, 3), status='late')
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 2, 28), status='absent')
+        Attendance.objects.create(employee=self.emp1, date=date(2026, 3, 1), status='present')
+
+    def test_matrice_du_périmètre(self):
+        self.client.force_authenticate(user=self.ent_user)
+        resp = self.client.get(self.url, {'month': '2026-02'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['days'], 28)
+        self.assertEqual(resp.data['employees'], [
+            [self.emp1.id, 'Cal Un', '-PR' + '-' * 24 + 'A'],
+        ])
+        self.assertEqual(resp.data['legend']['R'], 'late')
+
+    def test_mois_invalide_retourne_400(self):
+        self.client.force_authenticate(user=self.ent_user)
+        self.assertEqual(self.client.get(self.url, {'month': '02/2026'}).status_code, 400)
+
+    def test_1500_agents_une_requête_et_charge_utile_compacte(self):
+        Employee.objects.bulk_create([
+            Employee(
+                first_name=f'Agent{i:04d}', last_name='Gardiennage', email=f'cal{i}@test.com',
+                phone='0102030405', department=self.dept2, position='Agent',
+                hire_date=date(2020, 1, 1), salary=100000, matricule=f'CAL{i:05d}',
+                cnps=f'CALCNPS{i:05d}', address='Abidjan',
+            )
+            for i in range(1500)
+        ])
+        ids = list(Employee.objects.filter(department=self.dept2).values_list('id', flat=True))
+        Attendance.objects.bulk_create([
+            Attendance(employee_id=emp_id, date=date(2026, 3, day), status='present')
+            for emp_id in ids for day in range(2, 32) if date(2026, 3, day).weekday() < 5
+        ])
+        self.client.force_authenticate(user=make_admin('cal_admin'))
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.url, {'month': '2026-03'})
+        self.assertEqual(len(resp.data['employees']), 1502)
+        self.assertLess(len(resp.content), 200 * 1024)
+
+
+# ===========================
+# 22. Tests du Non-Chevauchement des Congés
+# ===========================
+
+class TestLeaveOverlap(APITestCase):
+    """Contrainte d'exclusion leave_no_overlap et erreur API sur end_date"""
+
+    url = '/api/leaves/'
+
+    def setUp(self):
+        self.admin = make_admin('ovl_admin')
+        self.dept = make_department('OVL-DEPT')
+        self.emp = make_employee(self.dept, first_name='Ovl', last_name='Un')
+        self.other = make_employee(self.dept, first_name='Ovl', last_name='Deux')
+        self.leave = Leave.objects.create(
+            employee=self.emp, leave_type='sick', reason='Maladie',
+            start_date=date(2026, 5, 4), end_date=date(2026, 5, 8),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def _post(self, employee, start, end):
+        return self.client.post(self.url, {
+            'employee': employee.id, 'leave_type': 'sick', 'reason': 'Maladie',
+            'start_date': start, 'end_date': end,
+        }, format='json')
+
+    def test_chevauchement_refusé_sur_end_date(self):
+        resp = self._post(self.emp, '2026-05-08', '2026-05-12')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('end_date', resp.data)
+        self.assertEqual(Leave.objects.filter(employee=self.emp).count(), 1)
+
+    def test_périodes_contiguës_et_autre_employé_acceptés(self):
+        self.assertEqual(self._post(self.emp, '2026-05-09', '2026-05-10').status_code, 201)
+        self.assertEqual(self._post(self.other, '2026-05-04', '2026-05-08').status_code, 201)
+
+    def test_congé_rejeté_ne_bloque_pas(self):
+        Leave.objects.filter(pk=self.leave.pk).update(status='rejected')
+        self.assertEqual(self._post(self.emp, '2026-05-05', '2026-05-06').status_code, 201)
+
+    def test_modification_vers_un_chevauchement_refusée(self):
+        later = Leave.objects.create(
+            employee=self.emp, leave_type='sick', reason='Maladie',
+            start_date=date(2026, 6, 1), end_date=date(2026, 6, 2),
+        )
+        resp = self.client.patch(f'{self.url}{later.id}/', {'start_date': '2026-05-07'}, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('end_date', resp.data)
+
+    def test_contrainte_appliquée_par_la_base(self):
+        from django.db import IntegrityError, transaction
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Leave.objects.create(
+                employee=self.emp, leave_type='paid', reason='Vacances',
+                start_date=date(2026, 5, 1), end_date=date(2026, 5, 4),
+            )
+
+
+# ===========================
+# 23. Tests de l'Occupation des Congés
+# ===========================
+
+class TestLeaveOccupancy(APITestCase):
+    """leaves/occupancy : comptes et agents par jour et par groupe, seuils de capacité"""
+
+    url = '/api/leaves/occupancy/'
+
+    def setUp(self):
+        Direction.objects.create(name='OCC-DIR', max_concurrent_leaves=1)
+        self.dept1 = make_department('OCC-DEPT1')
+        self.dept2 = make_department('OCC-DEPT2')
+        self.ent_user = make_entreprise_user('occ_ent', self.dept1)
+        self.emp1 = make_employee(self.dept1, first_name='Occ', last_name='Un', direction='OCC-DIR')
+        self.emp2 = make_employee(self.dept1, first_name='Occ', last_name='Deux', direction='OCC-DIR')
+        self.emp3 = make_employee(self.dept2, first_name='Occ', last_name='Trois', direction='OCC-DIR')
+        for emp, start, end, leave_status in (
+            (self.emp1, date(2026, 7, 1), date(2026, 7, 3), 'approved'),
+            (self.emp2, date(2026, 7, 3), date(2026, 7, 4), 'approved'),
+            (self.emp3, date(2026, 7, 1), date(2026, 7, 4), 'approved'),
+            (self.emp1, date(2026, 7, 5), date(2026, 7, 5), 'pending'),
+        ):
+            Leave.objects.create(employee=emp, leave_type='sick', reason='Test',
+                                 start_date=start, end_date=end, status=leave_status)
+        self.client.force_authenticate(user=self.ent_user)
+
+    def _get(self, **params):
+        return self.client.get(self.url, {'from': '2026-07-01', 'to': '2026-07-05', **params})
+
+    def test_comptes_par_jour_dans_le_périmètre(self):
+        resp = self._get()
+        self.assertEqual(resp.status_code, 200)
+        days = {str(d['date']): d for d in resp.data['days']}
+        self.assertEqual(len(days), 5)
+        self.assertEqual(days['2026-07-01']['total'], 1)
+        group = days['2026-07-03']['groups'][0]
+        self.assertEqual((group['key'], group['count']), ('OCC-DIR', 2))
+        self.assertEqual(group['employees'], sorted([self.emp1.id, self.emp2.id]))
+        self.assertTrue(group['overloaded'])
+        self.assertFalse(days['2026-07-01']['groups'][0]['overloaded'])
+        self.assertEqual(days['2026-07-05']['total'], 0)
+
+    def test_demandes_en_cours_et_regroupement_par_entreprise(self):
+        resp = self._get(include_pending='1', group_by='department', capacity='5')
+        days = {str(d['date']): d for d in resp.data['days']}
+        self.assertEqual(days['2026-07-05']['groups'][0]['label'], 'OCC-DEPT1')
+        self.assertEqual(days['2026-07-05']['groups'][0]['capacity'], 5)
+
+    def test_une_seule_requête(self):
+        self.client.force_authenticate(user=make_admin('occ_admin'))
+        with self.assertNumQueries(1):
+            resp = self._get()
+        days = {str(d['date']): d for d in resp.data['days']}
+        self.assertEqual(days['2026-07-04']['total'], 2)
+
+    def test_manager_sans_direction_périmètre_vide(self):
+        self.client.force_authenticate(user=make_manager('occ_mgr_vide'))
+        resp = self._get()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data['days']), 5)
+        self.assertTrue(all(d['total'] == 0 and d['groups'] == [] for d in resp.data['days']))
+
+    def test_paramètres_invalides(self):
+        self.assertEqual(self._get(group_by='poste').status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'from': '2026-07-05', 'to': '2026-07-01'}).status_code, 400)
+
+
+# ===========================
+# 24. Tests du Traitement Groupé des Congés
+# ===========================
+
+class TestLeaveBulkActions(APITestCase):
+    """leaves/bulk_approve et bulk_reject : règles par rôle, résultats par identifiant"""
+
+    def setUp(self):
+        self.dept = make_department('BLK-DEPT')
+        self.other_dept = make_department('BLK-OTHER')
+        self.admin = make_admin('blk_admin')
+        self.mgr_user = make_manager('blk_mgr')
+        direction = Direction.objects.create(name='BLK-DIR')
+        ManagerProfile.objects.create(user=self.mgr_user).directions.add(direction)
+        self.ent_user = make_entreprise_user('blk_ent', self.dept)
+        self.leaves = []
+        for i in range(3):
+            emp = make_employee(self.dept, first_name=f'Bk{i}', last_name='Agent', direction='BLK-DIR')
+            self.leaves.append(Leave.objects.create(
+                employee=emp, leave_type='sick', reason='Test', status='pending',
+                start_date=date.today() + timedelta(days=20), end_date=date.today() + timedelta(days=21),
+            ))
+        outsider = make_employee(self.other_dept, first_name='Bkx', last_name='Dehors')
+        self.outside_leave = Leave.objects.create(
+            employee=outsider, leave_type='sick', reason='Test', status='pending',
+            start_date=date.today() + timedelta(days=20), end_date=date.today() + timedelta(days=21),
+        )
+
+    def _post(self, user, action, ids):
+        self.client.force_authenticate(user=user)
+        return self.client.post(f'/api/leaves/{action}/', {'ids': ids}, format='json')
+
+    def test_manager_valide_puis_entreprise_approuve(self):
+        ids = [leave.id for leave in self.leaves]
+        resp = self._post(self.mgr_user, 'bulk_approve', ids)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['updated'], 3)
+        self.assertEqual(Leave.objects.filter(id__in=ids, status='manager_approved').count(), 3)
+
+        resp = self._post(self.ent_user, 'bulk_approve', ids + [self.outside_leave.id])
+        self.assertEqual(resp.data['updated'], 3)
+        self.assertEqual(resp.data['results'][-1]['outcome'], 'not_found')
+        self.assertEqual(Leave.objects.filter(id__in=ids, status='approved', approved_by=self.ent_user).count(), 3)
+        self.assertEqual(LeaveNotification.objects.filter(leave_id__in=ids).count(), 6)
+
+    def test_entreprise_ne_peut_pas_court_circuiter_le_manager(self):
+        resp = self._post(self.ent_user, 'bulk_approve', [self.leaves[0].id])
+        self.assertEqual(resp.data['updated'], 0)
+        self.assertEqual(resp.data['results'][0]['outcome'], 'invalid_status')
+        self.assertEqual(Leave.objects.get(pk=self.leaves[0].pk).status, 'pending')
+
+    def test_admin_approuve_en_une_requête_de_mise_à_jour(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        ids = [leave.id for leave in self.leaves]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._post(self.admin, 'bulk_approve', ids)
+        self.assertEqual(resp.data['updated'], 3)
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "api_leave"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(len(ctx.captured_queries), 5)  # SAVEPOINT, SELECT FOR UPDATE, UPDATE, INSERT, RELEASE
+        leave = Leave.objects.get(pk=ids[0])
+        self.assertEqual((leave.approved_by, leave.manager_approved_by), (self.admin, self.admin))
+
+    def test_rejet_groupé_et_congé_déjà_traité(self):
+        Leave.objects.filter(pk=self.leaves[0].pk).update(status='approved')
+        resp = self._post(self.mgr_user, 'bulk_reject', [leave.id for leave in self.leaves])
+        outcomes = [r['outcome'] for r in resp.data['results']]
+        self.assertEqual(outcomes, ['invalid_status', 'updated', 'updated'])
+        self.assertEqual(Leave.objects.filter(status='rejected').count(), 2)
+
+    def test_employé_refusé_et_payload_invalide(self):
+        self.assertEqual(self._post(make_regular_user('blk_emp'), 'bulk_approve', [1]).status_code, 403)
+        self.assertEqual(self._post(self.admin, 'bulk_approve', []).status_code, 400)
+
+
+# ===========================
+# 25. Tests du Contrôle de Solde des Congés Payés
+# ===========================
+
+class TestPaidLeaveBalanceCheck(APITestCase):
+    """Solde de congés payés (jours ouvrés) : une requête, sous verrou de l'employé"""
+
+    def setUp(self):
+        self.admin = make_admin('bal_admin')
+        self.dept = make_department('BAL-DEPT')
+        self.emp = make_employee(self.dept, first_name='Solde', last_name='Agent')
+        self.client.force_authenticate(user=self.admin)
+        # Lundi : les décalages multiples de 7 jours restent des lundis
+        self.start = next_monday(date(date.today().year, 11, 2))
+
+    def _leave(self, offset, days, status_='pending', leave_type='paid'):
+        start = self.start - timedelta(days=offset)
+        return Leave.objects.create(
+            employee=self.emp, leave_type=leave_type, reason='Test', status=status_,
+            start_date=start, end_date=start + timedelta(days=days - 1),
+        )
+
+    def _payload(self, start, days):
+        return {
+            'employee': self.emp.id, 'leave_type': 'paid', 'reason': 'Vacances',
+            'start_date': str(start), 'end_date': str(start + timedelta(days=days - 1)),
+        }
+
+    def test_usage_agrégé_en_une_requête(self):
+        from .working_days import holiday_calendar
+        self._leave(63, 12, 'approved')           # 2 semaines : 10 jours ouvrés
+        self._leave(42, 7, 'manager_approved')    # lundi → dimanche : 5
+        self._leave(28, 3, 'pending')             # lundi → mercredi : 3
+        self._leave(21, 5, 'rejected')
+        self._leave(14, 5, 'approved', leave_type='sick')
+        holiday_calendar.get()
+        with self.assertNumQueries(1):
+            usage = self.emp.paid_leave_usage()
+        self.assertEqual(usage, {'taken': 10, 'pending': 8})
+        self.assertEqual(self.emp.leave_balance, 30 - usage['taken'])
+        self.assertEqual(self.emp.leaves_pending_this_year, usage['pending'])
+
+    def test_création_refusée_au_delà_du_solde_effectif(self):
+        self._leave(63, 26, 'approved')   # 20 jours ouvrés
+        self._leave(28, 5, 'pending')     # 5 jours ouvrés → reste 5
+        resp = self.client.post('/api/leaves/', self._payload(self.start, 8), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('end_date', resp.data)
+        # Lundi → dimanche : le week-end n'est pas décompté
+        resp = self.client.post('/api/leaves/', self._payload(self.start, 7), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_modification_ne_compte_pas_la_demande_elle_même(self):
+        leave = self._leave(0, 26)   # 20 jours ouvrés
+        resp = self.client.patch(
+            f'/api/leaves/{leave.id}/', {'end_date': str(self.start + timedelta(days=32))}, format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)   # 25 jours ouvrés
+        resp = self.client.patch(
+            f'/api/leaves/{leave.id}/', {'end_date': str(self.start + timedelta(days=43))}, format='json',
+        )   # 32 jours ouvrés
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_contrôle_fait_sous_verrou_de_l_employé(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .serializers import LeaveSerializer
+        from .working_days import holiday_calendar
+        serializer = LeaveSerializer(data=self._payload(self.start, 3))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        holiday_calendar.get()
+        with CaptureQueriesContext(connection) as ctx:
+            serializer.save()
+        sqls = [q['sql'] for q in ctx.captured_queries]
+        lock = next(i for i, sql in enumerate(sqls) if 'FOR UPDATE' in sql)
+        self.assertIn('"api_employee"', sqls[lock])
+        self.assertIn('FROM "api_leave"', sqls[lock + 1])
+        self.assertIn('FROM "api_leaveaccrual"', sqls[lock + 2])
+        self.assertTrue(sqls[lock + 3].startswith('INSERT INTO "api_leave"'))
+
+
+# ===========================
+# 26. Tests du Décompte en Jours Ouvrés
+# ===========================
+
+class TestWorkingDays(APITestCase):
+    """Congés décomptés en jours ouvrés : week-ends et jours fériés exclus"""
+
+    def setUp(self):
+        from .working_days import holiday_calendar
+        # Les jours fériés créés par un test sont annulés par le rollback, pas par un signal
+        self.addCleanup(holiday_calendar.invalidate)
+        self.dept = make_department('WD-DEPT')
+        self.emp = make_employee(self.dept, first_name='Ouvre', last_name='Agent')
+
+    def test_décompte_vectorisé_des_périodes(self):
+        from .working_days import count_working_days
+        counts = count_working_days(
+            [date(2026, 2, 9), date(2026, 2, 14), date(2026, 2, 13), date(2026, 2, 13)],
+            [date(2026, 2, 13), date(2026, 2, 15), date(2026, 2, 16), date(2026, 2, 12)],
+        )
+        self.assertEqual(counts.tolist(), [5, 0, 2, 0])
+
+    def test_jour_férié_exclu_après_création(self):
+        leave = Leave.objects.create(
+            employee=self.emp, leave_type='paid', reason='Pâques', status='approved',
+            start_date=date(2026, 4, 6), end_date=date(2026, 4, 10),
+        )
+        self.assertEqual(leave.days_count, 5)
+        PublicHoliday.objects.create(date=date(2026, 4, 6), name='Lundi de Pâques')
+        self.assertEqual(leave.days_count, 4)
+
+    def test_calendrier_chargé_une_fois(self):
+        from .working_days import holiday_calendar, working_days
+        holiday_calendar.invalidate()
+        with self.assertNumQueries(1):
+            working_days(date(2026, 1, 1), date(2026, 1, 31))
+            working_days(date(2026, 2, 1), date(2026, 2, 28))
+
+    def test_liste_des_agents_sans_requête_par_agent(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .working_days import holiday_calendar
+        monday = next_monday(date(date.today().year, 6, 1))
+        self.client.force_authenticate(user=make_admin('wd_admin'))
+        holiday_calendar.get()
+
+        def list_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get('/api/employees/')
+            self.assertEqual(resp.status_code, 200)
+            return sum('"api_leave"' in q['sql'] for q in ctx.captured_queries), resp.data
+
+        for i in range(2):
+            emp = make_employee(self.dept, first_name=f'Wd{i}', last_name='Liste')
+            Leave.objects.create(
+                employee=emp, leave_type='paid', reason='Test', status='approved',
+                start_date=monday, end_date=monday + timedelta(days=6),
+            )
+        few, _ = list_queries()
+        for i in range(2, 6):
+            make_employee(self.dept, first_name=f'Wd{i}', last_name='Liste')
+        many, data = list_queries()
+        self.assertEqual((few, many), (1, 1))
+        rows = data['results'] if isinstance(data, dict) else data
+        balances = {row['first_name']: row['leave_balance'] for row in rows}
+        self.assertEqual((balances['Wd0'], balances['Wd5']), (25, 30))
+
+    def test_seed_public_holidays_idempotent(self):
+        from io import StringIO
+        from django.core.management import call_command
+        call_command('seed_public_holidays', '--year', '2026', stdout=StringIO())
+        call_command('seed_public_holidays', '--year', '2026', stdout=StringIO())
+        self.assertEqual(PublicHoliday.objects.filter(date__year=2026).count(), 10)
+        self.assertEqual(PublicHoliday.objects.get(date=date(2026, 4, 6)).name, 'Lundi de Pâques')
+        self.assertTrue(PublicHoliday.objects.filter(date=date(2026, 5, 14), name='Ascension').exists())
+
+    def test_mark_absentees_ignore_les_jours_fériés(self):
+        from io import StringIO
+        from django.core.management import call_command
+        PublicHoliday.objects.create(date=date(2026, 8, 7), name="Fête de l'Indépendance")
+        out = StringIO()
+        call_command('mark_absentees', '--date', '2026-08-07', stdout=out)
+        self.assertIn('férié', out.getvalue())
+        self.assertFalse(Attendance.objects.exists())
+
+
+# ===========================
+# 27. Tests de l'Acquisition Mensuelle des Congés
+# ===========================
+
+@override_settings(LEAVE_MONTHLY_ACCRUAL=2.5, LEAVE_CARRY_OVER_CAP=10)
+class TestLeaveAccrual(TestCase):
+    """Registre LeaveAccrual : acquisition selon l'embauche, report plafonné, idempotence"""
+
+    def setUp(self):
+        from .working_days import holiday_calendar
+        self.addCleanup(holiday_calendar.invalidate)
+        self.dept = make_department('ACC-DEPT')
+        self.early = make_employee(self.dept, first_name='Acq', last_name='Mars')
+        self.late = make_employee(self.dept, first_name='Acr', last_name='Avril')
+        Employee.objects.filter(pk=self.early.pk).update(hire_date=date(2025, 3, 15))
+        Employee.objects.filter(pk=self.late.pk).update(hire_date=date(2025, 3, 16))
+
+    def _paid_leave(self, employee, start, end, status_='approved'):
+        return Leave.objects.create(
+            employee=employee, leave_type='paid', reason='Test', status=status_,
+            start_date=start, end_date=end,
+        )
+
+    def test_acquisition_selon_date_d_embauche(self):
+        from .leave_accrual import entitlement_by_employee, run_accruals
+        run_accruals(date(2025, 1, 1), date(2025, 12, 1))
+        entitlement = entitlement_by_employee([self.early.pk, self.late.pk], year=2025)
+        # Mars → décembre (10 mois) contre avril → décembre (9 mois)
+        self.assertEqual(entitlement[self.early.pk], Decimal('25.00'))
+        self.assertEqual(entitlement[self.late.pk], Decimal('22.50'))
+
+    def test_acquisition_jusqu_a_la_sortie(self):
+        from .leave_accrual import entitlement_by_employee, run_accruals
+        june = make_employee(self.dept, first_name='Acy', last_name='Juin')
+        early_june = make_employee(self.dept, first_name='Acz', last_name='Juin')
+        gone = make_employee(self.dept, first_name='Acx', last_name='Parti')
+        Employee.objects.filter(pk=june.pk).update(status='inactive', exit_date=date(2025, 6, 15))
+        Employee.objects.filter(pk=early_june.pk).update(status='inactive', exit_date=date(2025, 6, 14))
+        Employee.objects.filter(pk=gone.pk).update(status='inactive', exit_date=date(2024, 12, 31))
+        run_accruals(date(2025, 1, 1), date(2025, 12, 1))
+        entitlement = entitlement_by_employee([june.pk, early_june.pk, gone.pk], year=2025)
+        # Inactifs aujourd'hui, mais crédités des mois où ils étaient en poste le 15
+        self.assertEqual(entitlement[june.pk], Decimal('15.00'))        # janvier → juin
+        self.assertEqual(entitlement[early_june.pk], Decimal('12.50'))  # janvier → mai
+        # Sorti avant la période : aucune écriture, forfait annuel
+        self.assertEqual(entitlement[gone.pk], Employee.ANNUAL_LEAVE_ALLOWANCE)
+
+    def test_relance_idempotente(self):
+        from .leave_accrual import run_accruals
+        first = run_accruals(date(2025, 1, 1), date(2026, 2, 1))
+        count = LeaveAccrual.objects.count()
+        second = run_accruals(date(2025, 1, 1), date(2026, 2, 1))
+        # Mars 2025 → février 2026 (12 mois) et avril 2025 → février 2026 (11 mois)
+        self.assertEqual(first, {'accrued': 12 + 11, 'carried_over': 2})
+        self.assertEqual(second, {'accrued': 0, 'carried_over': 2})
+        self.assertEqual(LeaveAccrual.objects.count(), count)
+
+    def test_report_plafonné_en_jours_ouvrés(self):
+        from .leave_accrual import entitlement_by_employee, run_accruals
+        PublicHoliday.objects.create(date=date(2025, 11, 3), name='Test')
+        # Lundi 3 → dimanche 30 novembre : 20 jours ouvrés, dont 1 férié → 19 pris
+        self._paid_leave(self.late, date(2025, 11, 3), date(2025, 11, 30))
+        # Congé en attente : sans effet sur le report
+        self._paid_leave(self.early, date(2025, 6, 2), date(2025, 6, 27), status_='pending')
+        run_accruals(date(2025, 1, 1), date(2026, 1, 1))
+
+        carry = dict(LeaveAccrual.objects.filter(kind='carry_over').values_list('employee_id', 'days'))
+        self.assertEqual(carry[self.early.pk], Decimal('10.00'))   # 25 non pris, plafonné à 10
+        self.assertEqual(carry[self.late.pk], Decimal('3.50'))     # 22,5 - 19
+        entitlement = entitlement_by_employee([self.early.pk], year=2026)
+        self.assertEqual(entitlement[self.early.pk], Decimal('12.50'))   # report + janvier
+
+    def test_report_recalculé_après_approbation_tardive(self):
+        from .leave_accrual import run_accruals
+        leave = self._paid_leave(self.early, date(2025, 12, 1), date(2025, 12, 26), status_='pending')
+        run_accruals(date(2025, 1, 1), date(2026, 1, 1))
+        Leave.objects.filter(pk=leave.pk).update(status='approved')
+        run_accruals(date(2025, 1, 1), date(2026, 1, 1))
+        carry = LeaveAccrual.objects.get(employee=self.early, kind='carry_over')
+        self.assertEqual(carry.days, Decimal('5.00'))   # 25 - 20 jours ouvrés pris
+
+    def test_solde_calculé_sur_le_registre(self):
+        from .leave_accrual import run_accruals
+        year = date.today().year
+        run_accruals(date(year, 1, 1), date(year, 4, 1))
+        monday = next_monday(date(year, 2, 2))
+        self._paid_leave(self.early, monday, monday + timedelta(days=4))
+        employee = Employee.objects.get(pk=self.early.pk)
+        self.assertEqual(employee.leave_entitlement, Decimal('10.00'))
+        self.assertEqual(employee.leave_balance, Decimal('5.00'))
+
+    def test_commande_accrue_leave(self):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('accrue_leave', '--from', '2025-01', '--through', '2025-06', stdout=out)
+        self.assertIn('7 acquisition(s)', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('accrue_leave', '--from', '2025-07', '--through', '2025-06', stdout=StringIO())
+
+    def test_traitement_ensembliste_de_tout_l_effectif(self):
+        import time as time_module
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .leave_accrual import run_accruals
+        Employee.objects.bulk_create([
+            Employee(
+                first_name=f'Acc{i:04d}', last_name='Effectif', email=f'acc{i}@test.com',
+                phone='0102030405', department=self.dept, position='Agent',
+                hire_date=date(2020, 1, 1), salary=100000, matricule=f'ACC{i:05d}',
+                cnps=f'ACCCNPS{i:05d}', address='Abidjan',
+            )
+            for i in range(2000)
+        ])
+        started = time_module.monotonic()
+        with CaptureQueriesContext(connection) as ctx:
+            result = run_accruals(date(2025, 1, 1), date(2026, 12, 1))
+        elapsed = time_module.monotonic() - started
+        self.assertEqual(result, {'accrued': 2000 * 24 + 22 + 21, 'carried_over': 2002})
+        # Une requête d'acquisition + une de report, quel que soit l'effectif
+        statements = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(statements), 2)
+        self.assertLess(elapsed, 1.0)
+
+
+# ===========================
+# 28. Tests du Flux Temps Réel des Alarmes
+# ===========================
+
+@override_settings(NOTIFICATION_STREAM_LISTEN=False, NOTIFICATION_STREAM_HEARTBEAT=0.05,
+                   NOTIFICATION_STREAM_MAX_AGE=0.2)
+class TestNotificationStream(APITestCase):
+    """notifications/stream/ : périmètre, publication après COMMIT, reprise Last-Event-ID"""
+
+    def setUp(self):
+        from .notification_stream import notification_broker
+        self.broker = notification_broker
+        self.dept = make_department('SSE-DEPT')
+        self.other_dept = make_department('SSE-OTHER')
+        self.admin = make_admin('sse_admin')
+        self.ent_user = make_entreprise_user('sse_ent', self.dept)
+        self.emp = make_employee(self.dept, first_name='Sse', last_name='Agent', direction='SSE-DIR')
+        self.outsider = make_employee(self.other_dept, first_name='Ssx', last_name='Dehors', direction='SSE-AUTRE')
+        self.sub = self.broker.subscribe({'role': 'admin', 'department': None, 'directions': set()})
+        self.addCleanup(self.broker.unsubscribe, self.sub)
+
+    def _approved_leave(self, emp, days_ahead=3):
+        # J-7 déjà due, veille à venir
+        return Leave.objects.create(
+            employee=emp, leave_type='sick', reason='Test', status='approved',
+            start_date=date.today() + timedelta(days=days_ahead),
+            end_date=date.today() + timedelta(days=days_ahead + 1),
+        )
+
+    def _stream(self, user, **extra):
+        self.client.force_authenticate(user=user)
+        resp = self.client.get('/api/notifications/stream/', **extra)
+        return resp, b''.join(resp.streaming_content).decode()
+
+    def test_abonnés_filtrés_par_périmètre(self):
+        from .notification_stream import NotificationBroker
+        broker = NotificationBroker()
+        entreprise = broker.subscribe({'role': 'entreprise', 'department': self.dept.pk, 'directions': set()})
+        manager = broker.subscribe({'role': 'manager', 'department': None, 'directions': {'SSE-AUTRE'}})
+        broker.dispatch({'id': 1, 'event': 'read', 'items': [
+            {'d': self.dept.pk, 'r': 'SSE-DIR', 'id': 10},
+            {'d': self.other_dept.pk, 'r': 'SSE-AUTRE', 'id': 11},
+        ]})
+        self.assertEqual([i['id'] for i in entreprise.get(0)['items']], [10])
+        self.assertEqual([i['id'] for i in manager.get(0)['items']], [11])
+
+    def test_alarme_due_publiée_après_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            leave = self._approved_leave(self.emp)
+        event = self.sub.get(0)
+        self.assertEqual(event['event'], 'notification')
+        self.assertEqual([i['n']['notification_type'] for i in event['items']], [LeaveNotification.TYPE_7DAYS])
+        self.assertEqual(event['items'][0]['n']['leave'], leave.pk)
+        # L'alarme de la veille n'est pas encore due : rien d'autre n'est publié
+        self.assertIsNone(self.sub.get(0))
+
+    def test_traitements_en_masse_publiés(self):
+        leaves = [self._approved_leave(self.emp, days_ahead=3 + 10 * i) for i in range(3)]
+        Leave.objects.filter(pk__in=[l.pk for l in leaves]).update(status='pending')
+        LeaveNotification.objects.all().delete()
+        self.client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/leaves/bulk_approve/', {'ids': [l.pk for l in leaves]}, format='json')
+        event = self.sub.get(0)
+        # Seule l'alarme J-7 du premier congé est due
+        self.assertEqual(len(event['items']), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(resp.data['marked'], 1)
+        event = self.sub.get(0)
+        self.assertEqual(event['event'], 'read')
+        self.assertEqual([i['id'] for i in event['items']], [LeaveNotification.objects.get(is_read=True).pk])
+
+    def test_flux_prêt_et_battements_de_cœur(self):
+        resp, body = self._stream(self.ent_user)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp['Content-Type'].startswith('text/event-stream'))
+        self.assertTrue(body.startswith('retry: 5000\n\n'))
+        self.assertIn('event: ready', body)
+        self.assertIn(': ping', body)
+
+    def test_reprise_depuis_last_event_id(self):
+        last_id = self.broker.last_event_id()
+        with self.captureOnCommitCallbacks(execute=True):
+            self._approved_leave(self.emp)
+            self._approved_leave(self.outsider)
+        _, body = self._stream(self.ent_user, HTTP_LAST_EVENT_ID=str(last_id))
+        self.assertNotIn('event: ready', body)
+        # Seule l'alarme de l'entreprise de l'utilisateur est rejouée
+        self.assertEqual(body.count('event: notification'), 1)
+        self.assertIn('Sse Agent', body)
+        self.assertNotIn('Ssx', body)
+
+    def test_reprise_impossible_envoie_reset(self):
+        _, body = self._stream(self.ent_user, HTTP_LAST_EVENT_ID='-1')
+        self.assertIn('event: reset', body)
+
+    def test_authentification_par_ticket_de_flux(self):
+        resp = self.client.get('/api/notifications/stream/')
+        self.assertEqual(resp.status_code, 401)
+        self.client.force_authenticate(user=self.admin)
+        ticket = self.client.post('/api/notifications/stream/ticket/').data['ticket']
+        self.client.force_authenticate(user=None)
+        resp = self.client.get('/api/notifications/stream/', {'ticket': ticket})
+        self.assertEqual(resp.status_code, 200)
+        b''.join(resp.streaming_content)
+
+    def test_ticket_expiré_ou_jeton_d_accès_refusés(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        self.client.force_authenticate(user=self.admin)
+        ticket = self.client.post('/api/notifications/stream/ticket/').data['ticket']
+        self.client.force_authenticate(user=None)
+        with override_settings(NOTIFICATION_STREAM_TICKET_TTL=-1):
+            resp = self.client.get('/api/notifications/stream/', {'ticket': ticket})
+        self.assertEqual(resp.status_code, 401)
+        # Le jeton d'accès JWT n'est plus accepté dans l'URL
+        token = str(RefreshToken.for_user(self.admin).access_token)
+        for params in ({'token': token}, {'ticket': token}):
+            resp = self.client.get('/api/notifications/stream/', params)
+            self.assertEqual(resp.status_code, 401)
+
+    def test_employé_refusé(self):
+        self.client.force_authenticate(user=make_regular_user('sse_emp'))
+        resp = self.client.get('/api/notifications/stream/')
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.post('/api/notifications/stream/ticket/')
+        self.assertEqual(resp.status_code, 403)
+
+
+# ===========================
+# 29. Tests de la Création des Alarmes à l'Approbation
+# ===========================
+
+class TestLeaveApprovalNotifications(TestCase):
+    """Alarmes créées en une requête, uniquement au passage au statut 'approved'"""
+
+    def setUp(self):
+        self.emp = make_employee(make_department('NTF-DEPT'), first_name='Ntf', last_name='Agent')
+        self.start = date.today() + timedelta(days=30)
+
+    def _leave(self, status_value):
+        return Leave.objects.create(
+            employee=self.emp, leave_type='sick', reason='Test', status=status_value,
+            start_date=self.start, end_date=self.start + timedelta(days=2),
+        )
+
+    def test_congé_créé_approuvé(self):
+        leave = self._leave('approved')
+        triggers = dict(LeaveNotification.objects.filter(leave=leave).values_list('notification_type', 'trigger_date'))
+        self.assertEqual(triggers, {
+            LeaveNotification.TYPE_7DAYS: self.start - timedelta(days=7),
+            LeaveNotification.TYPE_EVE: self.start - timedelta(days=1),
+        })
+
+    def test_transition_vers_approved_en_une_insertion(self):
+        leave = Leave.objects.get(pk=self._leave('pending').pk)
+        leave.status = 'approved'
+        with self.assertNumQueries(2) as ctx:  # UPDATE du congé + INSERT des deux alarmes
+            leave.save()
+        self.assertTrue(ctx.captured_queries[1]['sql'].startswith('INSERT INTO "api_leavenotification"'))
+        self.assertEqual(LeaveNotification.objects.filter(leave=leave).count(), 2)
+
+    def test_nouvelle_sauvegarde_sans_requête_d_alarme(self):
+        leave = self._leave('approved')
+        LeaveNotification.objects.filter(notification_type=LeaveNotification.TYPE_7DAYS).delete()
+        for instance in (leave, Leave.objects.get(pk=leave.pk)):
+            instance.reason = 'Modifié'
+            with self.assertNumQueries(1):
+                instance.save()
+        # Pas de transition : l'alarme supprimée n'est pas recréée
+        self.assertEqual(LeaveNotification.objects.filter(leave=leave).count(), 1)
+
+    def test_réapprobation_sans_doublon(self):
+        leave = self._leave('approved')
+        leave.status = 'rejected'
+        leave.save()
+        leave.status = 'approved'
+        leave.save()
+        self.assertEqual(LeaveNotification.objects.filter(leave=leave).count(), 2)
+
+    def test_traitement_en_masse(self):
+        from .signals import bulk_create_leave_notifications
+        leaves = [self._leave('pending')]
+        Leave.objects.filter(pk=leaves[0].pk).update(status='approved')
+        with self.assertNumQueries(1):
+            bulk_create_leave_notifications(leaves)
+        bulk_create_leave_notifications(leaves)
+        self.assertEqual(LeaveNotification.objects.filter(leave=leaves[0]).count(), 2)
+
+
+# ===========================
+# 30. Tests des Compteurs d'Alarmes Non Lues
+# ===========================
+
+@override_settings(NOTIFICATION_STREAM_LISTEN=False)
+class TestUnreadNotificationCounters(APITestCase):
+    """unread_count : compteurs par périmètre ajustés sans requête, ETag et 304"""
+
+    def setUp(self):
+        from .notification_counts import unread_counters
+        self.counters = unread_counters
+        self.counters.clear()
+        self.addCleanup(self.counters.clear)
+        self.dept = make_department('CNT-DEPT')
+        self.other_dept = make_department('CNT-OTHER')
+        self.admin = make_admin('cnt_admin')
+        self.ent_user = make_entreprise_user('cnt_ent', self.dept)
+        self.emp = make_employee(self.dept, first_name='Cnt', last_name='Agent', direction='CNT-A')
+        self.outsider = make_employee(self.other_dept, first_name='Cnx', last_name='Dehors', direction='CNT-B')
+        self.leave = self._approved_leave(self.emp)
+        self._approved_leave(self.outsider)
+
+    def _approved_leave(self, emp, days_ahead=3):
+        # Alarme J-7 due, veille à venir
+        start = date.today() + timedelta(days=days_ahead)
+        return Leave.objects.create(
+            employee=emp, leave_type='sick', reason='Test', status='approved',
+            start_date=start, end_date=start + timedelta(days=1),
+        )
+
+    def test_compteurs_par_périmètre(self):
+        manager = {'role': 'manager', 'directions': ['CNT-B', 'CNT-VIDE']}
+        entreprise = {'role': 'entreprise', 'department': self.dept}
+        with self.assertNumQueries(3):
+            counts = [self.counters.count(ctx) for ctx in ({'role': 'admin'}, entreprise, manager)]
+        self.assertEqual(counts, [2, 1, 1])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.counters.count(manager), 1)
+        self.assertEqual(self.counters.count({'role': 'manager', 'directions': []}), 0)
+
+    def test_ajustés_à_la_création_et_à_la_lecture(self):
+        admin, entreprise = {'role': 'admin'}, {'role': 'entreprise', 'department': self.dept}
+        self.counters.count(admin)
+        self.counters.count(entreprise)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._approved_leave(self.emp, days_ahead=5)
+        with self.assertNumQueries(0):
+            self.assertEqual((self.counters.count(admin), self.counters.count(entreprise)), (3, 2))
+
+        self.client.force_authenticate(user=self.ent_user)
+        notif = LeaveNotification.objects.filter(leave=self.leave, trigger_date__lte=date.today()).get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/notifications/{notif.pk}/mark_read/')
+        with self.assertNumQueries(0):
+            self.assertEqual((self.counters.count(admin), self.counters.count(entreprise)), (2, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/notifications/mark_all_read/')
+        with self.assertNumQueries(0):
+            self.assertEqual((self.counters.count(admin), self.counters.count(entreprise)), (1, 0))
+
+    def test_congé_supprimé_ou_rejeté(self):
+        admin = {'role': 'admin'}
+        self.assertEqual(self.counters.count(admin), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.leave.delete()
+        other = Leave.objects.get(employee=self.outsider)
+        other.status = 'rejected'
+        with self.captureOnCommitCallbacks(execute=True):
+            other.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.counters.count(admin), 0)
+
+    def test_recalcul_au_changement_de_jour(self):
+        admin = {'role': 'admin'}
+        self.counters.count(admin)
+        self.counters._day = date.today() - timedelta(days=1)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.counters.count(admin), 2)
+
+    def test_etag_et_304(self):
+        self.client.force_authenticate(user=self.admin)
+        for url in ('/api/notifications/unread_count/', '/api/notifications/'):
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            etag = resp['ETag']
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get('/api/notifications/')
+        self.assertEqual(resp.data['unread_count'], 2)
+        etag = resp['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/notifications/mark_all_read/')
+        resp = self.client.get('/api/notifications/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['unread_count'], 0)
+
+
+# ===========================
+# 31. Tests du Portail Employé (me, bootstrap)
+# ===========================
+
+class TestEmployeePortalEndpoints(APITestCase):
+    """employees/me/ et me/bootstrap/ : données de l'utilisateur, requêtes bornées"""
+
+    def setUp(self):
+        from .working_days import holiday_calendar
+        holiday_calendar.get()  # calendrier des jours fériés déjà en mémoire
+        self.dept = make_department('ME-DEPT')
+        Direction.objects.create(name='ME-DIR')
+        self.user = make_regular_user('me_emp')
+        self.emp = make_employee(self.dept, user=self.user, first_name='Moi', last_name='Agent')
+        self.other = make_employee(self.dept, first_name='Autre', last_name='Agent')
+        self.monday = next_monday(date(date.today().year, 3, 1))
+        self._leave(self.emp, 'paid', 'approved', 0)
+        self._leave(self.other, 'paid', 'approved', 0)
+        self.client.force_authenticate(user=self.user)
+
+    def _leave(self, emp, leave_type, status_value, weeks):
+        start = self.monday + timedelta(weeks=weeks)
+        return Leave.objects.create(
+            employee=emp, leave_type=leave_type, reason='Test', status=status_value,
+            start_date=start, end_date=start + timedelta(days=4),
+        )
+
+    def test_me_retourne_la_fiche_liée(self):
+        with self.assertNumQueries(3):
+            resp = self.client.get('/api/employees/me/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['id'], self.emp.id)
+        self.assertEqual(resp.data['department_name'], 'ME-DEPT')
+        self.assertEqual(resp.data['leaves_taken_this_year'], 5)
+
+    def test_me_sans_fiche(self):
+        self.client.force_authenticate(user=make_regular_user('me_seul'))
+        resp = self.client.get('/api/employees/me/')
+        self.assertEqual(resp.status_code, 404)
+
+    def test_bootstrap_complet(self):
+        self._leave(self.emp, 'paid', 'pending', 2)
+        resp = self.client.get('/api/me/bootstrap/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['profile']['id'], self.emp.id)
+        self.assertEqual({leave['employee'] for leave in resp.data['leaves']}, {self.emp.id})
+        self.assertEqual(len(resp.data['leaves']), 2)
+        self.assertEqual(resp.data['balance'], {'entitlement': 30.0, 'taken': 5, 'pending': 5, 'balance': 25.0})
+        self.assertIn('ME-DIR', [d['name'] for d in resp.data['directions']])
+        self.assertIn({'id': self.dept.id, 'name': 'ME-DEPT'}, resp.data['departments'])
+
+    def test_bootstrap_requêtes_bornées(self):
+        with self.assertNumQueries(6):
+            self.client.get('/api/me/bootstrap/')
+        for week in range(2, 12, 2):
+            self._leave(self.emp, 'sick', 'pending', week)
+        with self.assertNumQueries(6):
+            resp = self.client.get('/api/me/bootstrap/')
+        self.assertEqual(len(resp.data['leaves']), 6)
+
+    def test_bootstrap_sans_fiche(self):
+        self.client.force_authenticate(user=make_regular_user('me_nouveau'))
+        resp = self.client.get('/api/me/bootstrap/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNone(resp.data['profile'])
+        self.assertEqual((resp.data['leaves'], resp.data['balance']), ([], None))
+        self.assertEqual(resp.data['user']['username'], 'me_nouveau')
+
+
+# ===========================
+# 32. Tests de l'Amorçage du Tableau de Bord
+# ===========================
+
+@override_settings(DASHBOARD_ATTENDANCE_DAYS=31)
+class TestDashboardBootstrap(APITestCase):
+    """dashboard/bootstrap/ : périmètre, champs, fenêtre des présences, requêtes fixes"""
+
+    URL = '/api/dashboard/bootstrap/'
+
+    def setUp(self):
+        from .working_days import holiday_calendar
+        holiday_calendar.get()
+        self.dept = make_department('BOOT-DEPT')
+        self.other_dept = make_department('BOOT-OTHER')
+        self.admin = make_admin('boot_admin')
+        self.ent_user = make_entreprise_user('boot_ent', self.dept)
+        self.mgr_user = make_manager('boot_mgr')
+        direction = Direction.objects.create(name='BOOT-DIR')
+        ManagerProfile.objects.create(user=self.mgr_user).directions.add(direction)
+        self.emp = make_employee(self.dept, first_name='Boot', last_name='Agent', direction='BOOT-DIR')
+        self.outsider = make_employee(self.other_dept, first_name='Boox', last_name='Dehors')
+        monday = next_monday(date.today() + timedelta(days=7))
+        for emp in (self.emp, self.outsider):
+            Leave.objects.create(
+                employee=emp, leave_type='sick', reason='Test', status='pending',
+                start_date=monday, end_date=monday + timedelta(days=6),
+            )
+            Attendance.objects.create(employee=emp, date=date.today(), status='present', check_in=time(8, 0))
+        Attendance.objects.create(employee=self.emp, date=date.today() - timedelta(days=40), status='present')
+
+    def _get(self, user, **extra):
+        self.client.force_authenticate(user=user)
+        return self.client.get(self.URL, **extra)
+
+    def test_périmètre_entreprise(self):
+        resp = self._get(self.ent_user)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([d['name'] for d in resp.data['departments']], ['BOOT-DEPT'])
+        self.assertEqual([e['id'] for e in resp.data['employees']], [self.emp.id])
+        self.assertEqual({l['employee'] for l in resp.data['leaves']}, {self.emp.id})
+        # Présence d'il y a 40 jours hors de la fenêtre
+        self.assertEqual([a['date'] for a in resp.data['attendances']], [date.today()])
+
+    def test_périmètre_manager(self):
+        resp = self._get(self.mgr_user)
+        self.assertEqual(len(resp.data['departments']), 2)
+        self.assertEqual([e['id'] for e in resp.data['employees']], [self.emp.id])
+
+    def test_champs_du_tableau_de_bord(self):
+        resp = self._get(self.admin)
+        employee = next(e for e in resp.data['employees'] if e['id'] == self.emp.id)
+        self.assertEqual(employee['department_name'], 'BOOT-DEPT')
+        self.assertNotIn('photo', employee)
+        leave = resp.data['leaves'][0]
+        self.assertEqual(leave['days_count'], 5)
+        self.assertEqual(leave['employee_name'].split(' ')[0][:3], 'Boo')
+        attendance = next(a for a in resp.data['attendances'] if a['employee'] == self.emp.id)
+        self.assertEqual(attendance['employee_name'], 'Boot Agent')
+        self.assertEqual(attendance['check_in'], time(8, 0))
+
+    def test_requêtes_fixes_et_compression(self):
+        with self.assertNumQueries(4):
+            self._get(self.admin)
+        for i in range(5):
+            emp = make_employee(self.dept, first_name=f'Bq{i}', last_name='Agent')
+            Attendance.objects.create(employee=emp, date=date.today(), status='late')
+        with self.assertNumQueries(4):
+            resp = self._get(self.admin, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+
+    def test_performance_1500_agents(self):
+        import time as time_module
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        Employee.objects.bulk_create([
+            Employee(
+                first_name=f'Perf{i}', last_name='Agent', email=f'perf{i}@test.com', phone='0102030405',
+                department=self.dept, position='Agent', hire_date=date(2020, 1, 15), salary=150000,
+                matricule=f'MAT-PERF{i}', cnps=f'CNPSPERF{i}', address='Abidjan',
+            )
+            for i in range(1500)
+        ])
+        ids = list(Employee.objects.filter(first_name__startswith='Perf').values_list('id', flat=True))
+        Attendance.objects.bulk_create([
+            Attendance(employee_id=pk, date=date.today(), status='present', check_in=time(7, 45)) for pk in ids
+        ])
+        start = date.today() + timedelta(days=60)
+        Leave.objects.bulk_create([
+            Leave(employee_id=pk, leave_type='sick', reason='Perf', status='pending',
+                  start_date=start, end_date=start + timedelta(days=3))
+            for pk in ids[:300]
+        ])
+
+        self.client.force_authenticate(user=self.ent_user)
+        started = time_module.monotonic()
+        for url in ('/api/departments/', '/api/employees/', '/api/leaves/', '/api/attendances/'):
+            self.client.get(url)
+        legacy = time_module.monotonic() - started
+
+        started = time_module.monotonic()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.URL)
+        elapsed = time_module.monotonic() - started
+
+        self.assertEqual(len(resp.data['employees']), 1501)
+        self.assertEqual(len(resp.data['attendances']), 1501)
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+        self.assertLess(elapsed, legacy / 2)
+        self.assertLess(elapsed, 1.5)
+
+
+# ===========================
+# 33. Tests de la Synchronisation Incrémentale
+# ===========================
+
+@override_settings(DELTA_SYNC_OVERLAP=0, DELTA_SYNC_RETENTION_DAYS=30)
+class TestDeltaSync(APITestCase):
+    """?updated_since= : lignes modifiées, pierres tombales du périmètre, point de reprise"""
+
+    def setUp(self):
+        from django.utils import timezone
+        self.dept = make_department('SYNC-DEPT')
+        self.other_dept = make_department('SYNC-OTHER')
+        self.admin = make_admin('sync_admin')
+        self.ent_user = make_entreprise_user('sync_ent', self.dept)
+        self.emp = make_employee(self.dept, first_name='Sync', last_name='Agent')
+        self.mate = make_employee(self.dept, first_name='Syna', last_name='Collegue')
+        self.outsider = make_employee(self.other_dept, first_name='Synx', last_name='Dehors')
+        self.leave = Leave.objects.create(
+            employee=self.emp, leave_type='sick', reason='Test', status='pending',
+            start_date=date(2026, 3, 2), end_date=date(2026, 3, 6),
+        )
+        self.attendance = Attendance.objects.create(employee=self.emp, date=date(2026, 3, 9), status='present')
+        # Lignes existantes datées d'une heure : hors du delta
+        past = timezone.now() - timedelta(hours=1)
+        Employee.objects.update(updated_at=past)
+        Leave.objects.update(updated_at=past)
+        Attendance.objects.update(updated_at=past)
+
+    def _mark(self, user, url='/api/employees/'):
+        self.client.force_authenticate(user=user)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return resp['X-High-Water-Mark']
+
+    def _delta(self, url, mark):
+        return self.client.get(url, {'updated_since': mark})
+
+    def test_seules_les_lignes_modifiées(self):
+        mark = self._mark(self.admin)
+        self.emp.position = 'Chef'
+        self.emp.save()
+        resp = self._delta('/api/employees/', mark)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([e['id'] for e in resp.data['results']], [self.emp.id])
+        self.assertEqual(resp.data['results'][0]['position'], 'Chef')
+        self.assertEqual(resp.data['deleted'], [])
+        self.assertGreater(resp.data['high_water_mark'].isoformat(), mark)
+
+    def test_écritures_en_masse_incluses(self):
+        mark = self._mark(self.admin, '/api/leaves/')
+        resp = self.client.post('/api/leaves/bulk_reject/', {'ids': [self.leave.id]}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        resp = self._delta('/api/leaves/', mark)
+        self.assertEqual([(l['id'], l['status']) for l in resp.data['results']], [(self.leave.id, 'rejected')])
+
+    def test_pierres_tombales_du_périmètre(self):
+        mark = self._mark(self.ent_user, '/api/attendances/')
+        other = Attendance.objects.create(employee=self.outsider, date=date(2026, 3, 9), status='present')
+        other_id, own_id = other.id, self.attendance.id
+        other.delete()
+        self.attendance.delete()
+        resp = self._delta('/api/attendances/', mark)
+        self.assertEqual(resp.data['deleted'], [own_id])
+        self.assertEqual(resp.data['results'], [])
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self._delta('/api/attendances/', mark).data['deleted'], sorted([own_id, other_id]))
+
+    def test_suppression_d_un_agent_en_cascade(self):
+        mark = self._mark(self.ent_user)
+        emp_id, leave_id, attendance_id = self.emp.id, self.leave.id, self.attendance.id
+        self.emp.delete()
+        self.assertEqual(self._delta('/api/employees/', mark).data['deleted'], [emp_id])
+        self.assertEqual(self._delta('/api/leaves/', mark).data['deleted'], [leave_id])
+        self.assertEqual(self._delta('/api/attendances/', mark).data['deleted'], [attendance_id])
+        tombstone = DeletionLog.objects.get(resource='leave', object_id=leave_id)
+        self.assertEqual(tombstone.department_id, self.dept.id)
+
+    def test_point_de_reprise_invalide_ou_expiré(self):
+        from django.utils import timezone
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self._delta('/api/leaves/', 'hier').status_code, 400)
+        expired = (timezone.now() - timedelta(days=31)).isoformat()
+        self.assertEqual(self._delta('/api/leaves/', expired).status_code, 410)
+
+    def test_purge_et_point_de_reprise_du_tableau_de_bord(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        self.attendance.delete()
+        DeletionLog.objects.update(deleted_at=timezone.now() - timedelta(days=40))
+        self.leave.delete()
+        call_command('purge_deletion_log', stdout=StringIO())
+        self.assertEqual(list(DeletionLog.objects.values_list('resource', flat=True)), ['leave'])
+
+        self.client.force_authenticate(user=self.admin)
+        mark = self.client.get('/api/dashboard/bootstrap/').data['high_water_mark']
+        resp = self._delta('/api/employees/', mark.isoformat())
+        self.assertEqual(resp.data['results'], [])
+
+
+# ===========================
+# 34. Tests des Statistiques du Dashboard en une requête
+# ===========================
+
+class TestDashboardStatsSingleQuery(APITestCase):
+    """DashboardStatsView : métriques étendues, une seule requête SQL, latence"""
+
+    url = '/api/dashboard/stats/'
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.dept = make_department('ONEQ-DEPT')
+        self.other_dept = make_department('ONEQ-OTHER')
+        self.admin = make_admin('oneq_admin')
+        self.ent_user = make_entreprise_user('oneq_ent', self.dept)
+        self.emp = make_employee(self.dept, first_name='Oneqa', last_name='Agent')
+        self.mate = make_employee(self.dept, first_name='Oneqb', last_name='Agent')
+        self.outsider = make_employee(self.other_dept, first_name='Oneqc', last_name='Agent')
+        today = date.today()
+        Attendance.objects.create(employee=self.emp, date=today, status='late', check_in=time(8, 0), check_out=time(12, 0))
+        Attendance.objects.create(employee=self.mate, date=today, status='present')
+        Attendance.objects.create(employee=self.outsider, date=today, status='late')
+        # En congé aujourd'hui (débute cette semaine), congé de la semaine prochaine, demandes en attente
+        Leave.objects.create(employee=self.emp, leave_type='sick', reason='T', status='approved',
+                             start_date=today, end_date=today + timedelta(days=1))
+        next_week = today + timedelta(days=7 - today.weekday())
+        Leave.objects.create(employee=self.mate, leave_type='sick', reason='T', status='approved',
+                             start_date=next_week, end_date=next_week)
+        Leave.objects.create(employee=self.mate, leave_type='sick', reason='T', status='pending',
+                             start_date=next_week + timedelta(days=7), end_date=next_week + timedelta(days=8))
+        Leave.objects.create(employee=self.outsider, leave_type='sick', reason='T', status='manager_approved',
+                             start_date=next_week, end_date=next_week)
+
+    def _stats(self, user):
+        self.client.force_authenticate(user=user)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    def test_métriques_étendues_du_périmètre(self):
+        from django.core.cache import cache
+        stats = self._stats(self.ent_user)
+        self.assertEqual(stats['total_employees'], 2)
+        self.assertEqual(stats['total_departments'], 2)
+        self.assertEqual(stats['present_today'], 1)
+        self.assertEqual(stats['late_today'], 1)
+        self.assertEqual(stats['on_leave_today'], 1)
+        self.assertEqual(stats['pending_approvals'], 1)
+        self.assertEqual(stats['leaves_starting_week'], 1)
+        self.assertEqual(stats['hours_worked_month'], 4.0)
+
+        cache.clear()
+        stats = self._stats(self.admin)
+        self.assertEqual(stats['late_today'], 2)
+        self.assertEqual(stats['pending_approvals'], 2)
+
+    def test_une_seule_requête(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.core.cache import cache
+        from .views import get_user_context
+        # Cache vide : la seule requête est celle des statistiques
+        with self.assertNumQueries(1):
+            self._stats(self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            get_user_context(self.ent_user)
+        cache.clear()
+        with self.assertNumQueries(len(ctx.captured_queries) + 1):
+            self._stats(self.ent_user)
+
+    def test_manager_sans_direction(self):
+        stats = self._stats(make_manager('oneq_mgr'))
+        self.assertEqual(stats['total_employees'], 0)
+        self.assertEqual(stats['total_departments'], 2)
+
+    def test_latence_1500_agents(self):
+        import time as time_module
+        from django.core.cache import cache
+        Employee.objects.bulk_create([
+            Employee(
+                first_name=f'Stat{i}', last_name='Agent', email=f'stat{i}@test.com', phone='0102030405',
+                department=self.dept, position='Agent', hire_date=date(2020, 1, 15), salary=150000,
+                matricule=f'MAT-STAT{i}', cnps=f'CNPSSTAT{i}', address='Abidjan',
+            )
+            for i in range(1500)
+        ])
+        ids = list(Employee.objects.filter(first_name__startswith='Stat').values_list('id', flat=True))
+        month_start = date.today().replace(day=1)
+        Attendance.objects.bulk_create([
+            Attendance(employee_id=pk, date=month_start + timedelta(days=day), status='present',
+                       check_in=time(7, 45), check_out=time(16, 0))
+            for pk in ids for day in range(min(date.today().day, 10))
+        ])
+        self.client.force_authenticate(user=self.admin)
+        self.client.get(self.url)
+        elapsed = 0
+        for _ in range(5):
+            cache.clear()
+            started = time_module.monotonic()
+            with self.assertNumQueries(1):
+                resp = self.client.get(self.url)
+            elapsed += time_module.monotonic() - started
+        self.assertEqual(resp.data['total_employees'], 1503)
+        self.assertLess(elapsed / 5, 0.25)
+
+
+# ===========================
+# 35. Tests du Cache des Statistiques du Dashboard
+# ===========================
+
+@override_settings(DASHBOARD_STATS_CACHE_TTL=60, DASHBOARD_STATS_MAX_STALE=300)
+class TestDashboardStatsCache(APITestCase):
+    """Statistiques en cache par périmètre, invalidées par version, recalcul unique"""
+
+    url = '/api/dashboard/stats/'
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.dept = make_department('SCACHE-DEPT')
+        self.other_dept = make_department('SCACHE-OTHER')
+        self.admin = make_admin('scache_admin')
+        self.ent_user = make_entreprise_user('scache_ent', self.dept)
+        self.emp = make_employee(self.dept, first_name='Kcaa', last_name='Agent')
+        self.outsider = make_employee(self.other_dept, first_name='Kcab', last_name='Agent')
+
+    def _stats(self, user=None):
+        self.client.force_authenticate(user=user or self.admin)
+        return self.client.get(self.url).data
+
+    def test_réponse_en_cache_par_périmètre(self):
+        self.assertEqual(self._stats()['total_employees'], 2)
+        self.assertEqual(self._stats(self.ent_user)['total_employees'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._stats()['total_employees'], 2)
+
+    def test_invalidation_par_les_écritures(self):
+        self._stats()
+        emp = make_employee(self.dept, first_name='Kcac', last_name='Agent')
+        self.assertEqual(self._stats()['total_employees'], 3)
+
+        Attendance.objects.create(employee=emp, date=date.today(), status='late')
+        self.assertEqual(self._stats()['late_today'], 1)
+
+        leave = Leave.objects.create(
+            employee=emp, leave_type='sick', reason='T', status='pending',
+            start_date=date.today() + timedelta(days=30), end_date=date.today() + timedelta(days=31),
+        )
+        self.assertEqual(self._stats()['pending_approvals'], 1)
+        # Traitement en masse (QuerySet.update, sans signal)
+        self.client.post('/api/leaves/bulk_reject/', {'ids': [leave.id]}, format='json')
+        self.assertEqual(self._stats()['pending_approvals'], 0)
+
+        leave.delete()
+        emp.delete()
+        self.assertEqual(self._stats()['total_employees'], 2)
+
+    def test_un_seul_recalcul_valeur_périmée_servie(self):
+        from django.core.cache import cache
+        from .caching import dashboard_stats_cache_key
+        self._stats()
+        Employee.objects.filter(pk=self.outsider.pk).delete()
+        # Recalcul en cours dans un autre thread : la valeur précédente est servie sans requête
+        lock_key = f"{dashboard_stats_cache_key('admin')}:refresh"
+        cache.add(lock_key, 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._stats()['total_employees'], 2)
+        cache.delete(lock_key)
+        with self.assertNumQueries(1):
+            self.assertEqual(self._stats()['total_employees'], 1)
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_garde_concurrente(self):
+        import threading
+        from .caching import get_or_refresh
+        calls, started, release = [], threading.Event(), threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'frais'
+
+        get_or_refresh('test:guard', 1, lambda: 'ancien', ttl=60)
+        worker = threading.Thread(target=lambda: get_or_refresh('test:guard', 2, slow, ttl=60))
+        worker.start()
+        started.wait(5)
+        # Pendant le recalcul : valeur périmée, sans second calcul
+        self.assertEqual(get_or_refresh('test:guard', 2, slow, ttl=60), 'ancien')
+        release.set()
+        worker.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(get_or_refresh('test:guard', 2, slow, ttl=60), 'frais')
+
+
+# ===========================
+# 36. Tests des Statistiques Mensuelles (vues matérialisées)
+# ===========================
+
+class TestAnalyticsViews(APITestCase):
+    """/api/analytics/* : séries des vues matérialisées, périmètre, validation"""
+
+    def setUp(self):
+        from .analytics import refresh_analytics
+        from .months import add_months, month_start
+        self.current = month_start(date.today())
+        self.previous = add_months(self.current, -1)
+        self.dept = make_department('ANA-DEPT')
+        self.other_dept = make_department('ANA-OTHER')
+        Direction.objects.create(name='ANA-DIR')
+        self.admin = make_admin('ana_admin')
+        self.ent_user = make_entreprise_user('ana_ent', self.dept)
+        self.mgr_user = make_manager('ana_mgr')
+        ManagerProfile.objects.create(user=self.mgr_user).directions.add(Direction.objects.get(name='ANA-DIR'))
+
+        self.emp = make_employee(self.dept, first_name='Anaa', last_name='Agent', direction='ANA-DIR')
+        self.recruit = make_employee(self.dept, first_name='Anab', last_name='Agent')
+        Employee.objects.filter(pk=self.recruit.pk).update(hire_date=self.current)
+        self.outsider = make_employee(self.other_dept, first_name='Anac', last_name='Agent', direction='ANA-DIR')
+
+        Attendance.objects.create(employee=self.emp, date=self.previous, status='present',
+                                  check_in=time(8, 0), check_out=time(16, 0))
+        Attendance.objects.create(employee=self.emp, date=self.previous + timedelta(days=1), status='absent')
+        Attendance.objects.create(employee=self.outsider, date=self.previous, status='late')
+        # Lundi → dimanche : 5 jours ouvrés dans le mois précédent
+        monday = next_monday(self.previous)
+        Leave.objects.create(employee=self.emp, leave_type='sick', reason='T', status='approved',
+                             start_date=monday, end_date=monday + timedelta(days=6))
+        Leave.objects.create(employee=self.outsider, leave_type='paid', reason='T', status='pending',
+                             start_date=monday, end_date=monday + timedelta(days=6))
+        refresh_analytics()
+
+    def _get(self, user, path, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(f'/api/analytics/{path}/', params)
+
+    @staticmethod
+    def _rows(resp, month):
+        return {row['label']: row for row in resp.data['series'] if row['month'] == month.strftime('%Y-%m')}
+
+    def test_effectifs_par_entreprise(self):
+        resp = self._get(self.admin, 'headcount')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['group_by'], 'department')
+        self.assertEqual(len({row['month'] for row in resp.data['series']}), 12)
+        current = self._rows(resp, self.current)
+        self.assertEqual((current['ANA-DEPT']['headcount'], current['ANA-DEPT']['hires']), (2, 1))
+        self.assertEqual(current['ANA-OTHER']['headcount'], 1)
+        self.assertEqual(self._rows(resp, self.previous)['ANA-DEPT']['headcount'], 1)
+
+        # Entreprise : son périmètre seulement
+        resp = self._get(self.ent_user, 'headcount')
+        self.assertEqual({row['label'] for row in resp.data['series']}, {'ANA-DEPT'})
+
+    def test_sortie_sans_effet_sur_les_mois_passés(self):
+        from .analytics import refresh_analytics
+        employee = Employee.objects.get(pk=self.emp.pk)
+        employee.status = 'inactive'
+        employee.save()
+        self.assertEqual(employee.exit_date, date.today())
+        refresh_analytics()
+        resp = self._get(self.admin, 'headcount')
+        current = self._rows(resp, self.current)['ANA-DEPT']
+        self.assertEqual((current['headcount'], current['exits']), (1, 1))
+        previous = self._rows(resp, self.previous)['ANA-DEPT']
+        self.assertEqual((previous['headcount'], previous['exits']), (1, 0))
+
+        # Réactivation : la date de sortie est effacée
+        employee.status = 'active'
+        employee.save()
+        self.assertIsNone(Employee.objects.get(pk=self.emp.pk).exit_date)
+
+    def test_réactivation_sur_la_même_instance(self):
+        # Instance jamais relue en base : le statut sauvegardé tient lieu de statut lu
+        employee = make_employee(self.dept, first_name='Anac', last_name='Agent')
+        employee.status = 'inactive'
+        employee.save()
+        self.assertEqual(employee.exit_date, date.today())
+        employee.status = 'active'
+        employee.save(update_fields=['status'])
+        self.assertIsNone(Employee.objects.get(pk=employee.pk).exit_date)
+
+    def test_absentéisme_par_direction(self):
+        resp = self._get(self.mgr_user, 'absenteeism')
+        previous = self._rows(resp, self.previous)
+        self.assertEqual(list(previous), ['ANA-DIR'])
+        row = previous['ANA-DIR']
+        self.assertEqual((row['records'], row['absent'], row['late']), (3, 1, 1))
+        self.assertEqual(row['absence_rate'], 0.3333)
+        self.assertEqual(row['hours_worked'], 8.0)
+
+        resp = self._get(self.ent_user, 'absenteeism', group_by='department')
+        self.assertEqual(self._rows(resp, self.previous)['ANA-DEPT']['records'], 2)
+
+    def test_jours_de_congé_par_type(self):
+        resp = self._get(self.admin, 'leave-days')
+        days = {(row['month'], row['key']): row['days'] for row in resp.data['series']}
+        self.assertEqual(days, {(self.previous.strftime('%Y-%m'), 'sick'): 5})
+
+    def test_données_du_dernier_rafraîchissement(self):
+        from .analytics import refresh_analytics
+        make_employee(self.other_dept, first_name='Anad', last_name='Agent')
+        self.assertEqual(self._rows(self._get(self.admin, 'headcount'), self.current)['ANA-OTHER']['headcount'], 1)
+        refresh_analytics()
+        self.assertEqual(self._rows(self._get(self.admin, 'headcount'), self.current)['ANA-OTHER']['headcount'], 2)
+
+    def test_une_requête_et_validation(self):
+        self.client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(1):
+            self.client.get('/api/analytics/absenteeism/')
+        self.assertEqual(self._get(self.admin, 'headcount', **{'from': '2026-13'}).status_code, 400)
+        self.assertEqual(self._get(self.admin, 'headcount', group_by='leave_type').status_code, 400)
+        self.assertEqual(self._get(self.admin, 'headcount', **{'from': '2000-01'}).status_code, 400)
+        employee_user = make_regular_user('ana_emp')
+        self.assertEqual(self._get(employee_user, 'headcount').status_code, 403)
+
+
+# ===========================
+# 37. Tests de la Démographie (pyramide des âges, départs à la retraite)
+# ===========================
+
+class TestDemographicsAnalytics(APITestCase):
+    """/api/analytics/demographics/ : agrégats en base, périmètre, cache"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.year = date.today().year
+        self.dept = make_department('DEM-DEPT')
+        self.other_dept = make_department('DEM-OTHER')
+        Direction.objects.create(name='DEM-DIR')
+        self.admin = make_admin('dem_admin')
+        self.ent_user = make_entreprise_user('dem_ent', self.dept)
+        self.mgr_user = make_manager('dem_mgr')
+        ManagerProfile.objects.create(user=self.mgr_user).directions.add(Direction.objects.get(name='DEM-DIR'))
+
+        # Nés un 1er janvier : âge révolu = écart d'années
+        self.young = self._agent(self.dept, 'Dema', 20, 'female', direction='DEM-DIR')
+        self.senior = self._agent(self.dept, 'Demb', 58, 'male', direction='DEM-DIR')
+        self._agent(self.dept, 'Demc', 32, 'female')
+        self._agent(self.other_dept, 'Demd', 59, 'female', direction='DEM-DIR')
+        self._agent(self.other_dept, 'Deme', 61, 'male')
+        self._agent(self.other_dept, 'Demf', None, 'male')
+        retired = self._agent(self.dept, 'Demg', 40, 'male')
+        Employee.objects.filter(pk=retired.pk).update(status='inactive')
+
+    def _agent(self, dept, first_name, age, gender, **kwargs):
+        employee = make_employee(dept, first_name=first_name, last_name='Agent', **kwargs)
+        birth_date = date(self.year - age, 1, 1) if age is not None else None
+        Employee.objects.filter(pk=employee.pk).update(birth_date=birth_date, gender=gender)
+        return employee
+
+    def _get(self, user, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get('/api/analytics/demographics/', params)
+
+    @staticmethod
+    def _pyramid(resp):
+        counts = {}
+        for row in resp.data['pyramid']:
+            key = (row['bucket'], row['gender'])
+            counts[key] = counts.get(key, 0) + row['count']
+        return counts
+
+    @staticmethod
+    def _retirements(resp):
+        return {(row['year'], row['department_name'], row['direction']): row['count']
+                for row in resp.data['retirements']}
+
+    def test_pyramide_par_tranche_et_sexe(self):
+        resp = self._get(self.admin)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['age_buckets'][0], '<25')
+        self.assertEqual(resp.data['age_buckets'][-2:], ['60+', 'unknown'])
+        # L'agent inactif (40 ans) n'est pas compté
+        self.assertEqual(self._pyramid(resp), {
+            ('<25', 'female'): 1, ('30-34', 'female'): 1, ('55-59', 'male'): 1,
+            ('55-59', 'female'): 1, ('60+', 'male'): 1, ('unknown', 'male'): 1,
+        })
+        row = next(r for r in resp.data['pyramid'] if r['bucket'] == '<25')
+        self.assertEqual((row['department_name'], row['direction']), ('DEM-DEPT', 'DEM-DIR'))
+
+    def test_tranches_triées_dans_l_ordre_des_âges(self):
+        self._agent(self.dept, 'Demh', 62, 'female', direction='DEM-DIR')
+        resp = self._get(self.admin)
+        buckets = [row['bucket'] for row in resp.data['pyramid']
+                   if (row['department_name'], row['direction']) == ('DEM-DEPT', 'DEM-DIR')]
+        # Un tri sur le libellé placerait '<25' après '60+'
+        self.assertEqual(buckets, ['<25', '55-59', '60+'])
+        self.assertEqual(buckets, sorted(buckets, key=resp.data['age_buckets'].index))
+
+    def test_âge_révolu_selon_l_anniversaire(self):
+        from .analytics import demographics
+        Employee.objects.filter(pk=self.young.pk).update(birth_date=date(2000, 6, 15))
+        employees = Employee.objects.filter(pk=self.young.pk)
+        before = demographics(employees, date(2025, 6, 14), 1)['pyramid'][0]['bucket']
+        on_birthday = demographics(employees, date(2025, 6, 15), 1)['pyramid'][0]['bucket']
+        self.assertEqual((before, on_birthday), ('<25', '25-29'))
+
+    def test_départs_à_la_retraite_sur_n_années(self):
+        resp = self._get(self.admin)
+        # 61 ans : départ déjà passé, hors prévision
+        self.assertEqual(self._retirements(resp), {
+            (self.year + 1, 'DEM-OTHER', 'DEM-DIR'): 1,
+            (self.year + 2, 'DEM-DEPT', 'DEM-DIR'): 1,
+        })
+        self.assertEqual(resp.data['retirement_age'], 60)
+        self.assertEqual(self._retirements(self._get(self.admin, years=2)),
+                         {(self.year + 1, 'DEM-OTHER', 'DEM-DIR'): 1})
+
+    def test_périmètre_entreprise_et_manager(self):
+        resp = self._get(self.ent_user)
+        self.assertEqual({row['department_name'] for row in resp.data['pyramid']}, {'DEM-DEPT'})
+        self.assertEqual(sum(row['count'] for row in resp.data['pyramid']), 3)
+
+        resp = self._get(self.mgr_user)
+        self.assertEqual(self._pyramid(resp), {('<25', 'female'): 1, ('55-59', 'male'): 1, ('55-59', 'female'): 1})
+        self.assertEqual(len(resp.data['retirements']), 2)
+
+    def test_cache_et_invalidation(self):
+        self.client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(2):
+            self.client.get('/api/analytics/demographics/')
+        with self.assertNumQueries(0):
+            resp = self.client.get('/api/analytics/demographics/')
+        self.assertEqual(sum(row['count'] for row in resp.data['pyramid']), 6)
+
+        # Une écriture d'agent rend l'entrée obsolète
+        self.senior.status = 'inactive'
+        self.senior.save()
+        resp = self.client.get('/api/analytics/demographics/')
+        self.assertEqual(sum(row['count'] for row in resp.data['pyramid']), 5)
+
+    def test_validation_et_accès(self):
+        self.assertEqual(self._get(self.admin, years='abc').status_code, 400)
+        self.assertEqual(self._get(self.admin, years=0).status_code, 400)
+        self.assertEqual(self._get(self.admin, years=41).status_code, 400)
+        self.assertEqual(self._get(make_regular_user('dem_emp')).status_code, 403)
+
+
+@override_settings(CHECKIN_FLUSH_INTERVAL=0.2)
+class TestCheckInBufferConcurrency(TransactionTestCase):
+    """Les pointages concurrents sont regroupés en peu d'upserts et tous acquittés"""
+
+    def test_pointages_concurrents_regroupés(self):
+        import threading
+        from django.db import connection
+        from .checkin import CheckInBuffer
+
+        dept = make_department('CHK-CONC')
+        employees = [
+            make_employee(dept, first_name=f'Conc{i}', last_name='Agent') for i in range(40)
+        ]
+        buffer = CheckInBuffer()
+        results, errors = [], []
+
+        def worker(emp_id):
+            try:
+                results.append(buffer.submit(emp_id))
+            except Exception as exc:  # pragma: no cover - remonté par l'assertion
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(e.id,)) for e in employees]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 40)
+        self.assertEqual(Attendance.objects.count(), 40)
+        self.assertLess(buffer.flushes, 40)
+
+
+class TestPaidLeaveBalanceConcurrency(TransactionTestCase):
+    """Des demandes simultanées ne peuvent pas dépasser le quota annuel"""
+
+    def test_demandes_parallèles_sérialisées(self):
+        import threading
+        from django.db import connection
+        from .serializers import LeaveSerializer
+
+        dept = make_department('BAL-CONC')
+        emp = make_employee(dept, first_name='Conc', last_name='Solde')
+        first = next_monday(date(date.today().year, 2, 1))
+        barrier = threading.Barrier(6)
+        accepted, refused, errors = [], [], []
+
+        def worker(index):
+            # 6 demandes de 10 jours ouvrés sur des périodes disjointes : 3 au plus tiennent dans 30 jours
+            start = first + timedelta(days=14 * index)
+            serializer = LeaveSerializer(data={
+                'employee': emp.id, 'leave_type': 'paid', 'reason': 'Concurrence',
+                'start_date': str(start), 'end_date': str(start + timedelta(days=11)),
+            })
+            try:
+                serializer.is_valid(raise_exception=True)
+                barrier.wait()
+                serializer.save()
+                accepted.append(index)
+            except ValidationError:
+                refused.append(index)
+            except Exception as exc:  # pragma: no cover - remonté par l'assertion
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual((len(accepted), len(refused)), (3, 3))
+        self.assertEqual(emp.paid_leave_usage()['pending'], 30)
+
+
+@override_settings(NOTIFICATION_STREAM_LISTEN=True)
+class TestNotificationStreamListen(TransactionTestCase):
+    """Les événements publiés par un autre processus arrivent par LISTEN/NOTIFY"""
+
+    def test_événement_d_un_autre_processus(self):
+        from .notification_stream import NotificationBroker
+        listener, publisher = NotificationBroker(), NotificationBroker()
+        self.addCleanup(listener.stop_listener)
+        sub = listener.subscribe({'role': 'admin', 'department': None, 'directions': set()})
+
+        publisher.publish('read', [{'d': 1, 'r': 'LST-DIR', 'id': 42}])
+        event = sub.get(timeout=5)
+        self.assertIsNotNone(event)
+        self.assertEqual(event['event'], 'read')
+        self.assertEqual(event['items'], [{'d': 1, 'r': 'LST-DIR', 'id': 42}])
+        self.assertTrue(listener.replay(sub, event['id'] - 1))
+
+    def _due_notification(self):
+        dept = make_department('LST-DEPT')
+        emp = make_employee(dept, first_name='Lst', last_name='Agent')
+        # Alarme J-7 due
+        start = date.today() + timedelta(days=3)
+        leave = Leave.objects.create(
+            employee=emp, leave_type='sick', reason='Test', status='approved',
+            start_date=start, end_date=start + timedelta(days=1),
+        )
+        return LeaveNotification.objects.get(leave=leave, trigger_date__lte=date.today())
+
+    def test_compteurs_ajustés_sans_flux_ouvert(self):
+        import json
+        import time as time_module
+        from django.db import connection
+        from .notification_counts import unread_counters
+        from .notification_stream import CHANNEL, notification_broker
+        self.addCleanup(unread_counters.clear)
+        self.addCleanup(notification_broker.stop_listener)
+        notif = self._due_notification()
+        admin = {'role': 'admin'}
+
+        # Première lecture : l'écoute démarre sans qu'aucun flux ne soit ouvert
+        self.assertEqual(unread_counters.count(admin), 1)
+        self.assertTrue(notification_broker.receives_all_events())
+
+        # Un autre processus marque l'alarme comme lue et publie l'événement
+        LeaveNotification.objects.filter(pk=notif.pk).update(is_read=True)
+        body = {'event': 'read', 'items': [{'d': notif.leave.employee.department_id, 'r': None, 'id': notif.pk}]}
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [
+                CHANNEL, json.dumps({'id': 10 ** 9, 'origin': 'autre-processus', 'body': body}),
+            ])
+        deadline = time_module.monotonic() + 5
+        while unread_counters.count(admin) and time_module.monotonic() < deadline:
+            time_module.sleep(0.05)
+        self.assertEqual(unread_counters.count(admin), 0)
+
+    def test_compteurs_lus_en_base_sans_écoute(self):
+        from unittest import mock
+        from .notification_counts import unread_counters
+        from .notification_stream import notification_broker
+        self.addCleanup(unread_counters.clear)
+        notification_broker.stop_listener()
+        notif = self._due_notification()
+        unread_counters.clear()
+        admin = {'role': 'admin'}
+
+        # Connexion LISTEN indisponible : chaque lecture interroge la base
+        with mock.patch.object(notification_broker, 'start_listener'):
+            with self.assertNumQueries(1):
+                self.assertEqual(unread_counters.count(admin), 1)
+            LeaveNotification.objects.filter(pk=notif.pk).update(is_read=True)
+            with self.assertNumQueries(1):
+                self.assertEqual(unread_counters.count(admin), 0)
+        self.assertEqual(unread_counters._counts, {})
@@ -7,15 +7,31 @@ Routes automatiques (DefaultRouter) :
     /api/directions/          — Directions (lecture seule)
     /api/passwords/           — Mots de passe chiffrés (admins uniquement)
     /api/departments/         — Entreprises prestataires (CRUD)
-    /api/employees/           — Agents contractuels (CRUD)
-    /api/leaves/              — Demandes de congé (CRUD + actions approve/reject/pending)
-    /api/attendances/         — Pointages de présence (CRUD + actions today/by_employee)
+    /api/employees/           — Agents contractuels (CRUD + actions me/badge/revoke_badge)
+    /api/leaves/              — Demandes de congé (CRUD + actions approve/reject/pending/occupancy/
+                                bulk_approve/bulk_reject)
+    /api/attendances/         — Pointages de présence (CRUD + actions today/by_employee/hours_summary/calendar/
+                                bulk_mark/import)
+    Les listes agents, congés et présences acceptent ?updated_since= (synchronisation
+    incrémentale avec pierres tombales, voir api.delta_sync).
 
 Routes manuelles :
     /api/auth/register/       — Création d'un compte utilisateur
     /api/auth/login/          — Authentification JWT (retourne access + refresh tokens)
     /api/auth/change-password/— Modification du mot de passe authentifié
     /api/dashboard/stats/     — Statistiques du tableau de bord (filtrées par rôle)
+    /api/dashboard/bootstrap/ — Tableau de bord : entreprises, agents, congés et présences récentes du périmètre
+    /api/me/bootstrap/        — Portail employé : fiche, congés, solde et listes de référence en une réponse
+    /api/checkin/             — Pointage rapide d'arrivée (tampon regroupant les écritures, badge signé accepté)
+    /api/notifications/stream/— Flux temps réel des alarmes de congés (Server-Sent Events, ?ticket=)
+    /api/notifications/stream/ticket/ — Ticket de flux signé de courte durée (POST)
+
+Statistiques (vues matérialisées, rafraîchies par refresh_analytics) :
+    /api/analytics/headcount/   — Effectifs mensuels par entreprise ou direction
+    /api/analytics/absenteeism/ — Taux d'absence et de retard mensuels
+    /api/analytics/leave-days/  — Jours de congés approuvés par mois et par type
+    /api/analytics/demographics/ — Pyramide des âges et départs à la retraite
+                                   (agrégés en base à la demande, en cache)
 
 Rapports Excel (GET, authentifié, retourne un fichier .xlsx) :
     /api/reports/attendance/  — Rapport de présence
@@ -31,6 +47,12 @@ from .views import (
     LeaveViewSet, AttendanceViewSet, LeaveNotificationViewSet,
     RegisterView, LoginView, ChangePasswordView, DashboardStatsView,
 )
+from .views_analytics import (
+    AbsenteeismAnalyticsView, DemographicsAnalyticsView, HeadcountAnalyticsView, LeaveDaysAnalyticsView,
+)
+from .views_bootstrap import DashboardBootstrapView, MeBootstrapView
+from .views_checkin import CheckInView
+from .views_notifications import NotificationStreamTicketView, NotificationStreamView
 from .views_reports import (
     AttendanceReportView, LeavesReportView, DepartmentsReportView, CompleteReportView,
 )
@@ -45,11 +67,22 @@ router.register(r'attendances', AttendanceViewSet)
 router.register(r'notifications', LeaveNotificationViewSet)
 
 urlpatterns = [
+    # Avant le routeur : 'stream' serait sinon lu comme l'identifiant d'une alarme
+    path('notifications/stream/', NotificationStreamView.as_view(), name='notifications-stream'),
+    path('notifications/stream/ticket/', NotificationStreamTicketView.as_view(), name='notifications-stream-ticket'),
     path('', include(router.urls)),
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/login/', LoginView.as_view(), name='login'),
     path('auth/change-password/', ChangePasswordView.as_view(), name='change-password'),
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('dashboard/bootstrap/', DashboardBootstrapView.as_view(), name='dashboard-bootstrap'),
+    path('me/bootstrap/', MeBootstrapView.as_view(), name='me-bootstrap'),
+    path('checkin/', CheckInView.as_view(), name='checkin'),
+    # Statistiques (vues matérialisées)
+    path('analytics/headcount/', HeadcountAnalyticsView.as_view(), name='analytics-headcount'),
+    path('analytics/absenteeism/', AbsenteeismAnalyticsView.as_view(), name='analytics-absenteeism'),
+    path('analytics/leave-days/', LeaveDaysAnalyticsView.as_view(), name='analytics-leave-days'),
+    path('analytics/demographics/', DemographicsAnalyticsView.as_view(), name='analytics-demographics'),
     # Rapports Excel
     path('reports/attendance/', AttendanceReportView.as_view(), name='report-attendance'),
     path('reports/leaves/', LeavesReportView.as_view(), name='report-leaves'),
@@ -4,17 +4,22 @@ Vues et ViewSets de l'API REST du système de gestion du personnel contractuel.
 Architecture :
   get_user_context(user)  — Fonction utilitaire déterminant le rôle et le périmètre
                             d'accès d'un utilisateur (admin / entreprise / manager / employee).
+  get_scoped_employees()  — Employés du périmètre d'un utilisateur (traitements en masse).
+  get_visible_departments() — Entreprises visibles par un utilisateur.
+  get_own_employee(user)  — Fiche agent liée au compte (portail employé).
 
   RoleFilterMixin         — Mixin générique appliquant le filtrage par rôle sur n'importe
                             quel queryset, configurable via des attributs de classe.
+  DeltaSyncMixin          — Synchronisation incrémentale ?updated_since= des listes
+                            (agents, congés, présences ; voir api.delta_sync).
 
   ViewSets (CRUD complet) :
     DirectionViewSet       — Directions (lecture seule)
     PasswordRecordViewSet  — Mots de passe chiffrés (admins uniquement)
     DepartmentViewSet      — Entreprises prestataires
-    EmployeeViewSet        — Agents contractuels
-    LeaveViewSet           — Demandes de congé (avec workflow d'approbation)
-    AttendanceViewSet      — Pointages de présence
+    EmployeeViewSet        — Agents contractuels (avec fiche de l'utilisateur, émission/révocation de badges)
+    LeaveViewSet           — Demandes de congé (avec workflow d'approbation et planning d'occupation)
+    AttendanceViewSet      — Pointages de présence (avec pointage groupé et import CSV/XLSX)
 
   APIViews (endpoints dédiés) :
     RegisterView           — Création de compte utilisateur
@@ -34,17 +39,43 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView, exception_handler as drf_exception_handler
 from rest_framework.throttling import AnonRateThrottle
+from rest_framework.parsers import MultiPartParser
+from rest_framework.pagination import PageNumberPagination
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, FilteredRelation, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import Direction, ManagerProfile, CompanyProfile, Department, Employee, Leave, Attendance, PasswordRecord, LeaveNotification
+from django.utils import timezone
+from .models import (
+    Direction, ManagerProfile, CompanyProfile, Department, Employee, Leave, Attendance, PasswordRecord,
+    LeaveNotification, DeletionLog,
+)
 from .serializers import (
     DirectionSerializer, PasswordRecordSerializer, DepartmentSerializer, EmployeeSerializer,
-    LeaveSerializer, AttendanceSerializer,
-    RegisterSerializer, UserSerializer, LeaveNotificationSerializer
+    LeaveSerializer, LeaveBulkActionSerializer, AttendanceSerializer, AttendanceBulkMarkSerializer,
+    RegisterSerializer, UserSerializer, LeaveNotificationSerializer, preload_leave_figures,
+)
+from .attendance_bulk import (
+    ATTENDANCE_IMPORT_BATCH_SIZE, PunchFileError, parse_punch_file, ingest_punches,
+    upsert_attendances,
 )
+from .badges import issue_badge, revoke_badges
+from .caching import (
+    conditional_response, dashboard_stats_cache_key, dashboard_stats_version, get_or_refresh,
+    invalidate_dashboard_stats, scope_cache_key, today_attendance_cache_key, today_attendance_cache_ttl,
+)
+from .delta_sync import DeltaSyncMixin
+from .leave_planning import GROUP_BY_CHOICES, MAX_OCCUPANCY_DAYS, leave_occupancy
+from .notification_counts import unread_counters
+from .notification_stream import notification_broker, publish_on_commit
+from .signals import bulk_create_leave_notifications
 
 logger = logging.getLogger('api')
 security_logger = logging.getLogger('api.security')
@@ -141,6 +172,72 @@ def get_user_context(user):
     return {'role': 'employee'}
 
 
+def get_scoped_employees(user, ctx=None):
+    """Retourne les employés appartenant au périmètre d'un utilisateur.
+
+    Applique les mêmes règles que RoleFilterMixin, directement sur le modèle
+    Employee. Utilisé par les traitements en masse (import, pointage groupé)
+    qui doivent restreindre les écritures au périmètre de l'appelant.
+
+    Args:
+        user (User): Utilisateur Django authentifié.
+        ctx (dict | None): Contexte déjà calculé par get_user_context (évite
+            de le recalculer).
+
+    Returns:
+        QuerySet[Employee]: Employés visibles par l'utilisateur.
+    """
+    ctx = ctx or get_user_context(user)
+    role = ctx['role']
+    qs = Employee.objects.all()
+
+    if role == 'admin':
+        return qs
+    if role == 'entreprise':
+        return qs.filter(department=ctx['department'])
+    if role == 'manager':
+        if ctx['directions']:
+            return qs.filter(direction__in=ctx['directions'])
+        return qs.none()
+    return qs.filter(user=user)
+
+
+def get_visible_departments(user, ctx=None):
+    """Retourne les entreprises visibles par un utilisateur.
+
+    Args:
+        user (User): Utilisateur Django authentifié.
+        ctx (dict | None): Contexte déjà calculé par get_user_context.
+
+    Returns:
+        QuerySet[Department]: Toutes les entreprises (admin, manager), la
+            sienne (entreprise) ou celle de rattachement (employee).
+    """
+    ctx = ctx or get_user_context(user)
+    role = ctx['role']
+
+    if role in ('admin', 'manager'):
+        return Department.objects.all()
+    if role == 'entreprise':
+        return Department.objects.filter(id=ctx['department'].id)
+    # employee : accès limité à son entreprise de rattachement
+    return Department.objects.filter(employees__user=user)
+
+
+def get_own_employee(user):
+    """Retourne la fiche agent liée au compte de l'utilisateur.
+
+    Une requête : l'entreprise et le compte sont chargés avec la fiche.
+
+    Args:
+        user (User): Utilisateur Django authentifié.
+
+    Returns:
+        Employee | None: Fiche liée par Employee.user, ou None.
+    """
+    return Employee.objects.select_related('department', 'user').filter(user=user).first()
+
+
 class RoleFilterMixin:
     """Mixin réutilisable pour le filtrage des querysets selon le rôle utilisateur.
 
@@ -172,11 +269,13 @@ class RoleFilterMixin:
     direction_filter_field = 'employee__direction__in'
     employee_filter_field = 'employee__user'
 
-    def get_role_filtered_queryset(self, queryset):
+    def get_role_filtered_queryset(self, queryset, ctx=None):
         """Filtre le queryset selon le rôle de l'utilisateur authentifié.
 
         Args:
             queryset (QuerySet): Queryset de base non filtré.
+            ctx (dict | None): Contexte déjà calculé par get_user_context (évite
+                de le recalculer).
 
         Returns:
             QuerySet: Queryset filtré selon le rôle et le périmètre de l'utilisateur.
@@ -186,7 +285,7 @@ class RoleFilterMixin:
                               ou queryset vide si le manager n'a aucune direction
                 - employee  → filtrée par l'utilisateur lui-même (employee_filter_field)
         """
-        ctx = get_user_context(self.request.user)
+        ctx = ctx or get_user_context(self.request.user)
         role = ctx['role']
 
         if role == 'admin':
@@ -283,21 +382,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         Returns:
             QuerySet[Department]: Queryset filtré selon le rôle.
         """
-        ctx = get_user_context(self.request.user)
-        role = ctx['role']
-
-        if role in ('admin', 'manager'):
-            return Department.objects.all()
-        if role == 'entreprise':
-            return Department.objects.filter(id=ctx['department'].id)
-        # employee : accès limité à son entreprise de rattachement
-        try:
-            emp = self.request.user.employee_profile
-            if emp.department:
-                return Department.objects.filter(id=emp.department.id)
-        except Employee.DoesNotExist:
-            pass
-        return Department.objects.none()
+        return get_visible_departments(self.request.user)
 
     @action(detail=True, methods=['get'])
     def employees(self, request, pk=None):
@@ -316,7 +401,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class EmployeeViewSet(RoleFilterMixin, viewsets.ModelViewSet):
+class EmployeeViewSet(DeltaSyncMixin, RoleFilterMixin, viewsets.ModelViewSet):
     """ViewSet CRUD pour les agents contractuels.
 
     Hérite de RoleFilterMixin avec des champs de filtre adaptés au modèle Employee
@@ -328,13 +413,15 @@ class EmployeeViewSet(RoleFilterMixin, viewsets.ModelViewSet):
         direction_filter_field = 'direction__in'
         employee_filter_field  = 'user'
 
-    La pagination est désactivée (retour de la liste complète).
+    La pagination est désactivée (retour de la liste complète) ; ?updated_since=
+    ne renvoie que les agents modifiés ou supprimés depuis (DeltaSyncMixin).
     """
 
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = None
+    delta_resource = DeletionLog.RESOURCE_EMPLOYEE
     filterset_fields = ['department', 'status', 'position']
     search_fields = ['first_name', 'last_name', 'email', 'position']
     ordering_fields = ['created_at', 'hire_date', 'last_name']
@@ -378,8 +465,90 @@ class EmployeeViewSet(RoleFilterMixin, viewsets.ModelViewSet):
                 })
         return Response(result)
 
+    @action(detail=False, methods=['get'])
+    def me(self, request):
+        """Retourne la fiche agent de l'utilisateur connecté.
+
+        Remplace le téléchargement de toute la liste des agents par le portail
+        employé. Trois requêtes : fiche (avec entreprise et compte), congés
+        payés de l'année et droits acquis.
+
+        Args:
+            request (Request): Requête HTTP GET authentifiée.
+
+        Returns:
+            Response: Fiche sérialisée (EmployeeSerializer), ou HTTP 404 si
+                aucune fiche n'est liée au compte.
+        """
+        employee = get_own_employee(request.user)
+        if employee is None:
+            return Response(
+                {"error": "Aucune fiche agent n'est liée à ce compte."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        preload_leave_figures([employee])
+        return Response(EmployeeSerializer(employee, context={'request': request}).data)
+
+    @action(detail=True, methods=['post'])
+    def badge(self, request, pk=None):
+        """Émet un badge de pointage signé (à imprimer sous forme de QR code).
+
+        Réservé aux utilisateurs is_staff, dans la limite de leur périmètre.
+
+        Args:
+            request (Request): Requête HTTP POST (corps optionnel {'validity_days': int}).
+            pk (str): Identifiant de l'employé.
+
+        Returns:
+            Response: {'token', 'serial', 'expires_at'} (HTTP 201), ou HTTP 403.
+        """
+        if not request.user.is_staff and not request.user.is_superuser:
+            return Response(
+                {"error": "Vous n'avez pas la permission d'émettre un badge."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        employee = self.get_object()
+        try:
+            validity_days = int(request.data.get('validity_days') or 0) or None
+        except (TypeError, ValueError):
+            validity_days = None
+        token, badge = issue_badge(employee, issued_by=request.user, validity_days=validity_days)
+        logger.info(
+            "Badge %s émis pour l'employé #%s par user='%s'",
+            badge.serial, employee.pk, request.user.username,
+        )
+        return Response({
+            'token': token,
+            'serial': badge.serial,
+            'expires_at': badge.expires_at,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def revoke_badge(self, request, pk=None):
+        """Révoque un badge précis (`serial`) ou tous les badges actifs d'un employé.
+
+        Args:
+            request (Request): Requête HTTP POST (corps optionnel {'serial': str}).
+            pk (str): Identifiant de l'employé.
+
+        Returns:
+            Response: {'revoked': list[str]} (HTTP 200), ou HTTP 403.
+        """
+        if not request.user.is_staff and not request.user.is_superuser:
+            return Response(
+                {"error": "Vous n'avez pas la permission de révoquer un badge."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        employee = self.get_object()
+        revoked = revoke_badges(employee=employee, serial=request.data.get('serial') or None)
+        security_logger.info(
+            "Badge(s) %s de l'employé #%s révoqué(s) par user='%s'",
+            ', '.join(revoked) or '-', employee.pk, request.user.username,
+        )
+        return Response({'revoked': revoked})
+
 
-class LeaveViewSet(RoleFilterMixin, viewsets.ModelViewSet):
+class LeaveViewSet(DeltaSyncMixin, RoleFilterMixin, viewsets.ModelViewSet):
     """ViewSet CRUD pour les demandes de congé, avec workflow d'approbation à deux niveaux.
 
     Workflow d'approbation :
@@ -390,10 +559,12 @@ class LeaveViewSet(RoleFilterMixin, viewsets.ModelViewSet):
 
     L'admin peut approuver directement (court-circuit des deux étapes).
     La suppression est interdite pour les congés déjà approuvés.
+    ?updated_since= ne renvoie que les congés modifiés ou supprimés depuis (DeltaSyncMixin).
     """
 
     queryset = Leave.objects.all()
     pagination_class = None
+    delta_resource = DeletionLog.RESOURCE_LEAVE
     serializer_class = LeaveSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['employee', 'status', 'leave_type']
@@ -505,6 +676,107 @@ class LeaveViewSet(RoleFilterMixin, viewsets.ModelViewSet):
         serializer = self.get_serializer(leave)
         return Response(serializer.data)
 
+    # Transitions des traitements groupés : (action, rôle) → (statuts de départ, statut d'arrivée)
+    BULK_TRANSITIONS = {
+        ('approve', 'admin'): (('pending', 'manager_approved'), 'approved'),
+        ('approve', 'entreprise'): (('manager_approved',), 'approved'),
+        ('approve', 'manager'): (('pending',), 'manager_approved'),
+        ('reject', 'admin'): (('pending', 'manager_approved'), 'rejected'),
+        ('reject', 'entreprise'): (('pending', 'manager_approved'), 'rejected'),
+        ('reject', 'manager'): (('pending', 'manager_approved'), 'rejected'),
+    }
+
+    def _bulk_transition(self, request, action_name):
+        """Applique approve/reject à une liste de congés en une transaction.
+
+        Les congés du périmètre sont verrouillés par un unique SELECT … FOR UPDATE
+        (ordre des identifiants, pour éviter les interblocages), les règles de
+        transition du rôle sont appliquées en mémoire, puis les congés éligibles
+        sont mis à jour par un seul UPDATE. Les alarmes des congés approuvés
+        sont créées en une requête.
+
+        Args:
+            request (Request): Corps JSON validé par LeaveBulkActionSerializer.
+            action_name (str): 'approve' ou 'reject'.
+
+        Returns:
+            Response: {'updated': int, 'results': [{'id', 'outcome', 'status', 'error'?}]}
+                où outcome vaut 'updated', 'not_found' ou 'invalid_status'.
+        """
+        user = request.user
+        if not user.is_staff and not user.is_superuser:
+            return Response(
+                {"error": "Vous n'avez pas la permission de traiter des congés."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        serializer = LeaveBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        ctx = get_user_context(user)
+        allowed_from, target = self.BULK_TRANSITIONS[(action_name, ctx['role'])]
+
+        if target == 'manager_approved':
+            updates = {'manager_approved_by': user}
+        elif ctx['role'] == 'admin' and target == 'approved':
+            # L'admin court-circuite la validation manager
+            updates = {
+                'approved_by': user,
+                'manager_approved_by': Coalesce(F('manager_approved_by'), Value(user.pk)),
+            }
+        else:
+            updates = {'approved_by': user}
+
+        results = {}
+        with transaction.atomic():
+            leaves = list(
+                self.get_role_filtered_queryset(Leave.objects.filter(id__in=ids), ctx)
+                .select_for_update(of=('self',))
+                .order_by('id')
+                .only('id', 'status', 'start_date')
+            )
+            eligible = []
+            for leave in leaves:
+                if leave.status in allowed_from:
+                    eligible.append(leave)
+                    results[leave.pk] = {'id': leave.pk, 'outcome': 'updated', 'status': target}
+                else:
+                    results[leave.pk] = {
+                        'id': leave.pk, 'outcome': 'invalid_status', 'status': leave.status,
+                        'error': f"Transition impossible depuis le statut '{leave.status}'.",
+                    }
+            if eligible:
+                Leave.objects.filter(id__in=[leave.pk for leave in eligible]).update(
+                    status=target, updated_at=timezone.now(), **updates
+                )
+                # QuerySet.update() n'émet pas de signal post_save
+                invalidate_dashboard_stats()
+                if target == 'approved':
+                    bulk_create_leave_notifications(eligible)
+
+        logger.info(
+            "Traitement groupé %s : %s/%s congé(s) passé(s) au statut '%s' par user='%s'",
+            action_name, len(eligible), len(ids), target, user.username,
+        )
+        return Response({
+            'updated': len(eligible),
+            'results': [
+                results.get(pk, {'id': pk, 'outcome': 'not_found', 'status': None,
+                                 'error': "Congé introuvable ou hors périmètre."})
+                for pk in ids
+            ],
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        """Approuve (ou valide, pour un manager) une liste de congés. Voir _bulk_transition."""
+        return self._bulk_transition(request, 'approve')
+
+    @action(detail=False, methods=['post'])
+    def bulk_reject(self, request):
+        """Rejette une liste de congés en attente. Voir _bulk_transition."""
+        return self._bulk_transition(request, 'reject')
+
     def destroy(self, request, *args, **kwargs):
         """Supprime une demande de congé.
 
@@ -539,16 +811,77 @@ class LeaveViewSet(RoleFilterMixin, viewsets.ModelViewSet):
         serializer = self.get_serializer(pending_leaves, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def occupancy(self, request):
+        """Retourne l'occupation des congés jour par jour (qui est absent chaque jour).
+
+        Calcul en une requête SQL (série de jours jointe aux congés par
+        intervalle), dans le périmètre de l'utilisateur.
+
+        Args:
+            request (Request): Requête HTTP GET avec query params :
+                `from`, `to` (AAAA-MM-JJ, inclus ; défaut : aujourd'hui → +30 jours),
+                `group_by` ('direction' par défaut, ou 'department'),
+                `include_pending` (1 pour compter aussi les demandes en cours),
+                `capacity` (seuil unique ; sinon Direction.max_concurrent_leaves).
+
+        Returns:
+            Response: {'from', 'to', 'group_by', 'days': [{'date', 'total', 'groups'}]}
+                (HTTP 200), ou HTTP 400 si un paramètre est invalide.
+        """
+        from datetime import date, timedelta
+        params = request.query_params
+        try:
+            start = date.fromisoformat(params['from']) if params.get('from') else timezone.localdate()
+            end = date.fromisoformat(params['to']) if params.get('to') else start + timedelta(days=30)
+            capacity = int(params['capacity']) if params.get('capacity') else None
+        except ValueError:
+            return Response(
+                {"error": "from/to doivent être au format AAAA-MM-JJ et capacity un entier"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        group_by = params.get('group_by') or 'direction'
+        if group_by not in GROUP_BY_CHOICES:
+            return Response(
+                {"error": f"group_by doit valoir {' ou '.join(GROUP_BY_CHOICES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end < start or (end - start).days >= MAX_OCCUPANCY_DAYS:
+            return Response(
+                {"error": f"La période doit être croissante et couvrir au plus {MAX_OCCUPANCY_DAYS} jours"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        statuses = ['approved']
+        if params.get('include_pending') in ('1', 'true'):
+            statuses += ['pending', 'manager_approved']
+        days = leave_occupancy(
+            get_scoped_employees(request.user), start, end,
+            group_by=group_by, statuses=statuses, capacity=capacity,
+        )
+        return Response({'from': start, 'to': end, 'group_by': group_by, 'days': days})
 
-class AttendanceViewSet(RoleFilterMixin, viewsets.ModelViewSet):
+
+class AttendanceHistoryPagination(PageNumberPagination):
+    """Pagination de l'historique de présence d'un employé (un mois par page)."""
+
+    page_size = 31
+    page_size_query_param = 'page_size'
+    max_page_size = 366
+
+
+class AttendanceViewSet(DeltaSyncMixin, RoleFilterMixin, viewsets.ModelViewSet):
     """ViewSet CRUD pour les enregistrements de présence (pointages).
 
     La contrainte unique_together (employee, date) est gérée au niveau du modèle.
-    Le calcul des heures travaillées est délégué à la propriété Attendance.hours_worked.
+    Les heures travaillées sont une colonne générée par la base (Attendance.hours_worked),
+    agrégée en SQL par l'action hours_summary.
+    ?updated_since= ne renvoie que les présences modifiées ou supprimées depuis (DeltaSyncMixin).
     """
 
     queryset = Attendance.objects.all()
     pagination_class = None
+    delta_resource = DeletionLog.RESOURCE_ATTENDANCE
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['employee', 'status', 'date']
@@ -563,31 +896,78 @@ class AttendanceViewSet(RoleFilterMixin, viewsets.ModelViewSet):
         """
         return self.get_role_filtered_queryset(Attendance.objects.all())
 
+    @staticmethod
+    def _date_bounds(request, default_from=None, default_to=None):
+        """Construit les filtres de dates à partir de `date_from` / `date_to` (inclus).
+
+        Args:
+            request (Request): Requête HTTP GET.
+            default_from (date | None): Borne basse si `date_from` est absent.
+            default_to (date | None): Borne haute si `date_to` est absent.
+
+        Returns:
+            dict: Lookups {'date__gte': date, 'date__lte': date} renseignés.
+
+        Raises:
+            ValueError: Si une date n'est pas au format AAAA-MM-JJ.
+        """
+        from datetime import date
+        bounds = {}
+        for param, lookup, default in (
+            ('date_from', 'date__gte', default_from),
+            ('date_to', 'date__lte', default_to),
+        ):
+            value = request.query_params.get(param)
+            value = date.fromisoformat(value) if value else default
+            if value is not None:
+                bounds[lookup] = value
+        return bounds
+
     @action(detail=False, methods=['get'])
     def today(self, request):
-        """Retourne les enregistrements de présence pour la date du jour.
+        """Retourne les présences du jour visibles par l'utilisateur.
+
+        Requête filtrée par rôle, avec jointure sur l'employé (pas de requête
+        par ligne pour employee_name) et appuyée sur l'index (date, status).
+        La réponse est mise en cache par périmètre pendant
+        ATTENDANCE_TODAY_CACHE_TTL secondes et invalidée dès qu'une présence
+        du jour est écrite.
 
         Args:
-            request (Request): Requête HTTP GET.
+            request (Request): Requête HTTP GET (query param optionnel `status`).
 
         Returns:
             Response: Liste des présences d'aujourd'hui.
         """
-        from datetime import date
-        today_attendance = self.queryset.filter(date=date.today())
-        serializer = self.get_serializer(today_attendance, many=True)
-        return Response(serializer.data)
+        ctx = get_user_context(request.user)
+        day = timezone.localdate()
+        status_filter = request.query_params.get('status') or ''
+        cache_key = f"{today_attendance_cache_key(scope_cache_key(ctx, request.user), day)}:{status_filter}"
+        data = cache.get(cache_key)
+        if data is None:
+            qs = self.get_role_filtered_queryset(Attendance.objects.filter(date=day), ctx)
+            if status_filter:
+                qs = qs.filter(status=status_filter)
+            qs = qs.select_related('employee').order_by('employee__last_name', 'employee__first_name')
+            data = self.get_serializer(qs, many=True).data
+            cache.set(cache_key, data, today_attendance_cache_ttl())
+        return Response(data)
 
     @action(detail=False, methods=['get'])
     def by_employee(self, request):
-        """Retourne l'historique de présence d'un employé donné.
+        """Retourne l'historique de présence paginé d'un employé donné.
+
+        L'employé doit appartenir au périmètre de l'utilisateur (sinon la
+        liste est vide). Les bornes `date_from` / `date_to` (AAAA-MM-JJ,
+        incluses) sont optionnelles ; la pagination suit `page` / `page_size`.
 
         Args:
-            request (Request): Requête HTTP GET avec query param `employee_id`.
+            request (Request): Requête HTTP GET avec query params `employee_id`,
+                `date_from`, `date_to`, `page`, `page_size`.
 
         Returns:
-            Response: Liste des présences de l'employé (HTTP 200),
-                      ou HTTP 400 si employee_id manquant.
+            Response: Page {'count', 'next', 'previous', 'results'} (HTTP 200),
+                      ou HTTP 400 si employee_id manquant ou paramètre invalide.
         """
         employee_id = request.query_params.get('employee_id')
         if not employee_id:
@@ -595,10 +975,258 @@ class AttendanceViewSet(RoleFilterMixin, viewsets.ModelViewSet):
                 {"error": "employee_id est requis"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        try:
+            employee_id = int(employee_id)
+            bounds = self._date_bounds(request)
+        except ValueError:
+            return Response(
+                {"error": "employee_id doit être un entier et les dates au format AAAA-MM-JJ"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        attendances = self.queryset.filter(employee_id=employee_id)
-        serializer = self.get_serializer(attendances, many=True)
-        return Response(serializer.data)
+        attendances = (
+            self.get_queryset()
+            .filter(employee_id=employee_id, **bounds)
+            .select_related('employee')
+            .order_by('-date')
+        )
+        paginator = AttendanceHistoryPagination()
+        page = paginator.paginate_queryset(attendances, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def hours_summary(self, request):
+        """Totalise les heures travaillées par employé sur une période.
+
+        L'agrégation est faite en base (Sum sur la colonne générée
+        hours_worked, GROUP BY employé), dans le périmètre de l'utilisateur.
+        Période par défaut : du 1er du mois courant à aujourd'hui.
+
+        Args:
+            request (Request): Requête HTTP GET avec query params optionnels
+                `date_from`, `date_to` (AAAA-MM-JJ, inclus).
+
+        Returns:
+            Response: {'date_from', 'date_to', 'total_hours', 'employees': [
+                {'employee', 'employee_name', 'days_worked', 'hours'}]} (HTTP 200),
+                ou HTTP 400 si une date est invalide.
+        """
+        today = timezone.localdate()
+        try:
+            bounds = self._date_bounds(request, today.replace(day=1), today)
+        except ValueError:
+            return Response(
+                {"error": "Les dates doivent être au format AAAA-MM-JJ"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = (
+            self.get_queryset()
+            .filter(**bounds)
+            .values('employee', 'employee__first_name', 'employee__last_name')
+            .annotate(
+                days_worked=Count('id', filter=Q(hours_worked__gt=0)),
+                hours=Sum('hours_worked'),
+            )
+            .order_by('employee__last_name', 'employee__first_name')
+        )
+        employees = [
+            {
+                'employee': row['employee'],
+                'employee_name': f"{row['employee__first_name']} {row['employee__last_name']}",
+                'days_worked': row['days_worked'],
+                'hours': float(row['hours'] or 0),
+            }
+            for row in rows
+        ]
+        return Response({
+            'date_from': bounds['date__gte'],
+            'date_to': bounds['date__lte'],
+            'total_hours': round(sum(e['hours'] for e in employees), 2),
+            'employees': employees,
+        })
+
+    # Codage d'un statut de présence sur un caractère (attendances/calendar)
+    CALENDAR_CODES = {'present': 'P', 'absent': 'A', 'late': 'R', 'half-day': 'D'}
+    CALENDAR_EMPTY = '-'
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """Retourne la matrice compacte employé × jour des présences d'un mois.
+
+        Une seule requête agrégée : les employés du périmètre sont joints à
+        leurs présences du mois (jointure filtrée sur la date, ce qui limite
+        la lecture à la partition du mois) et les statuts sont agrégés par
+        employé (ARRAY_AGG). Chaque ligne est encodée en une chaîne d'un
+        caractère par jour (voir `legend`), soit ~60 octets par agent.
+
+        Args:
+            request (Request): Requête HTTP GET avec query param `month`
+                (AAAA-MM, mois courant par défaut).
+
+        Returns:
+            Response: {'month', 'days', 'legend', 'employees': [[id, nom, statuts], ...]}
+                (HTTP 200), ou HTTP 400 si le mois est invalide.
+        """
+        import calendar as calendar_module
+        from datetime import date, datetime
+        month_param = request.query_params.get('month')
+        try:
+            start = (
+                datetime.strptime(month_param, '%Y-%m').date() if month_param
+                else timezone.localdate().replace(day=1)
+            )
+        except ValueError:
+            return Response(
+                {"error": "month doit être au format AAAA-MM"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        days = calendar_module.monthrange(start.year, start.month)[1]
+        end = date(start.year, start.month, days)
+
+        rows = (
+            get_scoped_employees(request.user)
+            .exclude(status='inactive')
+            .filter(hire_date__lte=end)
+            .annotate(month_attendances=FilteredRelation(
+                'attendances',
+                condition=Q(attendances__date__gte=start, attendances__date__lte=end),
+            ))
+            .values('id', 'first_name', 'last_name')
+            .annotate(
+                att_days=ArrayAgg('month_attendances__date', ordering='month_attendances__date'),
+                att_statuses=ArrayAgg('month_attendances__status', ordering='month_attendances__date'),
+            )
+            .order_by('last_name', 'first_name')
+        )
+
+        employees = []
+        for row in rows:
+            line = [self.CALENDAR_EMPTY] * days
+            for day, att_status in zip(row['att_days'], row['att_statuses']):
+                if day is not None:
+                    line[day.day - 1] = self.CALENDAR_CODES.get(att_status, self.CALENDAR_EMPTY)
+            employees.append([row['id'], f"{row['first_name']} {row['last_name']}", ''.join(line)])
+
+        return Response({
+            'month': start.strftime('%Y-%m'),
+            'days': days,
+            'legend': {code: value for value, code in self.CALENDAR_CODES.items()},
+            'employees': employees,
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk_mark(self, request):
+        """Pointe en une seule fois tous les employés du périmètre pour une date.
+
+        Le statut par défaut est appliqué à chaque employé actif du périmètre
+        de l'appelant, sauf ceux listés dans `exceptions` qui reçoivent leur
+        propre statut. L'écriture est un upsert ensembliste par lots, dans une
+        seule transaction : les présences existantes pour cette date sont mises
+        à jour (notes comprises), jamais dupliquées.
+        Réservé aux utilisateurs is_staff.
+
+        Args:
+            request (Request): Corps JSON validé par AttendanceBulkMarkSerializer.
+
+        Returns:
+            Response: {'date', 'marked', 'exceptions', 'ignored_exceptions'} (HTTP 200),
+                ou erreur (HTTP 403 si non autorisé, HTTP 400 si payload invalide).
+        """
+        user = request.user
+        if not user.is_staff and not user.is_superuser:
+            return Response(
+                {"error": "Vous n'avez pas la permission de pointer pour d'autres employés."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        serializer = AttendanceBulkMarkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        employee_ids = list(
+            get_scoped_employees(user).exclude(status='inactive').values_list('id', flat=True)
+        )
+        exceptions = {item['employee']: item for item in data['exceptions']}
+        default = {
+            'status': data['status'],
+            'check_in': data.get('check_in'),
+            'check_out': data.get('check_out'),
+        }
+
+        records = []
+        for employee_id in employee_ids:
+            values = exceptions.get(employee_id, default)
+            records.append(Attendance(
+                employee_id=employee_id,
+                date=data['date'],
+                status=values['status'],
+                check_in=values.get('check_in'),
+                check_out=values.get('check_out'),
+                notes=values.get('notes'),
+            ))
+        # Lots de taille fixe (limite de 65 535 paramètres par requête PostgreSQL),
+        # tous écrits dans la même transaction
+        upsert_attendances(records)
+
+        scoped = set(employee_ids)
+        ignored = sorted(pk for pk in exceptions if pk not in scoped)
+        logger.info(
+            "Pointage groupé du %s par user='%s' : %s employés (statut par défaut=%s)",
+            data['date'], user.username, len(records), data['status'],
+        )
+        return Response({
+            'date': data['date'],
+            'marked': len(records),
+            'exceptions': len(exceptions) - len(ignored),
+            'ignored_exceptions': ignored,
+        })
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """Importe en masse un fichier de pointage (CSV ou XLSX).
+
+        Les matricules sont résolus en une seule requête, limités au périmètre
+        de l'appelant, puis les présences sont insérées ou mises à jour par lots
+        (voir api.attendance_bulk). Réservé aux utilisateurs is_staff.
+
+        Args:
+            request (Request): Requête multipart avec le champ `file`
+                et le paramètre optionnel `batch_size`.
+
+        Returns:
+            Response: Statistiques d'import (HTTP 200), ou erreur
+                (HTTP 403 si non autorisé, HTTP 400 si fichier invalide).
+        """
+        user = request.user
+        if not user.is_staff and not user.is_superuser:
+            return Response(
+                {"error": "Vous n'avez pas la permission d'importer des pointages."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {"error": "Le fichier de pointage (champ 'file') est requis."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            batch_size = int(request.data.get('batch_size') or ATTENDANCE_IMPORT_BATCH_SIZE)
+        except (TypeError, ValueError):
+            batch_size = ATTENDANCE_IMPORT_BATCH_SIZE
+
+        try:
+            rows, errors = parse_punch_file(upload.read(), upload.name)
+        except PunchFileError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        stats = ingest_punches(rows, employees=get_scoped_employees(user), batch_size=max(batch_size, 1))
+        stats['errors'] = errors
+        logger.info(
+            "Import de pointages '%s' par user='%s' : %s lignes, %s créées, %s mises à jour",
+            upload.name, user.username, stats['rows'], stats['created'], stats['updated'],
+        )
+        return Response(stats)
 
 
 class RegisterView(APIView):
@@ -776,6 +1404,20 @@ class ChangePasswordView(APIView):
         return Response({"message": "Mot de passe modifié avec succès"})
 
 
+def _aggregate_sql(queryset, **aggregates):
+    """SQL d'une agrégation sans GROUP BY (toujours une ligne, même sur un ensemble vide).
+
+    Args:
+        queryset (QuerySet): Lignes agrégées (filtres de périmètre appliqués).
+        **aggregates: Agrégats nommés (Count, Sum…), éventuellement conditionnels (filter=Q(...)).
+
+    Returns:
+        tuple[str, tuple]: Requête SQL et ses paramètres.
+    """
+    qs = queryset.order_by().annotate(_one=Value(1)).values('_one').annotate(**aggregates).values(*aggregates)
+    return qs.query.sql_with_params()
+
+
 class DashboardStatsView(APIView):
     """Vue retournant les statistiques du tableau de bord filtrées par rôle.
 
@@ -785,69 +1427,101 @@ class DashboardStatsView(APIView):
       - manager   → données de ses directions uniquement
 
     Métriques :
-      - total_employees   : nombre d'agents dans le périmètre
-      - total_departments : nombre total d'entreprises (non filtré par rôle)
-      - present_today     : agents marqués 'present' aujourd'hui
-      - on_leave_today    : agents en congé approuvé couvrant la date du jour
+      - total_employees      : nombre d'agents dans le périmètre
+      - total_departments    : nombre total d'entreprises (non filtré par rôle)
+      - present_today        : agents marqués 'present' aujourd'hui
+      - late_today           : agents marqués 'late' aujourd'hui
+      - on_leave_today       : agents en congé approuvé couvrant la date du jour
+      - pending_approvals    : demandes en attente ('pending' ou 'manager_approved')
+      - leaves_starting_week : congés approuvés débutant cette semaine (lundi → dimanche)
+      - hours_worked_month   : heures travaillées depuis le 1er du mois (Sum en base)
+
+    Toutes les métriques sont lues en une seule requête SQL : une agrégation
+    conditionnelle (Count(filter=Q(...))) par table, jointes en produit
+    cartésien de lignes uniques. Le résultat est mis en cache par périmètre
+    (DASHBOARD_STATS_CACHE_TTL) et invalidé à chaque écriture d'un agent, d'un
+    congé ou d'une présence ; pendant un recalcul, les autres requêtes du même
+    périmètre reçoivent la valeur précédente (voir api.caching.get_or_refresh).
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        """Calcule et retourne les statistiques du tableau de bord.
+        """Retourne les statistiques du tableau de bord (en cache par périmètre).
 
         Args:
             request (Request): Requête HTTP GET authentifiée.
 
         Returns:
-            Response: Dict avec total_employees, total_departments,
-                      present_today, on_leave_today.
+            Response: Dict des métriques listées dans la docstring de la classe.
         """
-        from datetime import date
-
         ctx = get_user_context(request.user)
-        role = ctx['role']
+        # Compte employé : statistiques non filtrées, comme l'admin
+        scope = 'admin' if ctx['role'] == 'employee' else scope_cache_key(ctx, request.user)
+        stats = get_or_refresh(
+            dashboard_stats_cache_key(scope),
+            dashboard_stats_version(),
+            lambda: self._compute(ctx),
+            ttl=getattr(settings, 'DASHBOARD_STATS_CACHE_TTL', 15),
+            max_stale=getattr(settings, 'DASHBOARD_STATS_MAX_STALE', 300),
+        )
+        return Response(stats)
 
-        employees_qs = Employee.objects.all()
-        leaves_qs = Leave.objects.all()
-        attendance_qs = Attendance.objects.all()
+    @staticmethod
+    def _compute(ctx):
+        """Calcule les statistiques d'un périmètre (une requête SQL)."""
+        from datetime import date, timedelta
 
-        # Filtrer selon le périmètre du rôle
-        if role == 'entreprise':
-            dept = ctx['department']
-            employees_qs = employees_qs.filter(department=dept)
-            leaves_qs = leaves_qs.filter(employee__department=dept)
-            attendance_qs = attendance_qs.filter(employee__department=dept)
-        elif role == 'manager':
-            directions = ctx['directions']
-            if directions:
-                employees_qs = employees_qs.filter(direction__in=directions)
-                leaves_qs = leaves_qs.filter(employee__direction__in=directions)
-                attendance_qs = attendance_qs.filter(employee__direction__in=directions)
-            else:
-                employees_qs = employees_qs.none()
-                leaves_qs = leaves_qs.none()
-                attendance_qs = attendance_qs.none()
-
-        total_employees = employees_qs.count()
-        # total_departments n'est pas filtré par rôle (vue globale de la structure)
-        total_departments = Department.objects.count()
-        present_today = attendance_qs.filter(
-            date=date.today(),
-            status='present'
-        ).count()
-        on_leave_today = leaves_qs.filter(
-            start_date__lte=date.today(),
-            end_date__gte=date.today(),
-            status='approved'
-        ).count()
+        role = ctx['role']
+        today = date.today()
+        week_start = today - timedelta(days=today.weekday())
 
-        return Response({
-            'total_employees': total_employees,
-            'total_departments': total_departments,
-            'present_today': present_today,
-            'on_leave_today': on_leave_today,
-        })
+        def scoped(queryset, prefix=''):
+            # Filtrer selon le périmètre du rôle
+            if role == 'entreprise':
+                return queryset.filter(**{f'{prefix}department': ctx['department']})
+            if role == 'manager':
+                return queryset.filter(**{f'{prefix}direction__in': ctx['directions']})
+            return queryset
+
+        if role == 'manager' and not ctx['directions']:
+            # Périmètre vide : seul le nombre d'entreprises est lu
+            stats = dict.fromkeys(
+                ['total_employees', 'present_today', 'late_today', 'on_leave_today',
+                 'pending_approvals', 'leaves_starting_week', 'hours_worked_month'], 0,
+            )
+            stats['total_departments'] = Department.objects.count()
+            return stats
+
+        parts = [
+            _aggregate_sql(scoped(Employee.objects.all()), total_employees=Count('id')),
+            # total_departments n'est pas filtré par rôle (vue globale de la structure)
+            _aggregate_sql(Department.objects.all(), total_departments=Count('id')),
+            # Présences du mois (partitions du mois seulement), dont celles du jour
+            _aggregate_sql(
+                scoped(Attendance.objects.filter(date__gte=today.replace(day=1), date__lte=today), 'employee__'),
+                present_today=Count('id', filter=Q(date=today, status='present')),
+                late_today=Count('id', filter=Q(date=today, status='late')),
+                hours_worked_month=Coalesce(Sum('hours_worked'), Value(0, output_field=DecimalField())),
+            ),
+            _aggregate_sql(
+                scoped(Leave.objects.all(), 'employee__'),
+                on_leave_today=Count('id', filter=Q(status='approved', start_date__lte=today, end_date__gte=today)),
+                pending_approvals=Count('id', filter=Q(status__in=['pending', 'manager_approved'])),
+                leaves_starting_week=Count('id', filter=Q(
+                    status='approved', start_date__gte=week_start, start_date__lte=week_start + timedelta(days=6),
+                )),
+            ),
+        ]
+        sql = 'SELECT * FROM ' + ', '.join(f'({part_sql}) AS s{i}' for i, (part_sql, _) in enumerate(parts))
+        params = [param for _, part_params in parts for param in part_params]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            stats = dict(zip(columns, cursor.fetchone()))
+
+        stats['hours_worked_month'] = float(stats['hours_worked_month'])
+        return stats
 
 
 class LeaveNotificationViewSet(viewsets.GenericViewSet):
@@ -862,6 +1536,9 @@ class LeaveNotificationViewSet(viewsets.GenericViewSet):
       GET  /api/notifications/unread_count/ — Nombre d'alarmes non lues
       POST /api/notifications/{id}/mark_read/ — Marquer une alarme comme lue
       POST /api/notifications/mark_all_read/  — Marquer toutes les alarmes comme lues
+
+    Les mises à jour sont aussi poussées en temps réel par
+    GET /api/notifications/stream/ (voir api.views_notifications).
     """
 
     queryset = LeaveNotification.objects.all()
@@ -907,27 +1584,32 @@ class LeaveNotificationViewSet(viewsets.GenericViewSet):
             request (Request): Requête HTTP GET authentifiée.
 
         Returns:
-            Response: {'notifications': [...], 'unread_count': int}
+            Response: {'notifications': [...], 'unread_count': int}, avec ETag
+                (HTTP 304 si If-None-Match correspond).
         """
         qs = self._get_scoped_queryset(request).filter(is_read=False)
-        serializer = self.get_serializer(qs, many=True)
-        return Response({
-            'notifications': serializer.data,
-            'unread_count': qs.count(),
+        data = self.get_serializer(qs, many=True).data
+        return conditional_response(request, {
+            'notifications': data,
+            'unread_count': len(data),
         })
 
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Retourne uniquement le nombre d'alarmes non lues dues.
 
+        Le nombre provient des compteurs par périmètre gardés en mémoire
+        (api.notification_counts) : aucune requête tant qu'ils sont connus.
+
         Args:
             request (Request): Requête HTTP GET authentifiée.
 
         Returns:
-            Response: {'unread_count': int}
+            Response: {'unread_count': int}, avec ETag (HTTP 304 si
+                If-None-Match correspond).
         """
-        count = self._get_scoped_queryset(request).filter(is_read=False).count()
-        return Response({'unread_count': count})
+        count = unread_counters.count(get_user_context(request.user))
+        return conditional_response(request, {'unread_count': count})
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -963,5 +1645,8 @@ class LeaveNotificationViewSet(viewsets.GenericViewSet):
             Response: {'marked': int} (nombre d'alarmes marquées)
         """
         qs = self._get_scoped_queryset(request).filter(is_read=False)
-        count = qs.update(is_read=True)
+        rows = list(qs.values_list('id', 'leave__employee__department_id', 'leave__employee__direction'))
+        count = LeaveNotification.objects.filter(pk__in=[row[0] for row in rows]).update(is_read=True)
+        if rows:
+            publish_on_commit(lambda: notification_broker.publish_read(rows))
         return Response({'marked': count})
@@ -0,0 +1,193 @@
+"""
+Séries statistiques mensuelles pour les graphiques du tableau de bord.
+
+GET /api/analytics/headcount/?from=AAAA-MM&to=AAAA-MM&group_by=department|direction
+    Effectifs fin de mois, embauches et sorties du mois.
+GET /api/analytics/absenteeism/?from=&to=&group_by=direction|department
+    Pointages, absences, retards, taux d'absence et de retard, heures travaillées.
+GET /api/analytics/leave-days/?from=&to=&group_by=leave_type|department|direction
+    Jours ouvrés de congés approuvés.
+GET /api/analytics/demographics/?years=N
+    Pyramide des âges par sexe et départs à la retraite des N prochaines années
+    (10 par défaut), par entreprise et direction.
+
+Les séries sont lues dans les vues matérialisées de api.analytics (une requête
+sur quelques centaines de lignes précalculées), filtrées selon le périmètre
+de l'utilisateur (admin, entreprise, manager) ; les comptes employés n'y ont
+pas accès. Elles reflètent l'état au dernier passage de refresh_analytics.
+Période par défaut : les 12 derniers mois, mois courant inclus.
+
+La démographie est agrégée en base à la demande (api.analytics.demographics)
+et mise en cache par périmètre, jusqu'à la prochaine écriture d'un agent.
+"""
+
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .analytics import (
+    ATTENDANCE_VIEW, HEADCOUNT_VIEW, HISTORY_MONTHS, LEAVE_DAYS_VIEW, RETIREMENT_AGE,
+    UNKNOWN_AGE_BUCKET, age_bucket_labels, demographics, monthly_series,
+)
+from .caching import demographics_version, get_or_refresh, scope_cache_key
+from .months import add_months, month_start
+from .views import get_scoped_employees, get_user_context
+
+# Horizon des prévisions de départs à la retraite (années)
+DEFAULT_RETIREMENT_YEARS = 10
+MAX_RETIREMENT_YEARS = 40
+
+
+def _forbidden():
+    return Response(
+        {"error": "Les statistiques sont réservées aux gestionnaires."},
+        status=status.HTTP_403_FORBIDDEN,
+    )
+
+
+class AnalyticsView(APIView):
+    """Base des séries mensuelles : paramètres, périmètre et lecture de la vue.
+
+    Attributes:
+        view_name (str): Vue matérialisée lue.
+        group_by_choices (tuple[str]): Regroupements acceptés (le premier par défaut).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    view_name = None
+    group_by_choices = ()
+
+    def get(self, request):
+        """Retourne la série mensuelle du périmètre de l'utilisateur.
+
+        Args:
+            request (Request): Requête HTTP GET ; `from`, `to` (AAAA-MM, inclus),
+                `group_by`.
+
+        Returns:
+            Response: {'from', 'to', 'group_by', 'series': [...]} (HTTP 200),
+                HTTP 400 si un paramètre est invalide, HTTP 403 pour un compte employé.
+        """
+        ctx = get_user_context(request.user)
+        if ctx['role'] == 'employee':
+            return _forbidden()
+        params = request.query_params
+        current = month_start(timezone.localdate())
+        try:
+            last = self._month(params.get('to')) or current
+            first = self._month(params.get('from')) or add_months(last, -11)
+        except ValueError:
+            return Response(
+                {"error": "from et to doivent être au format AAAA-MM."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if first > last:
+            return Response({"error": "from doit précéder to."}, status=status.HTTP_400_BAD_REQUEST)
+        if first < add_months(current, -(HISTORY_MONTHS - 1)):
+            return Response(
+                {"error": f"Historique limité aux {HISTORY_MONTHS} derniers mois."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        group_by = params.get('group_by') or self.group_by_choices[0]
+        if group_by not in self.group_by_choices:
+            return Response(
+                {"error": f"group_by doit valoir {' ou '.join(self.group_by_choices)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if ctx['role'] == 'manager' and not ctx['directions']:
+            series = []
+        else:
+            series = [self.enrich(row) for row in monthly_series(self.view_name, ctx, first, last, group_by)]
+        return Response({
+            'from': first.strftime('%Y-%m'),
+            'to': last.strftime('%Y-%m'),
+            'group_by': group_by,
+            'series': series,
+        })
+
+    @staticmethod
+    def _month(value):
+        return datetime.strptime(value, '%Y-%m').date() if value else None
+
+    def enrich(self, row):
+        """Ajoute à une ligne les indicateurs dérivés (taux…)."""
+        return row
+
+
+class HeadcountAnalyticsView(AnalyticsView):
+    """Effectifs mensuels par entreprise ou par direction."""
+
+    view_name = HEADCOUNT_VIEW
+    group_by_choices = ('department', 'direction')
+
+
+class AbsenteeismAnalyticsView(AnalyticsView):
+    """Taux d'absence et de retard mensuels par direction ou par entreprise."""
+
+    view_name = ATTENDANCE_VIEW
+    group_by_choices = ('direction', 'department')
+
+    def enrich(self, row):
+        records = row['records']
+        row['absence_rate'] = round(row['absent'] / records, 4) if records else 0.0
+        row['lateness_rate'] = round(row['late'] / records, 4) if records else 0.0
+        return row
+
+
+class LeaveDaysAnalyticsView(AnalyticsView):
+    """Jours de congés approuvés par mois, par type de congé, entreprise ou direction."""
+
+    view_name = LEAVE_DAYS_VIEW
+    group_by_choices = ('leave_type', 'department', 'direction')
+
+
+class DemographicsAnalyticsView(APIView):
+    """Pyramide des âges et prévisions de départs à la retraite du périmètre."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """Retourne la démographie des agents actifs du périmètre de l'utilisateur.
+
+        Args:
+            request (Request): Requête HTTP GET ; `years` (horizon des départs,
+                1 à MAX_RETIREMENT_YEARS, année courante incluse).
+
+        Returns:
+            Response: {'as_of', 'retirement_age', 'years', 'age_buckets',
+                'pyramid': [...], 'retirements': [...]} (HTTP 200), HTTP 400 si
+                years est invalide, HTTP 403 pour un compte employé.
+        """
+        ctx = get_user_context(request.user)
+        if ctx['role'] == 'employee':
+            return _forbidden()
+        try:
+            years = int(request.query_params.get('years', DEFAULT_RETIREMENT_YEARS))
+        except ValueError:
+            years = 0
+        if not 1 <= years <= MAX_RETIREMENT_YEARS:
+            return Response(
+                {"error": f"years doit être un entier entre 1 et {MAX_RETIREMENT_YEARS}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        today = timezone.localdate()
+        employees = get_scoped_employees(request.user, ctx)
+        data = get_or_refresh(
+            f'analytics:demographics:{today.isoformat()}:{years}:{scope_cache_key(ctx, request.user)}',
+            demographics_version(),
+            lambda: demographics(employees, today, years),
+            ttl=settings.DEMOGRAPHICS_CACHE_TTL,
+        )
+        return Response({
+            'as_of': today,
+            'retirement_age': RETIREMENT_AGE,
+            'years': years,
+            'age_buckets': age_bucket_labels() + [UNKNOWN_AGE_BUCKET],
+            **data,
+        })
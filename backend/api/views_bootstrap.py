@@ -0,0 +1,175 @@
+"""
+Endpoints d'amorçage : toutes les données d'un écran en un aller-retour.
+
+GET /api/me/bootstrap/         — Portail employé (employee-profile.html) : compte,
+                                 fiche agent, congés, solde de congés payés et listes
+                                 de référence (directions, entreprises), en un nombre
+                                 de requêtes borné quel que soit le nombre de congés.
+GET /api/dashboard/bootstrap/  — Tableau de bord (dashboard.html) : entreprises,
+                                 agents, congés et présences récentes du périmètre,
+                                 limités aux champs affichés, lus par values() (sans
+                                 serializer ni instance de modèle). Réponse compressée
+                                 (gzip) si le navigateur l'accepte. Porte le point
+                                 de reprise des appels ?updated_since= suivants
+                                 (high_water_mark, voir api.delta_sync).
+
+Remplacent les appels successifs des deux écrans (listes complètes filtrées
+et remises en forme côté navigateur).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Attendance, Department, Direction, Leave
+from .serializers import (
+    DirectionSerializer, EmployeeSerializer, LeaveSerializer, UserSerializer, preload_leave_figures,
+)
+from .views import (
+    RoleFilterMixin, get_own_employee, get_scoped_employees, get_user_context, get_visible_departments,
+)
+from .working_days import count_working_days
+
+
+class MeBootstrapView(APIView):
+    """Données du portail employé de l'utilisateur connecté, en une réponse."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """Retourne le compte, la fiche, les congés, le solde et les listes de référence.
+
+        Six requêtes au plus : fiche (avec entreprise et compte), congés payés
+        de l'année, droits acquis, congés de l'agent, directions, entreprises.
+
+        Args:
+            request (Request): Requête HTTP GET authentifiée.
+
+        Returns:
+            Response: {
+                'user': {...},
+                'profile': {...} | None,     — None si aucune fiche n'est liée au compte
+                'leaves': [...],             — congés de l'agent, plus récents d'abord
+                'balance': {'entitlement', 'taken', 'pending', 'balance'} | None,
+                'directions': [{'id', 'name'}],
+                'departments': [{'id', 'name'}],
+            }
+        """
+        employee = get_own_employee(request.user)
+        profile, leaves, balance = None, [], None
+        if employee is not None:
+            preload_leave_figures([employee])
+            profile = EmployeeSerializer(employee, context={'request': request}).data
+            leave_list = list(
+                Leave.objects.filter(employee=employee).select_related('manager_approved_by', 'approved_by')
+            )
+            for leave in leave_list:
+                leave.employee = employee
+            leaves = LeaveSerializer(leave_list, many=True).data
+            balance = {
+                'entitlement': float(employee.leave_entitlement),
+                'taken': employee.leaves_taken_this_year,
+                'pending': employee.leaves_pending_this_year,
+                'balance': float(employee.leave_balance),
+            }
+
+        return Response({
+            'user': UserSerializer(request.user).data,
+            'profile': profile,
+            'leaves': leaves,
+            'balance': balance,
+            'directions': DirectionSerializer(Direction.objects.all(), many=True).data,
+            'departments': list(Department.objects.order_by('name').values('id', 'name')),
+        })
+
+
+def _employee_name():
+    # Même format que Employee.full_name
+    return Concat(F('employee__first_name'), Value(' '), F('employee__last_name'))
+
+
+@method_decorator(gzip_page, name='dispatch')
+class DashboardBootstrapView(RoleFilterMixin, APIView):
+    """Données initiales du tableau de bord pour le périmètre de l'utilisateur."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """Retourne entreprises, agents, congés et présences récentes du périmètre.
+
+        Une requête par liste (quatre, plus le contexte de l'utilisateur),
+        quel que soit l'effectif. Les présences sont limitées aux
+        DASHBOARD_ATTENDANCE_DAYS derniers jours ; l'historique complet reste
+        accessible par /api/attendances/by_employee/ et /api/attendances/calendar/.
+
+        Args:
+            request (Request): Requête HTTP GET authentifiée.
+
+        Returns:
+            Response: {
+                'departments': [{'id', 'name', 'manager', 'description'}],
+                'employees': [{'id', 'first_name', 'last_name', 'email', 'phone',
+                               'department', 'department_name', 'direction', 'position',
+                               'hire_date', 'salary', 'matricule', 'cnps', 'address', 'status'}],
+                'leaves': [{'id', 'employee', 'employee_name', 'leave_type', 'start_date',
+                            'end_date', 'days_count', 'reason', 'status'}],
+                'attendances': [{'id', 'employee', 'employee_name', 'date', 'check_in',
+                                 'check_out', 'hours_worked', 'status'}],
+                'attendance_since': date,
+                'high_water_mark': datetime,  — updated_since des appels suivants
+            }
+        """
+        mark = timezone.now()
+        ctx = get_user_context(request.user)
+        since = timezone.localdate() - timedelta(days=getattr(settings, 'DASHBOARD_ATTENDANCE_DAYS', 31) - 1)
+
+        departments = list(
+            get_visible_departments(request.user, ctx)
+            .order_by('name')
+            .values('id', 'name', 'manager', 'description')
+        )
+        employees = list(
+            get_scoped_employees(request.user, ctx)
+            .order_by('last_name', 'first_name')
+            .values(
+                'id', 'first_name', 'last_name', 'email', 'phone', 'department', 'direction',
+                'position', 'hire_date', 'salary', 'matricule', 'cnps', 'address', 'status',
+                department_name=F('department__name'),
+            )
+        )
+        leaves = list(
+            self.get_role_filtered_queryset(Leave.objects.all(), ctx)
+            .values(
+                'id', 'employee', 'leave_type', 'start_date', 'end_date', 'reason', 'status',
+                employee_name=_employee_name(),
+            )
+        )
+        if leaves:
+            days = count_working_days([leave['start_date'] for leave in leaves], [leave['end_date'] for leave in leaves])
+            for leave, count in zip(leaves, days.tolist()):
+                leave['days_count'] = count
+        attendances = list(
+            self.get_role_filtered_queryset(Attendance.objects.filter(date__gte=since), ctx)
+            .order_by('-date', 'employee__last_name')
+            .values(
+                'id', 'employee', 'date', 'check_in', 'check_out', 'hours_worked', 'status',
+                employee_name=_employee_name(),
+            )
+        )
+
+        return Response({
+            'departments': departments,
+            'employees': employees,
+            'leaves': leaves,
+            'attendances': attendances,
+            'attendance_since': since,
+            'high_water_mark': mark,
+        })
@@ -0,0 +1,86 @@
+"""
+Endpoint de pointage rapide (pic d'arrivée du matin).
+
+POST /api/checkin/  {"badge": "<jeton signé>"}  ou  {"employee": <id>}
+
+Chemin volontairement minimal par rapport à POST /api/attendances/ :
+  - authentification JWT sans lecture de la table User (JWTStatelessUserAuthentication) ;
+  - pas de get_user_context ni de serializer : le compte et le périmètre sont
+    vérifiés dans l'annuaire en mémoire (api.checkin.CheckInDirectory) ;
+  - pas de limitation de débit (les postes de pointage envoient des rafales) ;
+  - l'écriture passe par le tampon api.checkin.CheckInBuffer, qui regroupe
+    les pointages concurrents en un seul upsert ; la réponse n'est renvoyée
+    qu'une fois le pointage réellement enregistré.
+"""
+
+import logging
+
+from django.db import DatabaseError
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from .badges import BadgeError, verify_badge
+from .checkin import checkin_buffer, checkin_directory
+
+logger = logging.getLogger('api')
+
+
+class CheckInView(APIView):
+    """Enregistre l'arrivée d'un agent via le tampon de pointage."""
+
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = []
+
+    def post(self, request):
+        """Pointe l'arrivée d'un agent pour la date du jour (heure serveur).
+
+        L'agent est identifié par son badge signé (`badge`) ou, à défaut,
+        par son identifiant (`employee`).
+
+        Args:
+            request (Request): Corps JSON {'badge': str} ou {'employee': int}.
+
+        Returns:
+            Response: {'employee', 'date', 'check_in', 'status'} (HTTP 201),
+                HTTP 400 si l'identifiant est invalide, HTTP 403 si le badge est
+                invalide/expiré/révoqué ou l'agent hors périmètre, HTTP 503 si
+                l'écriture a échoué.
+        """
+        token = request.data.get('badge')
+        if token:
+            try:
+                claims = verify_badge(token)
+            except BadgeError as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_403_FORBIDDEN)
+            employee_id = claims.employee_id
+            allowed = checkin_directory.can_check_in_badge(
+                request.user, employee_id, claims.department_id
+            )
+        else:
+            try:
+                employee_id = int(request.data.get('employee'))
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "Badge ('badge') ou identifiant d'agent ('employee') requis."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            allowed = checkin_directory.can_check_in(request.user, employee_id)
+
+        if not allowed:
+            return Response(
+                {"error": "Agent inconnu ou hors de votre périmètre."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            result = checkin_buffer.submit(employee_id)
+        except (TimeoutError, DatabaseError) as exc:
+            logger.error("Pointage rapide de l'agent #%s non enregistré : %s", employee_id, exc)
+            return Response(
+                {"error": "Le pointage n'a pas pu être enregistré. Veuillez réessayer."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(result, status=status.HTTP_201_CREATED)
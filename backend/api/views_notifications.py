@@ -0,0 +1,217 @@
+"""
+Flux temps réel des alarmes de congés (Server-Sent Events).
+
+POST /api/notifications/stream/ticket/   (en-tête Authorization: Bearer <jeton d'accès>)
+GET  /api/notifications/stream/?ticket=<ticket>[&last_event_id=N]
+
+EventSource ne peut pas envoyer d'en-tête Authorization. Plutôt que de faire
+passer le jeton d'accès JWT dans l'URL (où il finirait dans les journaux
+d'accès du serveur et des proxys), le client obtient d'abord un ticket de flux :
+une valeur signée (TimestampSigner, sel propre au flux) qui n'authentifie que
+GET /api/notifications/stream/ et expire après NOTIFICATION_STREAM_TICKET_TTL
+secondes. Un ticket journalisé est donc inutilisable ailleurs et très vite périmé.
+
+Le navigateur (EventSource) garde la connexion ouverte ; le serveur y pousse
+les alarmes nouvelles ou modifiées du périmètre de l'utilisateur (voir
+api.notification_stream). Format des messages :
+
+  retry: 5000                       — délai de reconnexion conseillé
+  event: ready   id: N              — flux prêt : le client charge la liste
+                                      (GET /api/notifications/) une seule fois
+  event: notification  id: N        — data: {"notifications": [...]}
+  event: read          id: N        — data: {"ids": [...]}
+  event: reset                      — reprise impossible ou changement de jour :
+                                      le client recharge la liste
+  : ping                            — battement de cœur (NOTIFICATION_STREAM_HEARTBEAT)
+
+À la reconnexion, le client transmet le dernier identifiant reçu (paramètre
+last_event_id, ou en-tête Last-Event-ID envoyé par EventSource) : les
+événements manqués sont rejoués depuis l'historique du processus. Le flux est
+fermé par le serveur après NOTIFICATION_STREAM_MAX_AGE secondes ; le client
+demande alors un nouveau ticket et se reconnecte.
+
+Chaque flux ouvert occupe un thread du serveur (gunicorn --threads) mais
+aucune connexion ni requête SQL tant qu'aucune alarme ne change.
+"""
+
+import json
+import time as time_module
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db import connection
+from django.http import StreamingHttpResponse
+from rest_framework import exceptions, permissions, renderers, status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .notification_stream import notification_broker
+from .views import get_user_context
+
+
+STREAM_TICKET_SALT = 'api.notification_stream.ticket'
+
+
+def _ticket_signer():
+    return signing.TimestampSigner(salt=STREAM_TICKET_SALT, algorithm='sha256')
+
+
+def issue_stream_ticket(user):
+    """Émet un ticket de flux signé pour `user` (valable NOTIFICATION_STREAM_TICKET_TTL secondes)."""
+    return _ticket_signer().sign(str(user.pk))
+
+
+class StreamTicketAuthentication(BaseAuthentication):
+    """Authentification par le paramètre ?ticket= (EventSource n'envoie pas d'en-tête)."""
+
+    def authenticate(self, request):
+        ticket = request.query_params.get('ticket')
+        if not ticket:
+            return None
+        max_age = getattr(settings, 'NOTIFICATION_STREAM_TICKET_TTL', 60)
+        try:
+            user_id = int(_ticket_signer().unsign(ticket, max_age=max_age))
+        except (signing.BadSignature, ValueError):
+            raise exceptions.AuthenticationFailed("Ticket de flux invalide ou expiré.")
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed("Ticket de flux invalide ou expiré.")
+        return user, None
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """Accepte `Accept: text/event-stream` ; les réponses d'erreur restent en JSON."""
+
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode(self.charset)
+
+
+def _sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _format_event(event):
+    if event['event'] == 'read':
+        data = {'ids': [item['id'] for item in event['items']]}
+    else:
+        data = {'notifications': [item['n'] for item in event['items']]}
+    return _sse(event['event'], data, event['id'])
+
+
+def _forbidden_for_employee(ctx):
+    if ctx['role'] == 'employee':
+        return Response(
+            {"error": "Les alarmes de congés sont réservées aux gestionnaires."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    return None
+
+
+class NotificationStreamTicketView(APIView):
+    """Délivre un ticket d'ouverture du flux des alarmes (admin, entreprise, manager)."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """Émet un ticket de flux de courte durée.
+
+        Args:
+            request (Request): Requête POST authentifiée par l'en-tête Authorization.
+
+        Returns:
+            Response: {'ticket', 'expires_in'} (HTTP 200), ou HTTP 403 pour un compte employé.
+        """
+        forbidden = _forbidden_for_employee(get_user_context(request.user))
+        if forbidden is not None:
+            return forbidden
+        return Response({
+            'ticket': issue_stream_ticket(request.user),
+            'expires_in': getattr(settings, 'NOTIFICATION_STREAM_TICKET_TTL', 60),
+        })
+
+
+class NotificationStreamView(APIView):
+    """Pousse les alarmes de congés du périmètre de l'utilisateur (admin, entreprise, manager)."""
+
+    authentication_classes = [JWTAuthentication, StreamTicketAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [EventStreamRenderer, renderers.JSONRenderer]
+
+    def get(self, request):
+        """Ouvre le flux SSE.
+
+        Args:
+            request (Request): Requête GET authentifiée (en-tête Authorization ou
+                paramètre ticket) ; paramètre last_event_id (ou en-tête
+                Last-Event-ID) pour reprendre après une coupure.
+
+        Returns:
+            StreamingHttpResponse: Flux text/event-stream, ou HTTP 403 pour un
+                compte employé, HTTP 400 si Last-Event-ID est invalide.
+        """
+        ctx = get_user_context(request.user)
+        forbidden = _forbidden_for_employee(ctx)
+        if forbidden is not None:
+            return forbidden
+        raw_last_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        try:
+            last_event_id = int(raw_last_id) if raw_last_id else None
+        except ValueError:
+            return Response({"error": "Last-Event-ID invalide."}, status=status.HTTP_400_BAD_REQUEST)
+
+        scope = {
+            'role': ctx['role'],
+            'department': ctx['department'].pk if ctx['role'] == 'entreprise' else None,
+            'directions': set(ctx.get('directions') or ()),
+        }
+        subscription = notification_broker.subscribe(scope)
+        resumed = last_event_id is not None and notification_broker.replay(subscription, last_event_id)
+        # Le flux n'utilise plus la base : la connexion est rendue tout de suite
+        if not connection.in_atomic_block:
+            connection.close()
+
+        response = StreamingHttpResponse(
+            self._stream(subscription, last_event_id, resumed),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def _stream(subscription, last_event_id, resumed):
+        heartbeat = getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT', 15)
+        deadline = time_module.monotonic() + getattr(settings, 'NOTIFICATION_STREAM_MAX_AGE', 300)
+        day = date.today()
+        try:
+            yield 'retry: 5000\n\n'
+            if last_event_id is None:
+                yield _sse('ready', {}, notification_broker.last_event_id())
+            elif not resumed:
+                yield _sse('reset', {}, notification_broker.last_event_id())
+
+            while time_module.monotonic() < deadline:
+                event = subscription.get(timeout=min(heartbeat, max(deadline - time_module.monotonic(), 0)))
+                if subscription.overflowed or date.today() != day:
+                    # Événements perdus, ou nouvelles alarmes dues à minuit : rechargement complet
+                    subscription.overflowed, day = False, date.today()
+                    yield _sse('reset', {}, notification_broker.last_event_id())
+                elif event is None:
+                    yield ': ping\n\n'
+                else:
+                    yield _format_event(event)
+        finally:
+            notification_broker.unsubscribe(subscription)
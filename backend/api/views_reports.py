@@ -4,9 +4,11 @@ from django.http import HttpResponse
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from io import BytesIO
+from django.db.models import Count, Sum
 from datetime import date
 
 from .models import CompanyProfile, ManagerProfile, Department, Employee, Leave, Attendance
+from .working_days import count_working_days
 
 
 # ===========================
@@ -164,8 +166,12 @@ class AttendanceReportView(APIView):
         # Total
         from openpyxl.utils import get_column_letter
         last_col = get_column_letter(len(headers))
+        totals = attendances.aggregate(count=Count('id'), hours=Sum('hours_worked'))
         ws.merge_cells(f'A{row_num}:{last_col}{row_num}')
-        total_cell = ws.cell(row=row_num, column=1, value=f'TOTAL : {len(attendances)} enregistrements')
+        total_cell = ws.cell(
+            row=row_num, column=1,
+            value=f"TOTAL : {totals['count']} enregistrements — {totals['hours'] or 0} heures travaillées",
+        )
         total_cell.font = Font(name='Arial', bold=True, size=11)
         total_cell.alignment = styles['center_align']
         total_cell.border = styles['thin_border']
@@ -184,6 +190,9 @@ class LeavesReportView(APIView):
         leaves = Leave.objects.filter(employee_id__in=employee_ids).select_related(
             'employee', 'employee__department', 'manager_approved_by', 'approved_by'
         ).order_by('-created_at')
+        leaves = list(leaves)
+        # Jours ouvrés de toutes les lignes en un seul décompte vectorisé
+        leave_days = count_working_days([l.start_date for l in leaves], [l.end_date for l in leaves])
 
         wb = Workbook()
         ws = wb.active
@@ -211,7 +220,7 @@ class LeavesReportView(APIView):
         }
 
         row_num = 4
-        for idx, leave in enumerate(leaves, 1):
+        for idx, (leave, days) in enumerate(zip(leaves, leave_days.tolist()), 1):
             emp = leave.employee
             mgr_name = leave.manager_approved_by.get_full_name() if leave.manager_approved_by else '-'
             app_name = leave.approved_by.get_full_name() if leave.approved_by else '-'
@@ -223,7 +232,7 @@ class LeavesReportView(APIView):
                 type_labels.get(leave.leave_type, leave.leave_type),
                 leave.start_date.strftime('%d/%m/%Y') if leave.start_date else '-',
                 leave.end_date.strftime('%d/%m/%Y') if leave.end_date else '-',
-                leave.days_count,
+                days,
                 status_labels.get(leave.status, leave.status),
                 mgr_name,
                 app_name,
@@ -390,16 +399,18 @@ class CompleteReportView(APIView):
         leaves = Leave.objects.filter(employee_id__in=employee_ids).select_related(
             'employee', 'employee__department', 'manager_approved_by', 'approved_by'
         ).order_by('-created_at')
+        leaves = list(leaves)
+        leave_days = count_working_days([l.start_date for l in leaves], [l.end_date for l in leaves])
 
         row_num = 4
-        for idx, leave in enumerate(leaves, 1):
+        for idx, (leave, days) in enumerate(zip(leaves, leave_days.tolist()), 1):
             emp = leave.employee
             row_data = [
                 idx, emp.full_name, emp.department.name if emp.department else '-',
                 type_labels.get(leave.leave_type, leave.leave_type),
                 leave.start_date.strftime('%d/%m/%Y') if leave.start_date else '-',
                 leave.end_date.strftime('%d/%m/%Y') if leave.end_date else '-',
-                leave.days_count,
+                days,
                 leave_status_labels.get(leave.status, leave.status),
                 leave.manager_approved_by.get_full_name() if leave.manager_approved_by else '-',
                 leave.approved_by.get_full_name() if leave.approved_by else '-',
@@ -0,0 +1,137 @@
+"""
+Décompte des jours ouvrés des congés.
+
+Un jour ouvré est un jour du lundi au vendredi qui n'est pas un jour férié
+(modèle PublicHoliday). Le décompte repose sur numpy.busday_count, qui traite
+un tableau de périodes en un seul appel : les soldes, rapports et contrôles
+portant sur un queryset entier ne font ni boucle Python par congé ni requête
+supplémentaire.
+
+  HolidayCalendar              — Calendrier numpy (busdaycalendar) des jours fériés,
+                                 gardé en mémoire : rechargé après HOLIDAY_CALENDAR_TTL
+                                 secondes ou dès qu'un jour férié est modifié (signal).
+  count_working_days(...)      — Jours ouvrés de N périodes [début, fin] (tableau numpy).
+  working_days(start, end)     — Variante scalaire pour une période.
+  paid_leave_usage_by_employee — Jours ouvrés de congés payés approuvés / en attente,
+                                 par employé, en une requête.
+"""
+
+import threading
+import time as time_module
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+
+from .models import Leave, PublicHoliday
+
+# Semaine de travail : lundi → vendredi
+WEEKMASK = '1111100'
+
+PENDING_STATUSES = ('pending', 'manager_approved')
+
+
+class HolidayCalendar:
+    """Calendrier des jours ouvrés partagé par le processus.
+
+    Le busdaycalendar numpy est reconstruit en bloc puis échangé : les
+    lectures concurrentes se font sans verrou.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._calendar = None
+
+    def _refresh(self):
+        holidays = np.array(list(PublicHoliday.objects.values_list('date', flat=True)), dtype='datetime64[D]')
+        self._calendar = np.busdaycalendar(weekmask=WEEKMASK, holidays=holidays)
+        self._loaded_at = time_module.monotonic()
+
+    def get(self):
+        """Retourne le busdaycalendar courant (une requête au plus par période de validité)."""
+        ttl = getattr(settings, 'HOLIDAY_CALENDAR_TTL', 3600)
+        loaded_at = self._loaded_at
+        if loaded_at is None or time_module.monotonic() - loaded_at >= ttl:
+            with self._lock:
+                if self._loaded_at is None or time_module.monotonic() - self._loaded_at >= ttl:
+                    self._refresh()
+        return self._calendar
+
+    def invalidate(self):
+        """Force le rechargement des jours fériés au prochain décompte."""
+        self._loaded_at = None
+
+
+holiday_calendar = HolidayCalendar()
+
+
+def count_working_days(starts, ends):
+    """Compte les jours ouvrés de plusieurs périodes, bornes incluses.
+
+    Args:
+        starts (Sequence[date]): Dates de début.
+        ends (Sequence[date]): Dates de fin (même longueur que starts).
+
+    Returns:
+        numpy.ndarray[int64]: Jours ouvrés de chaque période (0 si fin < début).
+    """
+    begin = np.array(starts, dtype='datetime64[D]')
+    # busday_count exclut la borne de fin : on la décale d'un jour
+    end = np.array(ends, dtype='datetime64[D]') + np.timedelta64(1, 'D')
+    counts = np.busday_count(begin, end, busdaycal=holiday_calendar.get())
+    return np.maximum(counts, 0)
+
+
+def working_days(start, end):
+    """Jours ouvrés de la période [start, end].
+
+    Returns:
+        int: Nombre de jours ouvrés (0 si end < start).
+    """
+    return int(count_working_days([start], [end])[0])
+
+
+def paid_leave_usage_by_employee(employee_ids, year=None, exclude_leave_id=None):
+    """Jours ouvrés de congés payés approuvés et en attente, par employé.
+
+    Une requête sur les congés payés de l'année (même règle que le solde :
+    congés commençant dans l'année civile), puis un décompte et une somme
+    vectorisés.
+
+    Args:
+        employee_ids (Iterable[int]): Employés concernés.
+        year (int | None): Année civile (année en cours par défaut).
+        exclude_leave_id (int | None): Congé à ignorer (demande en cours de modification).
+
+    Returns:
+        dict[int, dict]: {employee_id: {'taken': int, 'pending': int}}, une entrée
+            par employé demandé (zéros s'il n'a aucun congé payé).
+    """
+    employee_ids = list(employee_ids)
+    usage = {pk: {'taken': 0, 'pending': 0} for pk in employee_ids}
+    if not employee_ids:
+        return usage
+
+    leaves = Leave.objects.filter(
+        employee_id__in=employee_ids,
+        leave_type='paid',
+        status__in=('approved',) + PENDING_STATUSES,
+        start_date__year=year or date.today().year,
+    )
+    if exclude_leave_id is not None:
+        leaves = leaves.exclude(pk=exclude_leave_id)
+    rows = list(leaves.values_list('employee_id', 'status', 'start_date', 'end_date'))
+    if not rows:
+        return usage
+
+    owners, statuses, starts, ends = zip(*rows)
+    counts = count_working_days(starts, ends)
+    approved = np.array(statuses) == 'approved'
+    keys, index = np.unique(np.array(owners), return_inverse=True)
+    taken = np.bincount(index, weights=np.where(approved, counts, 0), minlength=len(keys))
+    pending = np.bincount(index, weights=np.where(approved, 0, counts), minlength=len(keys))
+    for pk, taken_days, pending_days in zip(keys.tolist(), taken.tolist(), pending.tolist()):
+        usage[pk] = {'taken': int(taken_days), 'pending': int(pending_days)}
+    return usage
+
@@ -182,6 +182,85 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# ============================================================
+# Pointage rapide (endpoint /api/checkin/)
+# ============================================================
+# Les pointages sont regroupés en mémoire puis écrits en un seul upsert :
+# intervalle maximal d'attente avant écriture (secondes) et taille maximale d'un lot.
+CHECKIN_FLUSH_INTERVAL = config('CHECKIN_FLUSH_INTERVAL', default=0.2, cast=float)
+CHECKIN_MAX_BATCH = config('CHECKIN_MAX_BATCH', default=500, cast=int)
+# Durée de validité (secondes) de l'annuaire en mémoire des agents pointables
+CHECKIN_DIRECTORY_TTL = config('CHECKIN_DIRECTORY_TTL', default=60, cast=int)
+# Badges de pointage signés : durée de validité (jours) et période de
+# rechargement (secondes) de la liste de révocation en mémoire
+BADGE_VALIDITY_DAYS = config('BADGE_VALIDITY_DAYS', default=365, cast=int)
+BADGE_REVOCATION_REFRESH = config('BADGE_REVOCATION_REFRESH', default=30, cast=int)
+# Heure au-delà de laquelle une arrivée est enregistrée avec le statut 'late'
+ATTENDANCE_LATE_AFTER = config('ATTENDANCE_LATE_AFTER', default='08:00')
+# Durée maximale (heures) d'une garde de nuit : un départ antérieur à l'arrivée
+# est compté le lendemain s'il reste dans cette limite
+ATTENDANCE_MAX_OVERNIGHT_HOURS = config('ATTENDANCE_MAX_OVERNIGHT_HOURS', default=16, cast=int)
+
+# ============================================================
+# Cache — lectures fréquentes par périmètre (présences du jour…)
+# ============================================================
+# Cache mémoire local à chaque processus ; les entrées sont invalidées à
+# chaque écriture d'une présence du jour et expirent au plus tard après
+# ATTENDANCE_TODAY_CACHE_TTL secondes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'empmanager',
+    }
+}
+ATTENDANCE_TODAY_CACHE_TTL = config('ATTENDANCE_TODAY_CACHE_TTL', default=30, cast=int)
+# Statistiques du tableau de bord en cache par périmètre (secondes), invalidées
+# à chaque écriture d'un agent, d'un congé ou d'une présence ; une entrée
+# périmée est encore servie pendant son recalcul, au plus DASHBOARD_STATS_MAX_STALE
+DASHBOARD_STATS_CACHE_TTL = config('DASHBOARD_STATS_CACHE_TTL', default=15, cast=int)
+DASHBOARD_STATS_MAX_STALE = config('DASHBOARD_STATS_MAX_STALE', default=300, cast=int)
+# Pyramide des âges et départs à la retraite (/api/analytics/demographics/) en
+# cache par périmètre (secondes), invalidés à chaque écriture d'un agent
+DEMOGRAPHICS_CACHE_TTL = config('DEMOGRAPHICS_CACHE_TTL', default=3600, cast=int)
+# Nombre de jours de présences chargés par le tableau de bord (/api/dashboard/bootstrap/)
+DASHBOARD_ATTENDANCE_DAYS = config('DASHBOARD_ATTENDANCE_DAYS', default=31, cast=int)
+# Synchronisation incrémentale (?updated_since=) : fenêtre relue à chaque appel
+# (secondes, transactions validées après le point de reprise) et durée de
+# conservation des pierres tombales (jours, commande purge_deletion_log)
+DELTA_SYNC_OVERLAP = config('DELTA_SYNC_OVERLAP', default=60, cast=int)
+DELTA_SYNC_RETENTION_DAYS = config('DELTA_SYNC_RETENTION_DAYS', default=30, cast=int)
+# Durée (secondes) de conservation en mémoire du calendrier des jours fériés
+# utilisé pour le décompte des jours ouvrés (rechargé aussi à chaque modification)
+HOLIDAY_CALENDAR_TTL = config('HOLIDAY_CALENDAR_TTL', default=3600, cast=int)
+
+# ============================================================
+# Acquisition des congés payés (commande accrue_leave)
+# ============================================================
+# Jours acquis par mois de service et plafond du report au 1er janvier
+LEAVE_MONTHLY_ACCRUAL = config('LEAVE_MONTHLY_ACCRUAL', default=2.5, cast=float)
+LEAVE_CARRY_OVER_CAP = config('LEAVE_CARRY_OVER_CAP', default=10, cast=float)
+
+# ============================================================
+# Flux temps réel des alarmes (endpoint /api/notifications/stream/)
+# ============================================================
+# Chaque flux ouvert occupe un thread : servir l'API avec gunicorn --threads.
+# Intervalle des battements de cœur et durée maximale d'un flux (secondes) ;
+# le navigateur se reconnecte automatiquement à la fermeture.
+NOTIFICATION_STREAM_HEARTBEAT = config('NOTIFICATION_STREAM_HEARTBEAT', default=15, cast=int)
+NOTIFICATION_STREAM_MAX_AGE = config('NOTIFICATION_STREAM_MAX_AGE', default=300, cast=int)
+# Durée de validité (secondes) d'un ticket de flux (POST /api/notifications/stream/ticket/).
+# EventSource ne pouvant envoyer d'en-tête, le ticket passe dans l'URL : il apparaît
+# dans les journaux d'accès, d'où sa courte durée et son usage limité au flux.
+# Ne jamais passer le jeton d'accès JWT en paramètre d'URL.
+NOTIFICATION_STREAM_TICKET_TTL = config('NOTIFICATION_STREAM_TICKET_TTL', default=60, cast=int)
+# Événements conservés par processus pour la reprise (en-tête Last-Event-ID)
+NOTIFICATION_STREAM_HISTORY = config('NOTIFICATION_STREAM_HISTORY', default=1000, cast=int)
+# Écoute PostgreSQL LISTEN des événements publiés par les autres processus
+NOTIFICATION_STREAM_LISTEN = config('NOTIFICATION_STREAM_LISTEN', default=True, cast=bool)
+# Durée maximale (secondes) des compteurs d'alarmes non lues en mémoire,
+# ajustés par les événements du flux puis recalculés
+NOTIFICATION_COUNT_TTL = config('NOTIFICATION_COUNT_TTL', default=300, cast=int)
+
 # ============================================================
 # Logging — traces applicatives et sécurité
 # ============================================================
@@ -0,0 +1,101 @@
+"""
+Test de charge du pointage rapide (POST /api/checkin/).
+
+Simule le pic d'arrivée du matin : C postes de pointage envoient en continu
+des pointages pendant D secondes vers UN SEUL processus serveur, puis le script
+affiche le débit soutenu (pointages/s) et les latences (p50 / p95 / p99).
+
+Le serveur doit être multi-thread pour que le tampon regroupe les écritures :
+    python manage.py runserver --noreload              (un processus, threads)
+    gunicorn empmanager.wsgi -w 1 --threads 64         (un worker, 64 threads)
+
+Usage :
+    python loadtest_checkin.py --username admin --password ****** \\
+        [--url http://localhost:8000/api] [--concurrency 64] [--duration 20]
+
+Les agents pointés sont ceux visibles par le compte utilisé (GET /api/employees/).
+Seule la bibliothèque standard est utilisée.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def _request(url, payload=None, token=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, method='POST' if data else 'GET')
+    req.add_header('Content-Type', 'application/json')
+    if token:
+        req.add_header('Authorization', f'Bearer {token}')
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.status, json.loads(resp.read() or b'null')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de /api/checkin/")
+    parser.add_argument('--url', default='http://localhost:8000/api')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=64, help="Postes de pointage simultanés")
+    parser.add_argument('--duration', type=float, default=20, help="Durée du test (secondes)")
+    args = parser.parse_args()
+
+    _, login = _request(f'{args.url}/auth/login/', {'username': args.username, 'password': args.password})
+    token = login['access']
+    _, employees = _request(f'{args.url}/employees/', token=token)
+    employee_ids = [e['id'] for e in employees]
+    if not employee_ids:
+        raise SystemExit("Aucun agent visible par ce compte.")
+    print(f"{len(employee_ids)} agents, {args.concurrency} postes, {args.duration:.0f} s")
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def station(offset):
+        idx = offset
+        local_lat, local_fail = [], 0
+        while time.monotonic() < deadline:
+            emp_id = employee_ids[idx % len(employee_ids)]
+            idx += args.concurrency
+            start = time.perf_counter()
+            try:
+                status, _ = _request(f'{args.url}/checkin/', {'employee': emp_id}, token=token)
+                if status != 201:
+                    local_fail += 1
+            except (urllib.error.URLError, OSError):
+                local_fail += 1
+                continue
+            local_lat.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local_lat)
+            failures.append(local_fail)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=station, args=(i,)) for i in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    if not latencies:
+        raise SystemExit("Aucun pointage acquitté.")
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"Pointages acquittés : {len(latencies)}  (échecs : {sum(failures)})")
+    print(f"Débit soutenu       : {len(latencies) / elapsed:.0f} pointages/s")
+    print(f"Latence p50/p95/p99 : {pct(0.50):.0f} / {pct(0.95):.0f} / {pct(0.99):.0f} ms"
+          f"  (moyenne {statistics.mean(latencies) * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,9 @@
  *   - Veille : la veille du début du congé (rappel de dernière minute).
  *
  * Ce module gère :
- *   - Le polling de l'API toutes les 60 secondes.
+ *   - La réception en temps réel des alarmes (Server-Sent Events sur
+ *     /api/notifications/stream/), avec polling toutes les 60 secondes si
+ *     le navigateur ne supporte pas EventSource.
  *   - L'affichage du badge (nombre d'alarmes non lues) sur la cloche.
  *   - Le dropdown listant chaque alarme avec les détails du congé.
  *   - Le marquage comme "lu" (par alarme ou en masse).
@@ -25,8 +27,14 @@ const NotifState = {
     notifications: [],
     /** @type {number} */
     unreadCount: 0,
-    /** @type {number|null} ID du setInterval */
+    /** @type {number|null} ID du setInterval (repli sans EventSource) */
     pollInterval: null,
+    /** @type {EventSource|null} Flux temps réel */
+    stream: null,
+    /** @type {number|null} ID du setTimeout de reconnexion */
+    reconnectTimer: null,
+    /** @type {string|null} Identifiant du dernier événement reçu (reprise du flux) */
+    lastEventId: null,
     /** Ensemble des IDs déjà vus (pour détecter les nouvelles alarmes) */
     seenIds: new Set(),
 };
@@ -49,10 +57,124 @@ function initNotifications() {
     }
 
     setupNotificationListeners();
-    fetchNotifications();
 
-    // Polling toutes les 60 secondes
-    NotifState.pollInterval = setInterval(fetchNotifications, 60000);
+    if (typeof EventSource === 'undefined') {
+        // Navigateur sans Server-Sent Events : polling toutes les 60 secondes
+        fetchNotifications();
+        NotifState.pollInterval = setInterval(fetchNotifications, 60000);
+        return;
+    }
+    openNotificationStream();
+}
+
+// ===========================
+// Flux temps réel (Server-Sent Events)
+// ===========================
+
+/**
+ * Ouvre le flux des alarmes. La liste complète n'est chargée qu'à l'ouverture
+ * (événement `ready`) ou si le serveur le demande (`reset`) ; ensuite seules
+ * les alarmes modifiées sont reçues.
+ *
+ * Le flux est authentifié par un ticket de courte durée (le jeton d'accès ne
+ * passe jamais dans l'URL). À la reconnexion, le dernier identifiant reçu est
+ * transmis (`last_event_id`) : le serveur rejoue les événements manqués au
+ * lieu d'envoyer `ready`, et la liste n'est pas rechargée.
+ */
+async function openNotificationStream() {
+    let result = null;
+    try {
+        // apiPost rafraîchit le jeton d'accès expiré si nécessaire
+        result = await apiPost(API_ENDPOINTS.NOTIFICATIONS_STREAM_TICKET, {});
+    } catch (error) {
+        console.error('Ticket du flux des alarmes indisponible:', error);
+    }
+    if (!result || !result.ok || !result.data) {
+        scheduleStreamReconnect();
+        return;
+    }
+
+    let url = `${API_ENDPOINTS.NOTIFICATIONS_STREAM}?ticket=${encodeURIComponent(result.data.ticket)}`;
+    if (NotifState.lastEventId) {
+        url += `&last_event_id=${encodeURIComponent(NotifState.lastEventId)}`;
+    }
+    const stream = new EventSource(url);
+    NotifState.stream = stream;
+
+    // Mémorise l'identifiant de chaque événement pour reprendre au bon endroit
+    const track = (handler) => (event) => {
+        if (event.lastEventId) NotifState.lastEventId = event.lastEventId;
+        handler(event);
+    };
+    stream.addEventListener('ready', track(fetchNotifications));
+    stream.addEventListener('reset', track(fetchNotifications));
+    stream.addEventListener('notification', track((event) => {
+        applyNotificationUpdates(JSON.parse(event.data).notifications || []);
+    }));
+    stream.addEventListener('read', track((event) => {
+        removeNotifications(JSON.parse(event.data).ids || []);
+    }));
+    stream.onerror = () => {
+        // Flux fermé par le serveur (durée maximale atteinte) ou coupure réseau :
+        // réouverture avec un nouveau ticket, reprise depuis lastEventId
+        stream.close();
+        NotifState.stream = null;
+        scheduleStreamReconnect();
+    };
+}
+
+/**
+ * Programme la réouverture du flux dans 5 secondes (une seule à la fois).
+ */
+function scheduleStreamReconnect() {
+    clearTimeout(NotifState.reconnectTimer);
+    NotifState.reconnectTimer = setTimeout(openNotificationStream, 5000);
+}
+
+/**
+ * Intègre des alarmes reçues par le flux : les non lues sont ajoutées ou
+ * mises à jour (toast pour les nouvelles), les lues sont retirées.
+ *
+ * @param {Object[]} updates - Alarmes sérialisées comme dans GET /api/notifications/.
+ */
+function applyNotificationUpdates(updates) {
+    updates.forEach(n => {
+        const index = NotifState.notifications.findIndex(existing => existing.id === n.id);
+        if (n.is_read) {
+            if (index !== -1) NotifState.notifications.splice(index, 1);
+            return;
+        }
+        if (index !== -1) {
+            NotifState.notifications[index] = n;
+        } else {
+            NotifState.notifications.unshift(n);
+        }
+        if (!NotifState.seenIds.has(n.id)) {
+            NotifState.seenIds.add(n.id);
+            showNotifToast(n);
+        }
+    });
+    refreshNotificationView();
+}
+
+/**
+ * Retire des alarmes marquées comme lues (depuis un autre onglet ou poste).
+ *
+ * @param {number[]} ids - Identifiants des alarmes lues.
+ */
+function removeNotifications(ids) {
+    const removed = new Set(ids);
+    NotifState.notifications = NotifState.notifications.filter(n => !removed.has(n.id));
+    refreshNotificationView();
+}
+
+/**
+ * Met à jour le badge et la liste à partir de l'état local.
+ */
+function refreshNotificationView() {
+    NotifState.unreadCount = NotifState.notifications.length;
+    updateBadge(NotifState.unreadCount);
+    renderNotificationList(NotifState.notifications);
 }
 
 // ===========================
@@ -72,6 +72,8 @@ const AppState = {
     departments: [],
     leaves: [],
     attendance: [],
+    attendanceSince: null,
+    syncMark: null,
     currentSection: 'dashboard'
 };
 
@@ -144,8 +146,96 @@ async function initializeApp() {
 }
 
 /**
- * Charge toutes les ressources nécessaires depuis l'API REST
- * et normalise leur structure pour l'utilisation frontend.
+ * Normalise un agent (snake_case → camelCase).
+ * Accepte une ligne de /api/dashboard/bootstrap/ ou de /api/employees/.
+ *
+ * @param {Object} emp - Agent renvoyé par l'API.
+ * @returns {Object}
+ */
+function mapEmployee(emp) {
+    return {
+        id: emp.id,
+        firstName: emp.first_name,
+        lastName: emp.last_name,
+        email: emp.email,
+        phone: emp.phone,
+        department: emp.department_name || emp.department,
+        departmentId: emp.department,
+        direction: emp.direction,
+        position: emp.position,
+        hireDate: emp.hire_date,
+        salary: emp.salary,
+        matricule: emp.matricule,
+        cnps: emp.cnps,
+        address: emp.address,
+        status: emp.status
+    };
+}
+
+/**
+ * Normalise un congé (snake_case → camelCase).
+ *
+ * @param {Object} leave - Congé renvoyé par l'API.
+ * @returns {Object}
+ */
+function mapLeave(leave) {
+    return {
+        id: leave.id,
+        employeeId: leave.employee,
+        employeeName: leave.employee_name,
+        type: leave.leave_type,
+        startDate: leave.start_date,
+        endDate: leave.end_date,
+        days: leave.days_count,
+        reason: leave.reason,
+        status: leave.status
+    };
+}
+
+/**
+ * Normalise une présence (snake_case → camelCase).
+ *
+ * @param {Object} att - Présence renvoyée par l'API.
+ * @returns {Object}
+ */
+function mapAttendance(att) {
+    return {
+        id: att.id,
+        employeeId: att.employee,
+        employeeName: att.employee_name,
+        date: att.date,
+        checkIn: att.check_in,
+        checkOut: att.check_out,
+        hours: att.hours_worked,
+        status: att.status
+    };
+}
+
+/**
+ * Applique une réponse ?updated_since= à une liste locale :
+ * suppressions d'abord, puis lignes créées ou modifiées (remplacées par id).
+ *
+ * @param {Object[]} current - Liste locale normalisée.
+ * @param {{results: Object[], deleted: number[]}} delta - Réponse de l'API.
+ * @param {Function} map - Fonction de normalisation.
+ * @returns {Object[]}
+ */
+function mergeDelta(current, delta, map) {
+    const removed = new Set(delta.deleted);
+    const byId = new Map(current.filter(row => !removed.has(row.id)).map(row => [row.id, row]));
+    delta.results.forEach(row => byId.set(row.id, map(row)));
+    return Array.from(byId.values());
+}
+
+/**
+ * Charge toutes les ressources nécessaires et normalise leur structure pour
+ * l'utilisation frontend.
+ *
+ * Premier chargement : un appel à /api/dashboard/bootstrap/. Le serveur ne
+ * renvoie que le périmètre de l'utilisateur (entreprise, directions) et les
+ * champs affichés ; les présences couvrent les derniers jours (attendance_since).
+ * Les chargements suivants (après une modification) ne demandent que les
+ * lignes modifiées ou supprimées depuis le point de reprise (syncDataFromAPI).
  *
  * Les entités chargées :
  *  - Departments  → AppState.departments
@@ -159,74 +249,17 @@ async function initializeApp() {
  */
 async function loadDataFromAPI() {
     try {
-        const departments = await apiGet(API_ENDPOINTS.DEPARTMENTS);
-        AppState.departments = departments ? (departments.results || departments) : [];
-
-        const employees = await apiGet(API_ENDPOINTS.EMPLOYEES);
-        AppState.employees = employees
-            ? (employees.results || employees).map(emp => ({
-                id: emp.id,
-                firstName: emp.first_name,
-                lastName: emp.last_name,
-                email: emp.email,
-                phone: emp.phone,
-                department: emp.department_name || emp.department,
-                departmentId: emp.department,
-                direction: emp.direction,
-                position: emp.position,
-                hireDate: emp.hire_date,
-                salary: emp.salary,
-                matricule: emp.matricule,
-                cnps: emp.cnps,
-                address: emp.address,
-                status: emp.status
-            }))
-            : [];
-
-        // Filtrage côté client selon le rôle (couche de sécurité supplémentaire)
-        const role = AppState.currentUser?.role;
-        if (role === 'entreprise') {
-            const managedDeptName = AppState.currentUser?.managed_department?.name;
-            if (managedDeptName) {
-                AppState.employees = AppState.employees.filter(emp => emp.department === managedDeptName);
-            }
-        } else if (role === 'manager') {
-            const managedDirections = AppState.currentUser?.managed_directions || [];
-            if (managedDirections.length > 0) {
-                AppState.employees = AppState.employees.filter(emp => managedDirections.includes(emp.direction));
-            } else {
-                AppState.employees = [];
-            }
-        }
-
-        const leaves = await apiGet(API_ENDPOINTS.LEAVES);
-        AppState.leaves = leaves
-            ? (leaves.results || leaves).map(leave => ({
-                id: leave.id,
-                employeeId: leave.employee,
-                employeeName: leave.employee_name,
-                type: leave.leave_type,
-                startDate: leave.start_date,
-                endDate: leave.end_date,
-                days: leave.days_count,
-                reason: leave.reason,
-                status: leave.status
-            }))
-            : [];
-
-        const attendance = await apiGet(API_ENDPOINTS.ATTENDANCES);
-        AppState.attendance = attendance
-            ? (attendance.results || attendance).map(att => ({
-                id: att.id,
-                employeeId: att.employee,
-                employeeName: att.employee_name,
-                date: att.date,
-                checkIn: att.check_in,
-                checkOut: att.check_out,
-                hours: att.hours_worked,
-                status: att.status
-            }))
-            : [];
+        if (AppState.syncMark && await syncDataFromAPI()) return;
+
+        const data = await apiGet(API_ENDPOINTS.DASHBOARD_BOOTSTRAP);
+        if (!data) throw new Error('Réponse vide du serveur');
+
+        AppState.departments = data.departments;
+        AppState.employees = data.employees.map(mapEmployee);
+        AppState.leaves = data.leaves.map(mapLeave);
+        AppState.attendance = data.attendances.map(mapAttendance);
+        AppState.attendanceSince = data.attendance_since;
+        AppState.syncMark = data.high_water_mark;
 
     } catch (error) {
         console.error('Erreur lors du chargement des données:', error);
@@ -234,9 +267,39 @@ async function loadDataFromAPI() {
         AppState.employees = [];
         AppState.leaves = [];
         AppState.attendance = [];
+        AppState.syncMark = null;
     }
 }
 
+/**
+ * Met à jour les listes locales avec les seules lignes modifiées ou supprimées
+ * depuis le dernier chargement (?updated_since=, voir api/delta_sync.py).
+ * Les entreprises, peu nombreuses, sont relues entièrement.
+ *
+ * @returns {Promise<boolean>} false si un appel échoue (point de reprise
+ *     expiré : HTTP 410) ; l'appelant recharge alors tout.
+ */
+async function syncDataFromAPI() {
+    const since = `?updated_since=${encodeURIComponent(AppState.syncMark)}`;
+    const [departments, employees, leaves, attendances] = await Promise.all([
+        apiGet(API_ENDPOINTS.DEPARTMENTS),
+        apiGet(API_ENDPOINTS.EMPLOYEES + since),
+        apiGet(API_ENDPOINTS.LEAVES + since),
+        apiGet(API_ENDPOINTS.ATTENDANCES + since)
+    ]);
+    if (!departments || !employees || !leaves || !attendances) return false;
+
+    AppState.departments = departments;
+    AppState.employees = mergeDelta(AppState.employees, employees, mapEmployee);
+    AppState.leaves = mergeDelta(AppState.leaves, leaves, mapLeave);
+    // Même fenêtre que le chargement initial
+    attendances.results = attendances.results.filter(att => att.date >= AppState.attendanceSince);
+    AppState.attendance = mergeDelta(AppState.attendance, attendances, mapAttendance);
+    // Point de reprise le plus ancien des trois réponses
+    AppState.syncMark = [employees, leaves, attendances].map(delta => delta.high_water_mark).sort()[0];
+    return true;
+}
+
 /**
  * Stub conservé pour compatibilité.
  * Les données ne sont plus sauvegardées localement ; tout est géré par l'API.
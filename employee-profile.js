@@ -33,17 +33,17 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 
 async function initializeApp() {
-    // Charger les entreprises
-    await loadCompanies();
-
-    // Charger les directions depuis l'API
-    await loadDirections();
-
-    // Charger le profil de l'employé
-    await loadEmployeeProfile();
+    // Afficher le nom dans la sidebar
+    const currentUser = getCurrentUser();
+    document.getElementById('employeeName').textContent = currentUser?.name || currentUser?.username || 'Employé';
 
-    // Charger les congés
-    await loadEmployeeLeaves();
+    // Tout le portail en un appel : fiche, congés, solde, entreprises et directions
+    const data = await fetchPortalData();
+    if (data) {
+        populateCompanies(data.departments || []);
+        populateDirections(data.directions || []);
+        applyPortalData(data);
+    }
 
     // Configurer les événements
     setupEventListeners();
@@ -53,113 +53,70 @@ async function initializeApp() {
 // Chargement des données
 // ===========================
 
-async function loadCompanies() {
+async function fetchPortalData() {
     try {
-        const response = await apiGet(API_ENDPOINTS.DEPARTMENTS);
-        if (response) {
-            departments = response.results || response;
-            const companySelect = document.getElementById('company');
-            if (companySelect) {
-                departments.forEach(dept => {
-                    const option = document.createElement('option');
-                    option.value = dept.id;
-                    option.textContent = dept.name;
-                    companySelect.appendChild(option);
-                });
-            }
-        }
+        return await apiGet(API_ENDPOINTS.ME_BOOTSTRAP);
     } catch (error) {
-        console.error('Erreur chargement entreprises:', error);
+        console.error('Erreur chargement du portail:', error);
+        return null;
     }
 }
 
-async function loadDirections() {
-    try {
-        const response = await apiGet(API_ENDPOINTS.DIRECTIONS);
-        if (response) {
-            DIRECTIONS = response.results || response;
-            const directionSelect = document.getElementById('direction');
-            if (directionSelect) {
-                DIRECTIONS.forEach(direction => {
-                    const option = document.createElement('option');
-                    option.value = direction.name;
-                    option.textContent = direction.name;
-                    directionSelect.appendChild(option);
-                });
-            }
-        }
-    } catch (error) {
-        console.error('Erreur chargement directions:', error);
+function populateCompanies(list) {
+    departments = list;
+    const companySelect = document.getElementById('company');
+    if (companySelect) {
+        departments.forEach(dept => {
+            const option = document.createElement('option');
+            option.value = dept.id;
+            option.textContent = dept.name;
+            companySelect.appendChild(option);
+        });
     }
 }
 
-async function loadEmployeeProfile() {
-    const currentUser = getCurrentUser();
-
-    console.log('Utilisateur connecté:', currentUser);
-
-    // Afficher le nom dans la sidebar
-    document.getElementById('employeeName').textContent = currentUser?.name || currentUser?.username || 'Employé';
-
-    try {
-        // Chercher l'employé par email ou user_id
-        const employees = await apiGet(API_ENDPOINTS.EMPLOYEES);
-        console.log('Liste des employés:', employees);
-
-        if (employees) {
-            const employeeList = employees.results || employees;
-
-            // Trouver l'employé correspondant à l'utilisateur connecté
-            // Priorité 1: par user ID
-            // Priorité 2: par email de l'utilisateur
-            // Priorité 3: par username (si l'email de l'employé contient le username)
-            currentEmployee = employeeList.find(emp => emp.user === currentUser?.id);
-
-            if (!currentEmployee && currentUser?.email) {
-                currentEmployee = employeeList.find(emp => emp.email === currentUser.email);
-            }
+function populateDirections(list) {
+    DIRECTIONS = list;
+    const directionSelect = document.getElementById('direction');
+    if (directionSelect) {
+        DIRECTIONS.forEach(direction => {
+            const option = document.createElement('option');
+            option.value = direction.name;
+            option.textContent = direction.name;
+            directionSelect.appendChild(option);
+        });
+    }
+}
 
-            if (!currentEmployee && currentUser?.username) {
-                currentEmployee = employeeList.find(emp =>
-                    emp.email?.toLowerCase().includes(currentUser.username.toLowerCase())
-                );
-            }
+/**
+ * Affiche la fiche et les congés de l'agent renvoyés par /api/me/bootstrap/.
+ * Sans fiche liée au compte, ouvre le formulaire de profil.
+ */
+function applyPortalData(data) {
+    currentEmployee = data.profile;
 
-            console.log('Employé trouvé:', currentEmployee);
+    if (currentEmployee) {
+        displayProfile(currentEmployee);
+        fillEditForm(currentEmployee);
+        displayLeaves(data.leaves);
+        updateLeaveStats(data.leaves);
+        return;
+    }
 
-            if (currentEmployee) {
-                displayProfile(currentEmployee);
-                fillEditForm(currentEmployee);
-            } else {
-                // Pas de profil trouvé, pré-remplir l'email si disponible
-                if (currentUser?.email) {
-                    const emailField = document.getElementById('email');
-                    if (emailField) emailField.value = currentUser.email;
-                }
-                showNotification('Veuillez compléter votre profil', 'info');
-                switchSection('edit-profile');
-            }
-        }
-    } catch (error) {
-        console.error('Erreur chargement profil:', error);
+    // Pas de profil trouvé, pré-remplir l'email si disponible
+    const email = data.user?.email;
+    if (email) {
+        const emailField = document.getElementById('email');
+        if (emailField) emailField.value = email;
     }
+    showNotification('Veuillez compléter votre profil', 'info');
+    switchSection('edit-profile');
 }
 
-async function loadEmployeeLeaves() {
-    if (!currentEmployee) return;
-
-    try {
-        const leaves = await apiGet(API_ENDPOINTS.LEAVES);
-        if (leaves) {
-            const leaveList = leaves.results || leaves;
-            // Filtrer les congés de l'employé
-            const myLeaves = leaveList.filter(leave => leave.employee === currentEmployee.id);
-            displayLeaves(myLeaves);
-            updateLeaveStats(myLeaves);
-        }
-    } catch (error) {
-        console.error('Erreur chargement congés:', error);
-    }
+async function loadEmployeeProfile() {
+    // Rechargement de la fiche, des congés et du solde (après une demande)
+    const data = await fetchPortalData();
+    if (data) applyPortalData(data);
 }
 
 // ===========================
@@ -768,7 +725,6 @@ async function handleLeaveSubmit(e) {
             document.getElementById('leaveRequestForm').reset();
             // Recharger le profil pour mettre à jour le solde de congés
             await loadEmployeeProfile();
-            await loadEmployeeLeaves();
             switchSection('leaves');
         } else {
             const errorMsg = response.data?.detail || response.data?.end_date?.[0] || 'Erreur lors de la soumission';